@@ -0,0 +1,151 @@
+# Copyright (c) IBM Corporation 2020
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import (absolute_import, division, print_function)
+
+__metaclass__ = type
+
+import os
+
+from ansible.plugins.action import ActionBase
+from ansible.module_utils._text import to_text
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.job import expand_jobs
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.job_cache import (
+    JobOutputCache,
+)
+
+# Options that return part of a ddname, or content kept on the managed node,
+# which cannot be served from the cache.
+UNCACHED_OPTIONS = [
+    "start_line",
+    "max_lines",
+    "tail",
+    "follow",
+    "spill_threshold",
+    "dest",
+    "local_dest",
+]
+
+
+class ActionModule(ActionBase):
+    def run(self, tmp=None, task_vars=None):
+        """ handler for job output retrieval, served from the
+        controller-side cache when it holds the requested jobs """
+        if task_vars is None:
+            task_vars = dict()
+
+        result = super(ActionModule, self).run(tmp, task_vars)
+
+        if result.get("skipped"):
+            return result
+
+        module_args = self._task.args.copy()
+        host = task_vars.get("inventory_hostname", "")
+        use_cache = boolean(module_args.get("cache", False), strict=False)
+        cache = None
+        job_ids = _as_list(module_args.get("job_id"))
+        dd_names = [
+            dd_name.upper()
+            for dd_name in _as_list(module_args.get("ddname"))
+            if dd_name != "?"
+        ]
+        if (
+            use_cache
+            and job_ids
+            and not any("*" in job_id for job_id in job_ids)
+            and not module_args.get("job_name")
+            and not module_args.get("owner")
+            and all(module_args.get(option) is None for option in UNCACHED_OPTIONS)
+            and not boolean(module_args.get("step_summary", False), strict=False)
+        ):
+            cache = JobOutputCache(
+                module_args.get("cache_dir"), module_args.get("cache_max_size")
+            )
+            jobs = cache.get(host, [job_id.upper() for job_id in job_ids], dd_names)
+            if jobs is not None:
+                result.update(
+                    jobs=jobs,
+                    job_index=dict(
+                        (job.get("job_id"), index) for index, job in enumerate(jobs)
+                    ),
+                    changed=False,
+                    cached=True,
+                )
+                return result
+
+        local_dest = module_args.pop("local_dest", None)
+        remote_dir = None
+        if local_dest:
+            if (
+                module_args.get("dest")
+                or module_args.get("spill_threshold") is not None
+            ):
+                result["failed"] = True
+                result["msg"] = (
+                    "local_dest is mutually exclusive with dest and spill_threshold"
+                )
+                return result
+            # Get a temporary directory on the managed node
+            remote_dir = self._execute_module(
+                module_name="tempfile",
+                module_args=dict(state="directory"),
+                task_vars=task_vars,
+            ).get("path")
+            module_args["dest"] = remote_dir
+
+        try:
+            result.update(
+                self._execute_module(
+                    module_name="zos_job_output",
+                    module_args=module_args,
+                    task_vars=task_vars,
+                )
+            )
+            expand_jobs(result)
+            if remote_dir and not result.get("failed"):
+                self._fetch_content(result.get("jobs") or [], local_dest)
+        except Exception as e:
+            result["failed"] = True
+            result["msg"] = to_text(e)
+        finally:
+            if remote_dir:
+                self._execute_module(
+                    module_name="file",
+                    module_args=dict(path=remote_dir, state="absent"),
+                    task_vars=task_vars,
+                )
+        if use_cache:
+            result["cached"] = False
+        if cache is not None and not result.get("failed"):
+            cache.put(host, result.get("jobs") or [], dd_names)
+        return result
+
+    def _fetch_content(self, jobs, local_dest):
+        """Fetch the file written for each ddname to the controller
+        and point its content_path to the fetched copy.
+
+        Arguments:
+            jobs {list[dict]} -- The jobs returned by the module.
+            local_dest {str} -- The controller directory.
+        """
+        local_dest = os.path.expanduser(local_dest)
+        if not os.path.isdir(local_dest):
+            os.makedirs(local_dest)
+        for job in jobs:
+            for dd in job.get("ddnames") or []:
+                if not dd.get("content_path"):
+                    continue
+                local_path = os.path.join(
+                    local_dest, os.path.basename(dd.get("content_path"))
+                )
+                self._connection.fetch_file(dd.get("content_path"), local_path)
+                dd["content_path"] = local_path
+
+
+def _as_list(value):
+    if not value:
+        return []
+    if isinstance(value, list):
+        return value
+    return str(value).split(",")
@@ -8,7 +8,27 @@ __metaclass__ = type
 from ansible.plugins.action import ActionBase
 from ansible.errors import AnsibleError, AnsibleFileNotFound
 from ansible.module_utils._text import to_bytes, to_text
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.encode import (
+    iter_file,
+    transcode,
+)
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.job import expand_jobs
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.job_cache import (
+    JobOutputCache,
+)
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.job_wait import (
+    monotonic,
+)
+import base64
+import hashlib
 import os
+import tempfile
+import time
+
+# LOCAL files up to this size are passed in the module arguments, larger
+# files are copied to the managed node first
+INLINE_JCL_MAX_SIZE = 1024 * 1024
 
 
 class ActionModule(ActionBase):
@@ -16,6 +36,10 @@ class ActionModule(ActionBase):
         """ handler for file transfer operations """
         if task_vars is None:
             task_vars = dict()
+        self._started = monotonic()
+        self._wall_started = time.time()
+        self._remote_executions = 0
+        self._staging = 0.0
 
         result = super(ActionModule, self).run(tmp, task_vars)
 
@@ -23,17 +47,12 @@ class ActionModule(ActionBase):
             return result
 
         module_args = self._task.args.copy()
-        if module_args["location"] == "LOCAL":
+        if module_args.get("location") == "LOCAL":
 
             source = self._task.args.get("src", None)
 
-            # Get a temporary file on the managed node
-            dest_path = self._execute_module(
-                module_name="tempfile", module_args={}, task_vars=task_vars,
-            ).get("path")
-
             result["failed"] = True
-            if source is None or dest_path is None:
+            if source is None:
                 result["msg"] = "src and dest are required"
             elif source is not None and source.endswith("/"):
                 result["msg"] = "src must be a file"
@@ -55,6 +74,24 @@ class ActionModule(ActionBase):
                 result["msg"] = to_text(u"NOT SUPPORTING THE DIRECTORY.")
                 return result
 
+            inline = self._submit_inline(source, module_args, task_vars)
+            if inline is None and boolean(
+                module_args.get("jcl_cache", False), strict=False
+            ):
+                inline = self._submit_cached(source, module_args, task_vars)
+            if inline is not None:
+                result.update(inline)
+                return self._finish(result, module_args, task_vars)
+
+            # Get a temporary file on the managed node
+            dest_path = self._execute_module(
+                module_name="tempfile", module_args={}, task_vars=task_vars,
+            ).get("path")
+            if dest_path is None:
+                result["failed"] = True
+                result["msg"] = "src and dest are required"
+                return result
+
             changed = False
             module_return = dict(changed=False)
 
@@ -129,4 +166,162 @@ class ActionModule(ActionBase):
                 )
             )
 
+        return self._finish(result, module_args, task_vars)
+
+    def _submit_inline(self, source, module_args, task_vars):
+        """Submit a small LOCAL file in a single remote execution, with the
+        JCL converted to EBCDIC on the controller and passed in the module
+        arguments.
+
+        Arguments:
+            source {str} -- The path of the JCL on the controller.
+            module_args {dict} -- The task arguments.
+            task_vars {dict} -- The task variables.
+
+        Returns:
+            dict -- The module result, or None when the file is too large to
+            be passed inline and must be copied to the managed node first.
+        """
+        try:
+            source_full = self._loader.get_real_file(source)
+        except AnsibleFileNotFound:
+            # Reported by the copy path
+            return None
+        staging_started = monotonic()
+        try:
+            if os.path.getsize(source_full) > INLINE_JCL_MAX_SIZE:
+                return None
+            content = b"".join(
+                transcode(
+                    iter_file(source_full),
+                    module_args.get("encoding") or "UTF-8",
+                    module_args.get("target_encoding") or "IBM-1047",
+                )
+            )
+        except (LookupError, UnicodeError) as e:
+            return dict(
+                failed=True,
+                msg="The Local file encoding conversion failed. "
+                "Please check the source file. " + to_text(e),
+            )
+        finally:
+            self._loader.cleanup_tmp_file(source_full)
+            self._staging += monotonic() - staging_started
+        module_args = module_args.copy()
+        module_args["local_content"] = to_text(base64.b64encode(content))
+        return self._execute_module(
+            module_name="zos_job_submit", module_args=module_args, task_vars=task_vars,
+        )
+
+    def _submit_cached(self, source, module_args, task_vars):
+        """Submit a LOCAL file from the JCL cache of the managed node,
+        uploading the JCL only when the cache does not hold it.
+
+        The JCL is converted to EBCDIC on the controller and identified
+        by the hash of the converted content.
+
+        Arguments:
+            source {str} -- The path of the JCL on the controller.
+            module_args {dict} -- The task arguments.
+            task_vars {dict} -- The task variables.
+
+        Returns:
+            dict -- The module result, or the failure when the file cannot
+            be found or read.
+        """
+        staging_started = monotonic()
+        try:
+            source_full = self._loader.get_real_file(source)
+        except AnsibleFileNotFound as e:
+            return dict(failed=True, msg="could not find src=%s, %s" % (source, e))
+        fd, converted = tempfile.mkstemp()
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, "wb") as f:
+                for chunk in transcode(
+                    iter_file(source_full),
+                    module_args.get("encoding") or "UTF-8",
+                    module_args.get("target_encoding") or "IBM-1047",
+                ):
+                    digest.update(chunk)
+                    f.write(chunk)
+            self._staging += monotonic() - staging_started
+            module_args = module_args.copy()
+            module_args["jcl_digest"] = digest.hexdigest()
+            result = self._execute_module(
+                module_name="zos_job_submit",
+                module_args=module_args,
+                task_vars=task_vars,
+            )
+            if not result.get("jcl_cache_miss"):
+                return result
+
+            staging_started = monotonic()
+            tmp = self._make_tmp_path()
+            try:
+                remote_path = self._transfer_file(
+                    converted, self._connection._shell.join_path(tmp, "jcl")
+                )
+                self._fixup_perms2((tmp, remote_path))
+                self._staging += monotonic() - staging_started
+                module_args["temp_file"] = remote_path
+                return self._execute_module(
+                    module_name="zos_job_submit",
+                    module_args=module_args,
+                    task_vars=task_vars,
+                )
+            finally:
+                self._remove_tmp_path(tmp)
+        except (LookupError, UnicodeError) as e:
+            return dict(
+                failed=True,
+                msg="The Local file encoding conversion failed. "
+                "Please check the source file. " + to_text(e),
+            )
+        except (IOError, OSError) as e:
+            return dict(failed=True, msg="could not read src=%s, %s" % (source, e))
+        finally:
+            os.remove(converted)
+            self._loader.cleanup_tmp_file(source_full)
+
+    def _execute_module(self, *args, **kwargs):
+        """Count the modules run on the managed node."""
+        self._remote_executions += 1
+        return super(ActionModule, self)._execute_module(*args, **kwargs)
+
+    def _finish(self, result, module_args, task_vars):
+        """Expand compressed job output, store it in the cache and add the
+        controller side of the timing."""
+        expand_jobs(result)
+        self._set_timing(result)
+        if (
+            boolean(module_args.get("cache", False), strict=False)
+            and boolean(module_args.get("wait", False), strict=False)
+            and boolean(module_args.get("return_output", True), strict=False)
+            and not result.get("failed")
+        ):
+            JobOutputCache(
+                module_args.get("cache_dir"), module_args.get("cache_max_size")
+            ).put(task_vars.get("inventory_hostname", ""), result.get("jobs") or [])
+
         return result
+
+    def _set_timing(self, result):
+        """Add what the action plugin measured to the timing of the module."""
+        timing = result.get("timing")
+        if not isinstance(timing, dict):
+            return
+        ended = monotonic()
+        timing["controller_staging"] = self._staging
+        timing["remote_executions"] = self._remote_executions
+        timing["action_total"] = ended - self._started
+        events = result.get("timing_events")
+        if isinstance(events, list):
+            module_start = timing.get("module_start")
+            wall_ended = self._wall_started + ended - self._started
+            for event, at in (
+                ("action_start", self._wall_started),
+                ("action_end", wall_ended),
+            ):
+                events.append(dict(event=event, time=at, elapsed=at - module_start))
+            events.sort(key=lambda event: event.get("elapsed"))
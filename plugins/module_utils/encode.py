@@ -0,0 +1,167 @@
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from importlib import import_module
+import codecs
+
+# The EBCDIC code pages JCL can be submitted in, with the Python charmap
+# codec each of them is derived from. IBM-1047 is not shipped with Python
+# and is built from IBM-037.
+EBCDIC_CODEPAGES = {
+    "IBM-037": "cp037",
+    "IBM-273": "cp273",
+    "IBM-500": "cp500",
+    "IBM-875": "cp875",
+    "IBM-1026": "cp1026",
+    "IBM-1047": "cp037",
+    "IBM-1140": "cp1140",
+}
+
+# Source encodings whose content is already EBCDIC and sent as is
+EBCDIC_PASSTHROUGH = ["EBCDIC"]
+
+# The characters IBM-1047 places differently than IBM-037
+CP1047_FROM_CP037 = {
+    0x5F: 0xB0,
+    0xAD: 0xBA,
+    0xB0: 0x5F,
+    0xBA: 0xAD,
+    0xBB: 0xBD,
+    0xBD: 0xBB,
+}
+
+# The EBCDIC new line, which ends the records of z/OS UNIX text files,
+# and the line feed it trades places with in the Python tables
+EBCDIC_NL = 0x15
+EBCDIC_LF = 0x25
+
+ENCODE_CHUNK_SIZE = 64 * 1024
+
+_tables = {}
+
+
+def is_ebcdic(encoding):
+    """Check whether an encoding names EBCDIC content.
+
+    Arguments:
+        encoding {str} -- The encoding name.
+
+    Returns:
+        bool -- True for EBCDIC and the supported EBCDIC code pages.
+    """
+    name = encoding.upper()
+    return name in EBCDIC_PASSTHROUGH or name in EBCDIC_CODEPAGES
+
+
+def check_encoding(encoding):
+    """Check an encoding can be read from.
+
+    Arguments:
+        encoding {str} -- The encoding name.
+
+    Raises:
+        LookupError: When the encoding is neither EBCDIC nor known to Python.
+    """
+    if is_ebcdic(encoding):
+        return
+    codecs.lookup(encoding)
+
+
+def transcode(chunks, from_encoding, to_encoding="IBM-1047", errors="strict"):
+    """Convert text to an EBCDIC code page one chunk at a time.
+
+    Line feeds are written as the EBCDIC new line, 0x15, which is how
+    z/OS UNIX ends the records of text files in every code page.
+
+    Arguments:
+        chunks {Iterable[bytes]} -- The content in from_encoding.
+        from_encoding {str} -- The encoding of the content, either a Python
+        codec or EBCDIC code page, or EBCDIC to send it unchanged.
+
+    Keyword Arguments:
+        to_encoding {str} -- The EBCDIC code page. (default: {"IBM-1047"})
+        errors {str} -- The codec error handling. (default: {"strict"})
+
+    Raises:
+        LookupError: When an encoding is not supported.
+
+    Yields:
+        bytes -- The converted content.
+    """
+    if from_encoding.upper() in EBCDIC_PASSTHROUGH or (
+        from_encoding.upper() == to_encoding.upper()
+    ):
+        for chunk in chunks:
+            yield chunk
+        return
+    encoding_table = _get_table(to_encoding)[1]
+    if from_encoding.upper() in EBCDIC_CODEPAGES:
+        decoding_table = _get_table(from_encoding)[0]
+        for chunk in chunks:
+            text = codecs.charmap_decode(chunk, errors, decoding_table)[0]
+            yield codecs.charmap_encode(text, errors, encoding_table)[0]
+        return
+    decoder = codecs.getincrementaldecoder(from_encoding)(errors)
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield codecs.charmap_encode(text, errors, encoding_table)[0]
+    text = decoder.decode(b"", True)
+    if text:
+        yield codecs.charmap_encode(text, errors, encoding_table)[0]
+
+
+def iter_file(file_path, size=ENCODE_CHUNK_SIZE):
+    """Read a file in binary chunks.
+
+    Arguments:
+        file_path {str} -- The file to read.
+
+    Keyword Arguments:
+        size {int} -- The chunk size in bytes. (default: {ENCODE_CHUNK_SIZE})
+
+    Yields:
+        bytes -- The content of the file.
+    """
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _get_table(codepage):
+    """Return the decoding and encoding tables of an EBCDIC code page.
+
+    Arguments:
+        codepage {str} -- One of EBCDIC_CODEPAGES.
+
+    Raises:
+        LookupError: When the code page is not supported.
+
+    Returns:
+        tuple(str, object) -- The decoding table and the encoding map.
+    """
+    codepage = codepage.upper()
+    if codepage not in _tables:
+        if codepage not in EBCDIC_CODEPAGES:
+            raise LookupError("unknown EBCDIC code page: {0}".format(codepage))
+        try:
+            base = import_module("encodings." + EBCDIC_CODEPAGES[codepage])
+        except ImportError:
+            raise LookupError("unknown EBCDIC code page: {0}".format(codepage))
+        table = list(base.decoding_table)
+        if codepage == "IBM-1047":
+            cp037 = list(table)
+            for cp1047_byte, cp037_byte in CP1047_FROM_CP037.items():
+                table[cp1047_byte] = cp037[cp037_byte]
+        if table[EBCDIC_LF] == u"\n":
+            table[EBCDIC_NL], table[EBCDIC_LF] = table[EBCDIC_LF], table[EBCDIC_NL]
+        decoding_table = u"".join(table)
+        _tables[codepage] = (decoding_table, codecs.charmap_build(decoding_table))
+    return _tables[codepage]
@@ -0,0 +1,141 @@
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from os import chmod, fdopen, listdir, path, remove, rename, stat, utime
+from shutil import copyfileobj
+from stat import S_IREAD, S_IWRITE
+from tempfile import mkstemp
+import hashlib
+import re
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.rexx import (
+    private_cache_dir,
+)
+
+# Bumped whenever the layout of the cache changes
+JCL_CACHE_VERSION = "1"
+
+# Default upper bound of the cache in megabytes
+JCL_CACHE_MAX_SIZE = 64
+
+JCL_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+
+
+def jcl_digest(chunks):
+    """Return the digest identifying JCL in the cache.
+
+    Arguments:
+        chunks {Iterable[bytes]} -- The JCL as submitted, in EBCDIC.
+
+    Returns:
+        str -- The sha256 hex digest.
+    """
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cached_jcl(digest, cache_dir=None):
+    """Return the cached copy of JCL, verified against its digest.
+
+    Arguments:
+        digest {str} -- The digest of the JCL.
+
+    Keyword Arguments:
+        cache_dir {str} -- The helper cache directory. (default: {None})
+
+    Raises:
+        ValueError: When the digest is not a sha256 hex digest.
+
+    Returns:
+        str -- The path of the cached JCL, or None when it is not cached.
+    """
+    jcl_path = _jcl_path(digest, cache_dir)
+    if _file_digest(jcl_path) != digest:
+        return None
+    utime(jcl_path, None)
+    return jcl_path
+
+
+def store_jcl(digest, src, cache_dir=None, max_size=None):
+    """Move uploaded JCL into the cache, then remove the least recently
+    used entries until the cache fits in max_size megabytes.
+
+    Arguments:
+        digest {str} -- The digest the controller computed for the JCL.
+        src {str} -- The uploaded JCL, which is removed.
+
+    Keyword Arguments:
+        cache_dir {str} -- The helper cache directory. (default: {None})
+        max_size {int} -- The size limit in megabytes. (default: {None})
+
+    Raises:
+        ValueError: When the content of src does not match the digest.
+
+    Returns:
+        str -- The path of the cached JCL.
+    """
+    jcl_path = _jcl_path(digest, cache_dir)
+    if _file_digest(src) != digest:
+        raise ValueError("The uploaded JCL does not match its digest.")
+    fd, tmp_path = mkstemp(prefix=".", dir=path.dirname(jcl_path))
+    try:
+        with fdopen(fd, "wb") as dst, open(src, "rb") as f:
+            copyfileobj(f, dst)
+        chmod(tmp_path, S_IREAD | S_IWRITE)
+        rename(tmp_path, jcl_path)
+    except Exception:
+        if path.exists(tmp_path):
+            remove(tmp_path)
+        raise
+    remove(src)
+    if max_size is None:
+        max_size = JCL_CACHE_MAX_SIZE
+    _evict(path.dirname(jcl_path), int(max_size) * 1024 * 1024, jcl_path)
+    return jcl_path
+
+
+def _jcl_path(digest, cache_dir=None):
+    if not JCL_DIGEST.match(digest or ""):
+        raise ValueError("Invalid JCL digest {0}.".format(digest))
+    return path.join(private_cache_dir("jcl.v" + JCL_CACHE_VERSION, cache_dir), digest)
+
+
+def _file_digest(file_path):
+    try:
+        with open(file_path, "rb") as f:
+            return jcl_digest(iter(lambda: f.read(64 * 1024), b""))
+    except (IOError, OSError):
+        return None
+
+
+def _evict(dir_path, max_size, keep):
+    """Remove the least recently used entries until the cache fits in
+    max_size bytes, never removing keep."""
+    entries = []
+    total = 0
+    for name in listdir(dir_path):
+        if not JCL_DIGEST.match(name):
+            continue
+        entry_path = path.join(dir_path, name)
+        try:
+            st = stat(entry_path)
+        except OSError:
+            continue
+        entries.append((st.st_mtime, st.st_size, entry_path))
+        total += st.st_size
+    entries.sort()
+    for mtime, size, entry_path in entries:
+        if total <= max_size:
+            break
+        if entry_path == keep:
+            continue
+        try:
+            remove(entry_path)
+        except OSError:
+            pass
+        total -= size
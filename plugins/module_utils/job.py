@@ -5,133 +5,131 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from tempfile import NamedTemporaryFile
-from os import chmod, path, remove
-from stat import S_IEXEC, S_IREAD, S_IWRITE
+from tempfile import TemporaryFile, mkdtemp
+from os import environ, path, remove
+from subprocess import Popen, PIPE
+from itertools import chain, islice
+import base64
+import io
 import json
 import re
+import zlib
 from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.better_arg_parser import (
     BetterArgParser,
 )
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.rexx import install_rexx
 
+WIRE_FORMATS = ["json", "framed"]
 
-def job_output(module, job_id=None, owner=None, job_name=None, dd_name=None):
-    """Get the output from a z/OS job based on various search criteria.
+# SDSF accepts at most 25 filter criteria, longer job ID or job name lists are
+# read in several runs of the REXX script
+JOB_FILTER_LIMIT = 25
 
-    Arguments:
-        module {AnsibleModule} -- The AnsibleModule object from the running module.
+COMPRESSIONS = ["zlib", "gzip"]
 
-    Keyword Arguments:
-        job_id {str} -- The job ID to search for (default: {''})
-        owner {str} -- The owner of the job (default: {''})
-        job_name {str} -- The job name search for (default: {''})
-        dd_name {str} -- The data definition to retrieve (default: {''})
+# The ddnames holding the messages the step summary is built from
+STEP_SUMMARY_DDNAMES = ["JESMSGLG", "JESYSMSG"]
 
-    Raises:
-        RuntimeError: When job output cannot be retrieved successfully but job exists.
-        RuntimeError: When no job output is found
+# IEF142I jobname [procstep] stepname - STEP WAS EXECUTED - COND CODE nnnn
+# IEF272I jobname [procstep] stepname - STEP WAS NOT EXECUTED.
+# IEF472I jobname [procstep] stepname - COMPLETION CODE - SYSTEM=sss USER=uuuu
+STEP_MESSAGE = re.compile(r"\b(IEF142I|IEF272I|IEF472I)\s+(.+?)\s+-\s+(.*)$")
 
-    Returns:
-        dict[str, list[dict]] -- The output information for a given job.
-    """
+# SMF000I jobname stepname [procstep] program rc ...
+SMF000I_MESSAGE = re.compile(r"\bSMF000I\s+(.*)$")
 
-    arg_defs = dict(
-        job_id=dict(arg_type="qualifier_pattern"),
-        owner=dict(arg_type="qualifier_pattern"),
-        job_name=dict(arg_type="qualifier_pattern"),
-        dd_name=dict(arg_type=_ddname_pattern),
-    )
+# zlib window bits selecting the zlib and gzip containers
+_COMPRESSION_WBITS = {"zlib": 15, "gzip": 31}
 
-    parser = BetterArgParser(arg_defs)
-    parsed_args = parser.parse_args(
-        {"job_id": job_id, "owner": owner, "job_name": job_name, "dd_name": dd_name}
-    )
+# The number of spool lines taken from framed output at a time
+FRAMED_CHUNK_LINES = 4096
 
-    job_id = parsed_args.get("job_id") or ""
-    job_name = parsed_args.get("job_name") or ""
-    owner = parsed_args.get("owner") or ""
-    ddname = parsed_args.get("ddname") or ""
-
-    job_detail_json = {}
-    rc, out, err = _get_job_json_str(module, job_id, owner, job_name, dd_name)
-    if rc != 0:
-        raise RuntimeError(
-            "Failed to retrieve job output. RC: {0} Error: {1}".format(
-                str(rc), str(err)
-            )
-        )
-    if not out:
-        raise RuntimeError("Failed to retrieve job output. No job output found.")
-    job_detail_json = json.loads(out, strict=False)
-    for job in job_detail_json.get("jobs"):
-        job["ret_code"] = {} if job.get("ret_code") is None else job.get("ret_code")
-        job["ret_code"]["code"] = _get_return_code_num(
-            job.get("ret_code", {}).get("msg", "")
-        )
-        job["ret_code"]["msg_code"] = _get_return_code_str(
-            job.get("ret_code", {}).get("msg", "")
-        )
-        job["ret_code"]["msg_txt"] = ""
-    return job_detail_json
-
-
-def _get_job_json_str(module, job_id="", owner="", job_name="", dd_name=""):
-    """Generate JSON output string containing Job info from SDSF.
-    Writes a temporary REXX script to the USS filesystem to gather output.
-
-    Arguments:
-        module {AnsibleModule} -- The AnsibleModule object from the running module.
-
-    Keyword Arguments:
-        job_id {str} -- The job ID to search for (default: {''})
-        owner {str} -- The owner of the job (default: {''})
-        job_name {str} -- The job name search for (default: {''})
-        dd_name {str} -- The data definition to retrieve (default: {''})
-
-    Returns:
-        tuple[int, str, str] -- RC, STDOUT, and STDERR from the REXX script.
-    """
-    get_job_detail_json_rexx = """/* REXX */
+JOB_JSON_REXX = """/* REXX */
 arg options
 parse var options param
 upper param
 parse var param 'JOBID=' jobid ' OWNER=' owner,
-' JOBNAME=' jobname ' DDNAME=' ddname
+' JOBNAME=' jobname ' DDNAME=' ddname ' BROWSE=' browse,
+' STARTLINE=' startline ' LINELIMIT=' linelimit ' TAIL=' tail,
+' SINCE=' since ' FORMAT=' format
 
 rc=isfcalls('ON')
 
-jobid = strip(jobid,'L')
-if (jobid <> '') then do
+jobid = translate(strip(jobid,'L'), ' ', ',')
+jobname = translate(strip(jobname,'L'), ' ', ',')
+namefilter = ''
+if (words(jobid) == 1) then do
 ISFFILTER='JobID EQ '||jobid
 end
+else if (words(jobid) > 1) then do
+ISFFILTER = ''
+do fx=1 to words(jobid)
+ISFFILTER = ISFFILTER 'JobID EQ' word(jobid, fx)
+end
+ISFFILTERMODE = 'OR'
+end
 owner = strip(owner,'L')
 if (owner <> '') then do
 ISFOWNER=owner
 end
-jobname = strip(jobname,'L')
-if (jobname <> '') then do
+if (words(jobname) == 1) then do
 ISFPREFIX=jobname
 end
-ddname = strip(ddname,'L')
-if (ddname == '?') then do
+else if (words(jobname) > 1) & (words(jobid) >= 1) then do
+namefilter = jobname
+end
+else if (words(jobname) > 1) then do
+ISFFILTER = ''
+do fx=1 to words(jobname)
+ISFFILTER = ISFFILTER 'JName EQ' word(jobname, fx)
+end
+ISFFILTERMODE = 'OR'
+end
+ddname = translate(strip(ddname,'L'), ' ', ',')
+if (wordpos('?', ddname) > 0) then do
 ddname = ''
 end
+browse = strip(browse)
+startline = strip(startline)
+linelimit = strip(linelimit)
+tail = strip(tail)
+if (datatype(startline,'W') == 0) then do
+startline = 1
+end
+if (datatype(linelimit,'W') == 0) then do
+linelimit = 0
+end
+framed = (strip(format) == 'FRAMED')
+browsewindow = 4096
+since = translate(strip(since), ' ', ',')
+follow = (since <> '')
+seen. = 0
+do sx=1 to words(since)
+parse value word(since, sx) with dsid ':' seencount
+seen.dsid = seencount
+end
 
 Address SDSF "ISFEXEC ST (ALTERNATE DELAYED)"
 if rc<>0 then do
-Say '{"jobs":[]}'
-Exit 0
+isfrows = 0
+end
+if framed then do
+call sayFramed
 end
-if isfrows == 0 then do
+else if isfrows == 0 then do
 Say '{"jobs":[]}'
 end
 else do
 Say '{"jobs":['
+jobcount = 0
 do ix=1 to isfrows
-    linecount = 0
-    if ix<>1 then do
+    if wantedJob(ix) == 0 then do
+    iterate
+    end
+    if jobcount <> 0 then do
     Say ','
     end
+    jobcount = jobcount + 1
     Say '{'
     Say '"'||'job_id'||'":"'||value('JOBID'||"."||ix)||'",'
     Say '"'||'job_name'||'":"'||value('JNAME'||"."||ix)||'",'
@@ -148,11 +146,13 @@ do ix=1 to isfrows
     end
     else do
     Say '"ddnames":['
+    ddcount = 0
     do jx=1 to JDS_DDNAME.0
-        if jx<>1 & ddname == '' then do
+        if ddname == '' | wordpos(JDS_DDNAME.jx, ddname) > 0 then do
+        if ddcount <> 0 then do
         Say ','
         end
-        if ddname == '' | ddname == value('JDS_DDNAME'||"."||jx) then do
+        ddcount = ddcount + 1
         Say '{'
         Say '"'||'ddname'||'":"'||value('JDS_DDNAME'||"."||jx)||'",'
         Say '"'||'record_count'||'":"'||value('JDS_RECCNT'||"."||jx)||'",'
@@ -160,22 +160,17 @@ do ix=1 to isfrows
         Say '"'||'stepname'||'":"'||value('JDS_STEPN'||"."||jx)||'",'
         Say '"'||'procstep'||'":"'||value('JDS_PROCS'||"."||jx)||'",'
         Say '"'||'byte_count'||'":"'||value('JDS_BYTECNT'||"."||jx)||'",'
-        Say '"'||'content'||'":['
-        Address SDSF "ISFBROWSE ST TOKEN('"token.ix"')"
-        untilline = linecount + JDS_RECCNT.jx
-        startingcount = linecount + 1
-        do kx=linecount+1 to  untilline
-            if kx<>startingcount then do
-            Say ','
-            end
-            linecount = linecount + 1
-            Say '"'||escapeNewLine(escapeDoubleQuote(isfline.kx))||'"'
+        if browse == 'N' then do
+        Say '"'||'content'||'":[]'
         end
+        else do
+        firstline = firstLine(jx)
+        Say '"'||'first_line'||'":"'||firstline||'",'
+        Say '"'||'content'||'":['
+        call browseData jx, firstline
         Say ']'
-        Say '}'
         end
-        else do
-            linecount = linecount + JDS_RECCNT.jx
+        Say '}'
         end
     end
     Say ']'
@@ -189,6 +184,129 @@ rc=isfcalls('OFF')
 
 return 0
 
+/* Write the jobs as framed records instead of JSON. A line starting with */
+/* F, J or D starts the output, a job or a ddname. A line starting with */
+/* A holds an attribute name and value. A line C n is followed by the n */
+/* next spool lines of the ddname, written as they are.                 */
+sayFramed:
+Say 'F 1'
+do ix=1 to isfrows
+    if wantedJob(ix) == 0 then do
+    iterate
+    end
+    Say 'J'
+    Say 'A job_id' JOBID.ix
+    Say 'A job_name' JNAME.ix
+    Say 'A subsystem' ESYSID.ix
+    Say 'A owner' OWNERID.ix
+    Say 'A ret_code' RETCODE.ix
+    Say 'A class' JCLASS.ix
+    Say 'A content_type' JTYPE.ix
+    Address SDSF "ISFACT ST TOKEN('"TOKEN.ix"') PARM(NP ?)",
+"("prefix JDS_
+    if rc<>0 then do
+    JDS_DDNAME.0 = 0
+    end
+    do jx=1 to JDS_DDNAME.0
+        if ddname == '' | wordpos(JDS_DDNAME.jx, ddname) > 0 then do
+        Say 'D'
+        Say 'A ddname' JDS_DDNAME.jx
+        Say 'A record_count' JDS_RECCNT.jx
+        Say 'A id' JDS_DSID.jx
+        Say 'A stepname' JDS_STEPN.jx
+        Say 'A procstep' JDS_PROCS.jx
+        Say 'A byte_count' JDS_BYTECNT.jx
+        if browse <> 'N' then do
+        firstline = firstLine(jx)
+        Say 'A first_line' firstline
+        call browseData jx, firstline
+        end
+        end
+    end
+end
+return
+
+/* Job names are matched here when job ids are given along with a list of */
+/* job names, as SDSF filters are either all AND or all OR. Only a        */
+/* trailing * is handled, job_output matches other patterns itself.       */
+wantedJob:
+arg dx
+if namefilter == '' then do
+return 1
+end
+do fx=1 to words(namefilter)
+pattern = word(namefilter, fx)
+if right(pattern, 1) == '*' then do
+if abbrev(JNAME.dx, left(pattern, length(pattern) - 1)) then do
+return 1
+end
+end
+else if JNAME.dx == pattern then do
+return 1
+end
+end
+return 0
+
+firstLine:
+arg dx
+first = startline
+if (datatype(tail,'W') == 1) then do
+first = max(1, JDS_RECCNT.dx - tail + 1)
+end
+if follow then do
+dsid = JDS_DSID.dx
+first = seen.dsid + 1
+end
+return first
+
+/* Browse a ddname browsewindow lines at a time, writing each window */
+/* before reading the next one, so the lines held in isfline. stay  */
+/* bounded however large the ddname is. Framed output writes a C     */
+/* record for each window.                                          */
+browseData:
+arg dx, first
+count = 0
+line = first
+do forever
+    drop isfline.
+    isfline.0 = 0
+    window = browsewindow
+    if linelimit > 0 then do
+    window = min(window, linelimit - count)
+    end
+    if count == 0 & first > JDS_RECCNT.dx then do
+    window = 0
+    end
+    if window > 0 then do
+    ISFSTARTLINE = line
+    ISFLINELIM = window
+    Address SDSF "ISFBROWSE ST TOKEN('"JDS_TOKEN.dx"')"
+    end
+    if framed then do
+    Say 'C' isfline.0
+    do kx=1 to isfline.0
+        Say escapeNewLine(isfline.kx)
+    end
+    end
+    else do
+    do kx=1 to isfline.0
+        if count + kx <> 1 then do
+        Say ','
+        end
+        Say '"'||escapeNewLine(escapeDoubleQuote(isfline.kx))||'"'
+    end
+    end
+    count = count + isfline.0
+    line = line + isfline.0
+    if window == 0 | isfline.0 < window then do
+    leave
+    end
+    if linelimit > 0 & count >= linelimit then do
+    leave
+    end
+end
+return
+
 escapeDoubleQuote: Procedure
 Parse Arg string
 out=''
@@ -202,28 +320,946 @@ escapeNewLine: Procedure
 Parse Arg string
 Return translate(string, '4040'x, '1525'x)
 """
+
+
+def job_output(
+    module,
+    job_id=None,
+    owner=None,
+    job_name=None,
+    dd_name=None,
+    stream=False,
+    spill_threshold=None,
+    spill_dir=None,
+    metadata_only=False,
+    start_line=None,
+    max_lines=None,
+    tail=None,
+    follow=None,
+    wire_format="json",
+    step_summary=False,
+):
+    """Get the output from a z/OS job based on various search criteria.
+
+    Arguments:
+        module {AnsibleModule} -- The AnsibleModule object from the running module.
+
+    Keyword Arguments:
+        job_id {Union[str, list[str]]} -- The job ID(s) to search for. All jobs
+        are gathered by a single run of the REXX script, or one run for every
+        JOB_FILTER_LIMIT job IDs. (default: {None})
+        owner {str} -- The owner of the job (default: {''})
+        job_name {Union[str, list[str]]} -- The job name(s) to search for.
+        Without job_id, one run for every JOB_FILTER_LIMIT job names.
+        (default: {None})
+        dd_name {Union[str, list[str]]} -- The data definition(s) to retrieve.
+        Only the requested data definitions are browsed. (default: {None})
+        stream {bool} -- Read the REXX output incrementally instead of
+        buffering it all before parsing (default: {False})
+        spill_threshold {int} -- When streaming, ddnames with more lines than
+        this are written to a file instead of being returned inline.
+        Implies stream. (default: {None})
+        spill_dir {str} -- Directory for spilled ddname files.
+        A new temporary directory is used when not provided. (default: {None})
+        metadata_only {bool} -- Return job and ddname attributes without
+        browsing the spool, every ddname content is empty. (default: {False})
+        start_line {int} -- The first line of each ddname to return. (default: {None})
+        max_lines {int} -- The maximum number of lines to return for each ddname.
+        (default: {None})
+        tail {int} -- Return only the last lines of each ddname. Mutually
+        exclusive with start_line. (default: {None})
+        follow {dict[str, int]} -- The cursor returned by a previous call,
+        mapping each ddname id to the number of lines already read. Only lines
+        added since then are returned. Mutually exclusive with start_line and
+        tail. The job_id must select a single job. (default: {None})
+        wire_format {str} -- How the REXX script writes the job output, either
+        "json" or "framed". Framed output writes spool lines as they are and
+        avoids escaping every line in REXX. (default: {"json"})
+        step_summary {bool} -- Add the steps of each job, parsed from its
+        JESYSMSG and JESMSGLG. These are read separately when the other
+        options leave them out or incomplete. (default: {False})
+
+    Raises:
+        ValueError: When start_line, max_lines or tail is less than 1.
+        ValueError: When more than one of start_line, tail and follow is provided.
+        ValueError: When follow is provided and more than one job matches.
+        RuntimeError: When job output cannot be retrieved successfully but job exists.
+        RuntimeError: When no job output is found
+
+    Returns:
+        dict[str, list[dict]] -- The output information for a given job.
+    """
+
+    arg_defs = dict(
+        job_id=dict(arg_type="list", elements="qualifier_pattern"),
+        owner=dict(arg_type="qualifier_pattern"),
+        job_name=dict(arg_type="list", elements=_job_name_pattern),
+        dd_name=dict(arg_type="list", elements=_ddname_pattern),
+        spill_threshold=dict(arg_type="int", required=False),
+        spill_dir=dict(arg_type="path", required=False),
+        start_line=dict(arg_type="int", required=False),
+        max_lines=dict(arg_type="int", required=False),
+        tail=dict(arg_type="int", required=False),
+        wire_format=dict(arg_type="str", default="json", choices=WIRE_FORMATS),
+    )
+
+    if isinstance(job_id, str):
+        job_id = job_id.split(",")
+    if isinstance(job_name, str):
+        job_name = job_name.split(",")
+    if isinstance(dd_name, str):
+        dd_name = dd_name.split(",")
+
+    for key, value in (
+        ("start_line", start_line),
+        ("max_lines", max_lines),
+        ("tail", tail),
+    ):
+        if value is not None and int(value) < 1:
+            raise ValueError('Parameter "{0}" must be at least 1.'.format(key))
+
+    parser = BetterArgParser(arg_defs)
+    parsed_args = parser.parse_args(
+        {
+            "job_id": job_id,
+            "owner": owner,
+            "job_name": job_name,
+            "dd_name": dd_name,
+            "spill_threshold": spill_threshold,
+            "spill_dir": spill_dir,
+            "start_line": start_line,
+            "max_lines": max_lines,
+            "tail": tail,
+            "wire_format": wire_format,
+        }
+    )
+    if follow is not None:
+        follow = dict(
+            (str(int(dsid)), int(count)) for dsid, count in follow.items()
+        )
+
+    job_id = parsed_args.get("job_id") or []
+    job_name = parsed_args.get("job_name") or []
+    owner = parsed_args.get("owner") or ""
+    dd_name = parsed_args.get("dd_name") or []
+    spill_threshold = parsed_args.get("spill_threshold")
+    spill_dir = parsed_args.get("spill_dir")
+    wire_format = parsed_args.get("wire_format")
+    lines = dict(
+        start_line=parsed_args.get("start_line"),
+        max_lines=parsed_args.get("max_lines"),
+        tail=parsed_args.get("tail"),
+        follow=follow,
+    )
+    positions = [
+        key for key in ("start_line", "tail", "follow") if lines.get(key) is not None
+    ]
+    if len(positions) > 1:
+        raise ValueError(
+            'Parameters "start_line", "tail" and "follow" are mutually exclusive.'
+        )
+    if follow is not None and len(job_id) > 1:
+        raise ValueError('Parameter "follow" requires a single job_id.')
+
+    # Job names are only an SDSF filter when no job ID is given, otherwise
+    # the REXX script matches them against the jobs found by ID
+    chunked = None
+    if len(job_id) > JOB_FILTER_LIMIT:
+        chunked = "job_id"
+    elif not job_id and len(job_name) > JOB_FILTER_LIMIT:
+        chunked = "job_name"
+    if chunked:
+        values = job_id if chunked == "job_id" else job_name
+        jobs = []
+        found = set()
+        for index in range(0, len(values), JOB_FILTER_LIMIT):
+            filters = dict(job_id=job_id, job_name=job_name)
+            filters[chunked] = values[index: index + JOB_FILTER_LIMIT]
+            for job in job_output(
+                module,
+                owner=owner or None,
+                dd_name=dd_name,
+                stream=stream,
+                spill_threshold=spill_threshold,
+                spill_dir=spill_dir,
+                metadata_only=metadata_only,
+                start_line=start_line,
+                max_lines=max_lines,
+                tail=tail,
+                follow=follow,
+                wire_format=wire_format,
+                step_summary=step_summary,
+                **filters
+            ).get("jobs"):
+                if job.get("job_id") in found:
+                    continue
+                found.add(job.get("job_id"))
+                jobs.append(job)
+        if follow is not None:
+            _check_single_job(jobs)
+        return {"jobs": jobs}
+
+    # The REXX script matches job names along with job IDs on a trailing *
+    # only, other patterns are matched once the jobs are read
+    name_pattern = None
+    if job_id and len(job_name) > 1 and any(
+        "%" in name or "*" in name[:-1] for name in job_name
+    ):
+        name_pattern = _job_name_regex(job_name)
+        job_name = []
+
+    if stream or spill_threshold is not None:
+        job_detail_json = _stream_job_output(
+            module,
+            job_id,
+            owner,
+            job_name,
+            dd_name,
+            spill_threshold,
+            spill_dir,
+            metadata_only,
+            lines,
+            wire_format,
+        )
+    else:
+        rc, out, err = _get_job_json_str(
+            module, job_id, owner, job_name, dd_name, metadata_only, lines, wire_format
+        )
+        if rc != 0:
+            raise RuntimeError(
+                "Failed to retrieve job output. RC: {0} Error: {1}".format(
+                    str(rc), str(err)
+                )
+            )
+        if not out:
+            raise RuntimeError("Failed to retrieve job output. No job output found.")
+        if wire_format == "framed":
+            job_detail_json = {
+                "jobs": list(
+                    _iter_job_framed_lines(iter(out.split("\n")), _SpoolWriter())
+                )
+            }
+        else:
+            job_detail_json = json.loads(out, strict=False)
+        for job in job_detail_json.get("jobs"):
+            _set_return_code(job)
+            _set_line_cursors(job)
+    if name_pattern is not None:
+        job_detail_json["jobs"] = _match_job_names(
+            job_detail_json.get("jobs"), name_pattern
+        )
+    if follow is not None:
+        _check_single_job(job_detail_json.get("jobs"))
+
+    if step_summary:
+        jobs = job_detail_json.get("jobs")
+        complete = (
+            not metadata_only
+            and not dd_name
+            and spill_threshold is None
+            and all(value is None for value in lines.values())
+        )
+        if not complete and jobs:
+            summary_jobs = job_output(
+                module,
+                job_id=[job.get("job_id") for job in jobs],
+                dd_name=STEP_SUMMARY_DDNAMES,
+                wire_format=wire_format,
+            ).get("jobs")
+            steps = dict(
+                (job.get("job_id"), get_step_summary(job)) for job in summary_jobs
+            )
+            for job in jobs:
+                job["steps"] = steps.get(job.get("job_id"), [])
+        else:
+            for job in jobs:
+                job["steps"] = get_step_summary(job)
+    return job_detail_json
+
+
+def get_step_summary(job):
+    """Build the step summary of a job from the IEF142I, IEF272I and IEF472I
+    messages of its JESYSMSG, and the SMF000I messages of its JESMSGLG,
+    which are the only messages naming the program of each step.
+
+    Arguments:
+        job {dict} -- A job returned by job_output with the content of
+        JESYSMSG and, optionally, JESMSGLG.
+
+    Returns:
+        list[dict] -- The steps in the order they were run, each holding
+        stepname, procstep, program, executed, rc and abend.
+    """
+    steps = []
+    programs = []
+    for dd in job.get("ddnames") or []:
+        if dd.get("ddname") == "JESYSMSG":
+            for line in dd.get("content") or []:
+                step = _parse_step_message(line)
+                if step is not None:
+                    steps.append(step)
+        elif dd.get("ddname") == "JESMSGLG":
+            for line in dd.get("content") or []:
+                match = SMF000I_MESSAGE.search(line)
+                if match:
+                    programs.append(match.group(1).split())
+    for tokens in programs:
+        for step in steps:
+            names = [step.get("procstep"), step.get("stepname")]
+            if step.get("program") is None and _match_step_names(tokens, names):
+                step["program"] = tokens[len([n for n in names if n]) + 1]
+                break
+    return steps
+
+
+def _parse_step_message(line):
+    """Parse a step completion message of JESYSMSG.
+
+    Arguments:
+        line {str} -- A line of JESYSMSG.
+
+    Returns:
+        Union[dict, NoneType] -- The step, or None when the line does not
+        hold a step completion message.
+    """
+    match = STEP_MESSAGE.search(line)
+    if not match:
+        return None
+    message_id, names, text = match.groups()
+    names = names.split()[1:]
+    step = {
+        "stepname": names[-1] if names else "",
+        "procstep": names[0] if len(names) > 1 else "",
+        "program": None,
+        "executed": message_id != "IEF272I",
+        "rc": None,
+        "abend": None,
+    }
+    if message_id == "IEF142I":
+        cond_code = re.search(r"COND CODE\s+([0-9]+)", text)
+        if cond_code:
+            step["rc"] = int(cond_code.group(1))
+    elif message_id == "IEF472I":
+        system = re.search(r"SYSTEM=([0-9A-F]+)", text)
+        user = re.search(r"USER=([0-9]+)", text)
+        if system and system.group(1).strip("0"):
+            step["abend"] = "S" + system.group(1)
+        elif user:
+            step["abend"] = "U" + user.group(1)
+    return step
+
+
+def _match_step_names(tokens, names):
+    """Check whether an SMF000I message is about a step.
+
+    Arguments:
+        tokens {list[str]} -- The words of the message, starting with the job name.
+        names {list[str]} -- The procstep and stepname of the step.
+
+    Returns:
+        bool -- True when the words after the job name are the step names,
+        in any order, and are followed by the program.
+    """
+    names = sorted(name for name in names if name)
+    if len(tokens) < len(names) + 2:
+        return False
+    return sorted(tokens[1: len(names) + 1]) == names
+
+
+def compress_jobs(results, compression):
+    """Replace the jobs of a job_output result by a compressed,
+    base64 encoded copy in jobs_compressed.
+
+    Arguments:
+        results {dict} -- The result of job_output.
+        compression {str} -- Either "zlib" or "gzip".
+
+    Returns:
+        dict -- The result, with jobs_compressed instead of jobs.
+    """
+    compressor = zlib.compressobj(
+        zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, _COMPRESSION_WBITS.get(compression)
+    )
+    payload = json.dumps(results.pop("jobs")).encode("utf-8")
+    data = compressor.compress(payload) + compressor.flush()
+    results["jobs_compressed"] = {
+        "compression": compression,
+        "data": base64.b64encode(data).decode("ascii"),
+    }
+    return results
+
+
+def expand_jobs(results):
+    """Restore the jobs of a result produced by compress_jobs.
+
+    Arguments:
+        results {dict} -- A module result, with or without jobs_compressed.
+
+    Returns:
+        dict -- The result, with jobs instead of jobs_compressed.
+    """
+    compressed = results.pop("jobs_compressed", None)
+    if compressed is not None:
+        # 47 accepts both the zlib and the gzip container
+        data = zlib.decompress(base64.b64decode(compressed.get("data")), 47)
+        results["jobs"] = json.loads(data.decode("utf-8"))
+    return results
+
+
+def _set_return_code(job):
+    """Expand the raw return code message of a job into
+    its code, msg_code and msg_txt fields.
+
+    Arguments:
+        job {dict} -- A single job as produced by the REXX script.
+    """
+    job["ret_code"] = {} if job.get("ret_code") is None else job.get("ret_code")
+    job["ret_code"]["code"] = _get_return_code_num(
+        job.get("ret_code", {}).get("msg", "")
+    )
+    job["ret_code"]["msg_code"] = _get_return_code_str(
+        job.get("ret_code", {}).get("msg", "")
+    )
+    job["ret_code"]["msg_txt"] = ""
+
+
+def _job_name_regex(job_names):
+    """Build the expression matching any of the job name patterns.
+
+    Arguments:
+        job_names {list[str]} -- The job names, where * matches any
+        characters and % a single character.
+
+    Returns:
+        Pattern -- Matches a whole job name.
+    """
+    return re.compile(
+        "(?:{0})$".format(
+            "|".join(
+                "".join(
+                    ".*" if char == "*" else "." if char == "%" else re.escape(char)
+                    for char in name.upper()
+                )
+                for name in job_names
+            )
+        )
+    )
+
+
+def _match_job_names(jobs, name_pattern):
+    """Keep the jobs matching the job name patterns, removing the files
+    written for the ddnames of the others.
+
+    Arguments:
+        jobs {list[dict]} -- The jobs read.
+        name_pattern {Pattern} -- Built by _job_name_regex.
+
+    Returns:
+        list[dict] -- The matching jobs.
+    """
+    matched = []
+    for job in jobs:
+        if name_pattern.match((job.get("job_name") or "").upper()):
+            matched.append(job)
+            continue
+        for dd in job.get("ddnames", []):
+            if dd.get("content_path") and path.exists(dd.get("content_path")):
+                remove(dd.get("content_path"))
+    return matched
+
+
+def _check_single_job(jobs):
+    """Check that a single job is followed, as the cursor holds ddname ids,
+    which are the same in every job.
+
+    Arguments:
+        jobs {list[dict]} -- The jobs read.
+
+    Raises:
+        ValueError: When more than one job was read.
+    """
+    if len(jobs) > 1:
+        raise ValueError(
+            'Parameter "follow" applies to a single job, {0} jobs matched.'.format(
+                len(jobs)
+            )
+        )
+
+
+def _set_line_cursors(job):
+    """Convert the first line returned for each ddname of a job to an integer,
+    add the line to continue from when not all lines were returned and
+    build the job cursor used to follow the job output.
+
+    Arguments:
+        job {dict} -- A single job as produced by the REXX script.
+    """
+    job["cursor"] = {}
+    for dd in job.get("ddnames", []):
+        record_count = int(dd.get("record_count") or 0)
+        if dd.get("first_line") is None:
+            job["cursor"][dd.get("id")] = record_count
+            continue
+        dd["first_line"] = int(dd.get("first_line"))
+        next_line = dd.get("first_line") + dd.get(
+            "content_lines", len(dd.get("content", []))
+        )
+        job["cursor"][dd.get("id")] = next_line - 1
+        if next_line > record_count:
+            next_line = None
+        dd["next_line"] = next_line
+
+
+def _stream_job_output(
+    module,
+    job_id=None,
+    owner="",
+    job_name=None,
+    dd_name=None,
+    spill_threshold=None,
+    spill_dir=None,
+    metadata_only=False,
+    lines=None,
+    wire_format="json",
+):
+    """Run the job output REXX script and parse its output while it is
+    still being produced, so the full script output is never held in memory.
+
+    Arguments:
+        module {AnsibleModule} -- The AnsibleModule object from the running module.
+
+    Keyword Arguments:
+        job_id {list[str]} -- The job IDs to search for (default: {None})
+        owner {str} -- The owner of the job (default: {''})
+        job_name {list[str]} -- The job names to search for (default: {None})
+        dd_name {list[str]} -- The data definitions to retrieve (default: {None})
+        spill_threshold {int} -- Line count above which a ddname is written
+        to a file. (default: {None})
+        spill_dir {str} -- Directory for spilled ddname files. (default: {None})
+        metadata_only {bool} -- Skip browsing the spool. (default: {False})
+        lines {dict} -- The start_line, max_lines, tail and follow limits
+        to apply to each ddname. (default: {None})
+        wire_format {str} -- Either "json" or "framed". (default: {"json"})
+
+    Raises:
+        RuntimeError: When the script fails, with its return code and error.
+        RuntimeError: When no job output is found
+
+    Returns:
+        dict[str, list[dict]] -- The output information for a given job.
+    """
+    cmd = _get_job_json_cmd(
+        job_id, owner, job_name, dd_name, metadata_only, lines, wire_format
+    )
+    # module.run_command holds the whole output in memory, so the script is
+    # run the same way with the environment the module runs commands with
+    env = dict(environ)
+    env.update(getattr(module, "run_command_environ_update", None) or {})
+    parse = _iter_job_json_lines
+    if wire_format == "framed":
+        parse = _iter_job_framed_lines
+    err = TemporaryFile()
     try:
+        proc = Popen(cmd, stdout=PIPE, stderr=err, env=env)
+        error = None
+        ended = True
+        try:
+            # spool records may hold a bare carriage return, only line
+            # feeds end the lines of the script output
+            out = io.TextIOWrapper(
+                proc.stdout, encoding="utf-8", errors="replace", newline="\n"
+            )
+            try:
+                spool = _SpoolWriter(spill_threshold, spill_dir)
+                jobs = []
+                for job in parse(_iter_lines(out), spool):
+                    _set_return_code(job)
+                    _set_line_cursors(job)
+                    jobs.append(job)
+            except Exception as e:
+                # when the whole output was read, the script ended on its
+                # own and its return code explains the parse error
+                error = e
+                ended = not out.read(1)
+                if not ended:
+                    proc.kill()
+            finally:
+                out.close()
+        finally:
+            rc = proc.wait()
+        if rc != 0 and ended:
+            err.seek(0)
+            raise RuntimeError(
+                "Failed to retrieve job output. RC: {0} Error: {1}".format(
+                    str(rc), err.read().decode("utf-8", "replace")
+                )
+            )
+        if error is not None:
+            raise error
+    finally:
+        err.close()
+    return {"jobs": jobs}
+
+
+def _iter_job_json_lines(lines, spool):
+    """Incrementally parse the line oriented JSON produced by the job output
+    REXX script. Every REXX Say statement produces exactly one structural
+    element per line, so no line needs more than itself to be understood.
+
+    Arguments:
+        lines {Iterable[str]} -- Lines of REXX script output.
+        spool {_SpoolWriter} -- Decides where ddname content is kept.
+
+    Raises:
+        RuntimeError: When no job output is found
+
+    Yields:
+        dict -- Each job as soon as its closing brace is read.
+    """
+    job = None
+    dd = None
+    in_ddnames = False
+    in_content = False
+    started = False
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        if in_content:
+            if line == "]":
+                in_content = False
+                spool.close(dd)
+            elif "\\" not in line:
+                if line != ",":
+                    spool.add(dd, line[1:-1])
+            else:
+                spool.add(dd, json.loads(line, strict=False))
+            continue
+        if line == '{"jobs":[]}':
+            return
+        if line == '{"jobs":[':
+            started = True
+        elif line == "]}" or line == ",":
+            continue
+        elif line == "{":
+            if in_ddnames:
+                dd = {}
+            else:
+                job = {}
+        elif line == "}":
+            if dd is not None:
+                job["ddnames"].append(dd)
+                dd = None
+            elif job is not None:
+                yield job
+                job = None
+        elif line == '"ddnames":[]':
+            job["ddnames"] = []
+        elif line == '"ddnames":[':
+            job["ddnames"] = []
+            in_ddnames = True
+        elif line == "]":
+            in_ddnames = False
+        elif line == '"content":[':
+            in_content = True
+            spool.open(job, dd)
+        else:
+            (dd if dd is not None else job).update(
+                json.loads("{" + line.rstrip(",") + "}", strict=False)
+            )
+    if not started:
+        raise RuntimeError("Failed to retrieve job output. No job output found.")
 
-        if dd_name is None or dd_name == "?":
-            dd_name = ""
-        jobid_param = "jobid=" + job_id
-        owner_param = "owner=" + owner
-        jobname_param = "jobname=" + job_name
-        ddname_param = "ddname=" + dd_name
-
-        tmp = NamedTemporaryFile(delete=True)
-        with open(tmp.name, "w") as f:
-            f.write(get_job_detail_json_rexx)
-        chmod(tmp.name, S_IEXEC | S_IREAD | S_IWRITE)
-        args = [jobid_param, owner_param, jobname_param, ddname_param]
-
-        cmd = [tmp.name, " ".join(args)]
-        rc, out, err = module.run_command(args=cmd)
-    except Exception:
-        raise
+
+def _iter_job_framed_lines(lines, spool):
+    """Parse the framed output produced by the job output REXX script.
+    Spool lines are written as they are, preceded by a line holding their
+    count, so they are taken from the input in slices without looking at
+    each of them. A ddname read in several windows has a count line before
+    each window.
+
+    Arguments:
+        lines {Iterator[str]} -- Lines of REXX script output, without line endings.
+        spool {_SpoolWriter} -- Decides where ddname content is kept.
+
+    Raises:
+        RuntimeError: When no job output is found
+
+    Yields:
+        dict -- Each job once all of its ddnames are read.
+    """
+    job = None
+    dd = None
+    opened = False
+    started = False
+    for line in lines:
+        tag = line[:1]
+        if tag == "A":
+            key, sep, value = line[2:].partition(" ")
+            if key == "ret_code":
+                job["ret_code"] = {"msg": value}
+            else:
+                (dd if dd is not None else job)[key] = value
+        elif tag == "C":
+            count = int(line[2:])
+            if not opened:
+                spool.open(job, dd)
+                opened = True
+            while count > 0:
+                chunk = list(islice(lines, min(count, FRAMED_CHUNK_LINES)))
+                if not chunk:
+                    break
+                spool.extend(dd, chunk)
+                count -= len(chunk)
+        elif tag == "D":
+            if opened:
+                spool.close(dd)
+                opened = False
+            dd = {"content": []}
+            job["ddnames"].append(dd)
+        elif tag == "J":
+            if opened:
+                spool.close(dd)
+                opened = False
+            if job is not None:
+                yield job
+            job = {"ddnames": []}
+            dd = None
+        elif tag == "F":
+            started = True
+    if opened:
+        spool.close(dd)
+    if job is not None:
+        yield job
+    if not started:
+        raise RuntimeError("Failed to retrieve job output. No job output found.")
+
+
+def _iter_lines(stream, size=65536):
+    """Split a text stream into lines without line endings,
+    reading it in blocks rather than line by line.
+
+    Arguments:
+        stream {TextIOBase} -- The stream to read.
+
+    Keyword Arguments:
+        size {int} -- The number of characters to read at a time. (default: {65536})
+
+    Returns:
+        Iterator[str] -- The lines of the stream.
+    """
+
+    def blocks():
+        pending = ""
+        for block in iter(lambda: stream.read(size), ""):
+            block_lines = (pending + block).split("\n")
+            pending = block_lines.pop()
+            yield block_lines
+        if pending:
+            yield [pending]
+
+    return chain.from_iterable(blocks())
+
+
+class _SpoolWriter(object):
+    def __init__(self, spill_threshold=None, spill_dir=None):
+        """Collects ddname content, moving it to a file on disk once
+        a ddname grows beyond spill_threshold lines.
+
+        Keyword Arguments:
+            spill_threshold {int} -- Line count above which content is
+            written to a file. None keeps all content inline, 0 writes
+            every ddname to a file, even when it is empty. (default: {None})
+            spill_dir {str} -- Directory for spilled content. (default: {None})
+        """
+        self.spill_threshold = spill_threshold
+        self.spill_dir = spill_dir
+        self.name = None
+        self.file = None
+
+    def open(self, job, dd):
+        """Start collecting content for a ddname.
+
+        Arguments:
+            job {dict} -- The job the ddname belongs to.
+            dd {dict} -- The ddname record to collect content for.
+        """
+        dd["content"] = []
+        self.name = "{0}.{1}.{2}".format(
+            job.get("job_id"), dd.get("id"), dd.get("ddname")
+        )
+
+    def add(self, dd, line):
+        """Add a line of content to the ddname currently being collected.
+
+        Arguments:
+            dd {dict} -- The ddname record being collected.
+            line {str} -- The line of content.
+        """
+        self.extend(dd, [line])
+
+    def extend(self, dd, lines):
+        """Add lines of content to the ddname currently being collected.
+
+        Arguments:
+            dd {dict} -- The ddname record being collected.
+            lines {list[str]} -- The lines of content.
+        """
+        if self.file:
+            self.file.write("\n".join(lines) + "\n")
+            dd["content_lines"] += len(lines)
+            return
+        dd["content"].extend(lines)
+        if (
+            self.spill_threshold is not None
+            and len(dd["content"]) > self.spill_threshold
+        ):
+            self._spill(dd)
+
+    def _spill(self, dd):
+        """Move the content collected so far for a ddname to a file,
+        which receives the rest of its content.
+
+        Arguments:
+            dd {dict} -- The ddname record being collected.
+        """
+        if not self.spill_dir:
+            self.spill_dir = mkdtemp(prefix="ansible-zos-spool-")
+        dd["content_path"] = path.join(self.spill_dir, self.name)
+        dd["content_lines"] = len(dd["content"])
+        self.file = open(dd["content_path"], "w")
+        if dd["content"]:
+            self.file.write("\n".join(dd["content"]) + "\n")
+        dd["content"] = []
+
+    def close(self, dd):
+        """Finish collecting content for a ddname.
+
+        Arguments:
+            dd {dict} -- The ddname record being collected.
+        """
+        if self.spill_threshold == 0 and not self.file:
+            self._spill(dd)
+        if self.file:
+            self.file.close()
+            self.file = None
+        self.name = None
+
+
+def _get_job_json_str(
+    module,
+    job_id=None,
+    owner="",
+    job_name=None,
+    dd_name=None,
+    metadata_only=False,
+    lines=None,
+    wire_format="json",
+):
+    """Generate JSON output string containing Job info from SDSF.
+    Runs the REXX script installed in the helper cache to gather output.
+
+    Arguments:
+        module {AnsibleModule} -- The AnsibleModule object from the running module.
+
+    Keyword Arguments:
+        job_id {list[str]} -- The job IDs to search for (default: {None})
+        owner {str} -- The owner of the job (default: {''})
+        job_name {list[str]} -- The job names to search for (default: {None})
+        dd_name {list[str]} -- The data definitions to retrieve (default: {None})
+        metadata_only {bool} -- Gather job and ddname attributes without
+        issuing ISFBROWSE (default: {False})
+        lines {dict} -- The start_line, max_lines, tail and follow limits
+        to apply to each ddname. (default: {None})
+        wire_format {str} -- Either "json" or "framed". (default: {"json"})
+
+    Returns:
+        tuple[int, str, str] -- RC, STDOUT, and STDERR from the REXX script.
+    """
+    cmd = _get_job_json_cmd(
+        job_id, owner, job_name, dd_name, metadata_only, lines, wire_format
+    )
+    rc, out, err = module.run_command(args=cmd)
     return rc, out, err
 
 
+def _get_job_json_cmd(
+    job_id=None,
+    owner="",
+    job_name=None,
+    dd_name=None,
+    metadata_only=False,
+    lines=None,
+    wire_format="json",
+):
+    """Install the job output REXX script in the helper cache and build
+    the command used to run it.
+
+    Keyword Arguments:
+        job_id {list[str]} -- The job IDs to search for (default: {None})
+        owner {str} -- The owner of the job (default: {''})
+        job_name {list[str]} -- The job names to search for (default: {None})
+        dd_name {list[str]} -- The data definitions to retrieve (default: {None})
+        metadata_only {bool} -- Skip browsing the spool (default: {False})
+        lines {dict} -- The start_line, max_lines, tail and follow limits
+        to apply to each ddname. (default: {None})
+        wire_format {str} -- Either "json" or "framed". (default: {"json"})
+
+    Returns:
+        list[str] -- The command.
+    """
+    dd_name = _as_list(dd_name)
+    if "?" in dd_name:
+        dd_name = []
+    jobid_param = "jobid=" + ",".join(_as_list(job_id))
+    owner_param = "owner=" + owner
+    jobname_param = "jobname=" + ",".join(_as_list(job_name))
+    ddname_param = "ddname=" + ",".join(dd_name)
+    browse_param = "browse=" + ("N" if metadata_only else "Y")
+    if lines is None:
+        lines = {}
+    line_params = [
+        "startline=" + str(lines.get("start_line") or ""),
+        "linelimit=" + str(lines.get("max_lines") or ""),
+        "tail=" + str("" if lines.get("tail") is None else lines.get("tail")),
+        "since="
+        + ",".join(
+            "{0}:{1}".format(dsid, count)
+            for dsid, count in (lines.get("follow") or {}).items()
+        ),
+        "format=" + wire_format,
+    ]
+
+    script_path = install_rexx("job_json.rexx", JOB_JSON_REXX)
+    args = [
+        jobid_param,
+        owner_param,
+        jobname_param,
+        ddname_param,
+        browse_param,
+    ] + line_params
+
+    cmd = [script_path, " ".join(args)]
+    return cmd
+
+
+def _as_list(value):
+    """Return the value as a list, treating None as an empty list
+    and a str as a list of one element.
+
+    Arguments:
+        value {Union[str, list[str], NoneType]} -- The value to convert.
+
+    Returns:
+        list[str] -- The value as a list.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
 def _get_return_code_num(rc_str):
     """Parse an integer return code from
     z/OS job output return code string.
@@ -258,6 +1294,32 @@ def _get_return_code_str(rc_str):
     return rc
 
 
+def _job_name_pattern(contents, resolve_dependencies):
+    """Resolver for job_name_pattern type arguments, where * matches any
+    characters and % a single character.
+
+    Arguments:
+        contents {bool} -- The contents of the argument.
+        resolved_dependencies {dict} -- Contains all of the dependencies and their contents,
+        which have already been handled,
+        for use during current arguments handling operations.
+
+    Raises:
+        ValueError: When contents is invalid argument type
+    Returns:
+        str -- The arguments contents after any necessary operations.
+    """
+    if not re.fullmatch(
+        r"^[A-Z$#@%*][A-Z0-9$#@%*]{0,7}$", str(contents), re.IGNORECASE,
+    ):
+        raise ValueError(
+            'Invalid argument type for "{0}". expected "job_name_pattern"'.format(
+                contents
+            )
+        )
+    return str(contents)
+
+
 def _ddname_pattern(contents, resolve_dependencies):
     """Resolver for ddname_pattern type arguments
 
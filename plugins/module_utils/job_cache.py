@@ -0,0 +1,184 @@
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from os import fdopen, listdir, makedirs, path, remove, rename, stat, utime
+from tempfile import mkstemp
+import hashlib
+import json
+import re
+
+JOB_CACHE_DIR = "~/.ansible/zos_job_output_cache"
+
+# Default upper bound of the cache in megabytes
+JOB_CACHE_MAX_SIZE = 256
+
+# Return code messages of jobs whose spool will not change anymore
+FINAL_RET_CODE = re.compile(r"^\s*(?:CC|ABEND|JCL\s*ERR)")
+
+
+class JobOutputCache(object):
+    def __init__(self, cache_dir=None, max_size=None):
+        """Cache of the output of finished jobs, kept on the controller.
+
+        Entries are keyed by host, job ID and ddname and stored one file
+        each. Reading an entry refreshes its modification time, and the
+        least recently used entries are removed once the cache grows over
+        max_size megabytes.
+
+        Keyword Arguments:
+            cache_dir {str} -- The cache directory. (default: {None})
+            max_size {int} -- The size limit in megabytes. (default: {None})
+        """
+        self.cache_dir = path.expanduser(cache_dir or JOB_CACHE_DIR)
+        if max_size is None:
+            max_size = JOB_CACHE_MAX_SIZE
+        self.max_size = int(max_size) * 1024 * 1024
+
+    def get(self, host, job_ids, dd_names=None):
+        """Return the cached output of jobs.
+
+        Arguments:
+            host {str} -- The inventory host the jobs ran on.
+            job_ids {list[str]} -- The job IDs.
+
+        Keyword Arguments:
+            dd_names {list[str]} -- The ddnames to return, all ddnames
+            when not provided. (default: {None})
+
+        Returns:
+            list[dict] -- The jobs in the order of job_ids, or None when
+            any of them is not fully cached.
+        """
+        jobs = []
+        for job_id in job_ids:
+            job = self._read(host, job_id)
+            if job is None:
+                return None
+            names = dd_names or job.get("ddname_list")
+            if not dd_names and not job.get("complete"):
+                return None
+            ddnames = []
+            for name in names:
+                entries = self._read(host, job_id, name)
+                if entries is None:
+                    if job.get("complete") and name not in job.get("ddname_list"):
+                        continue
+                    return None
+                ddnames.extend(entries)
+            ddnames.sort(key=lambda dd: int(dd.get("id") or 0))
+            job["ddnames"] = ddnames
+            job["cursor"] = dict(
+                (dd.get("id"), int(dd.get("record_count") or 0)) for dd in ddnames
+            )
+            del job["ddname_list"]
+            del job["complete"]
+            jobs.append(job)
+        return jobs
+
+    def put(self, host, jobs, dd_names=None):
+        """Store the output of jobs, skipping jobs that are still running.
+
+        Arguments:
+            host {str} -- The inventory host the jobs ran on.
+            jobs {list[dict]} -- The jobs returned by job_output with
+            the complete content of each ddname.
+
+        Keyword Arguments:
+            dd_names {list[str]} -- The ddnames the jobs were requested
+            with, all ddnames when not provided. (default: {None})
+        """
+        stored = False
+        for job in jobs:
+            if not is_final(job):
+                continue
+            job_id = job.get("job_id")
+            ddnames = {}
+            for dd in job.get("ddnames") or []:
+                ddnames.setdefault(dd.get("ddname"), []).append(dd)
+            names = list(ddnames.keys())
+            complete = not dd_names
+            if not complete:
+                cached = self._read(host, job_id)
+                if cached is not None:
+                    complete = cached.get("complete")
+                    names = list(set(names) | set(cached.get("ddname_list")))
+            for name, entries in ddnames.items():
+                self._write(host, job_id, entries, name)
+            meta = dict(
+                (k, v) for k, v in job.items() if k not in ("ddnames", "cursor")
+            )
+            meta["ddname_list"] = sorted(names)
+            meta["complete"] = complete
+            self._write(host, job_id, meta)
+            stored = True
+        if stored:
+            self._evict()
+
+    def _entry_path(self, host, job_id, dd_name=""):
+        key = "\n".join([host, job_id, dd_name]).encode("utf-8")
+        return path.join(self.cache_dir, hashlib.sha256(key).hexdigest() + ".json")
+
+    def _read(self, host, job_id, dd_name=""):
+        entry_path = self._entry_path(host, job_id, dd_name)
+        try:
+            with open(entry_path, "r") as f:
+                entry = json.load(f)
+            utime(entry_path, None)
+        except (IOError, OSError, ValueError):
+            return None
+        return entry
+
+    def _write(self, host, job_id, entry, dd_name=""):
+        if not path.isdir(self.cache_dir):
+            makedirs(self.cache_dir, 0o700)
+        fd, tmp_path = mkstemp(prefix=".", dir=self.cache_dir)
+        try:
+            with fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            rename(tmp_path, self._entry_path(host, job_id, dd_name))
+        except Exception:
+            if path.exists(tmp_path):
+                remove(tmp_path)
+            raise
+
+    def _evict(self):
+        """Remove the least recently used entries until the cache
+        fits in max_size."""
+        entries = []
+        total = 0
+        for name in listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            entry_path = path.join(self.cache_dir, name)
+            try:
+                st = stat(entry_path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry_path))
+            total += st.st_size
+        entries.sort()
+        for mtime, size, entry_path in entries:
+            if total <= self.max_size:
+                break
+            try:
+                remove(entry_path)
+            except OSError:
+                pass
+            total -= size
+
+
+def is_final(job):
+    """Check whether a job has ended, so its output will not change.
+
+    Arguments:
+        job {dict} -- A job returned by job_output.
+
+    Returns:
+        bool -- True when the job ended with CC, ABEND or JCL ERROR.
+    """
+    msg = (job.get("ret_code") or {}).get("msg")
+    return bool(msg and FINAL_RET_CODE.match(msg))
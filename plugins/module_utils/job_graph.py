@@ -0,0 +1,153 @@
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+# States of the entries of a job graph
+WAITING = "waiting"
+SUBMITTED = "submitted"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+class JobGraph(object):
+    def __init__(self, entries):
+        """Track which jobs of a batch can be submitted, given the entries
+        each of them depends on.
+
+        Entries are identified by their index. An entry is ready once all
+        its dependencies succeeded, and skipped as soon as any of them
+        failed or was skipped.
+
+        Arguments:
+            entries {list[dict]} -- The batch entries, with an optional name
+            and the names of the entries they depend on in dependencies.
+
+        Raises:
+            ValueError: When two entries have the same name, a dependency
+            names no entry, or the dependencies form a cycle.
+        """
+        self.names = {}
+        for index, entry in enumerate(entries):
+            name = entry.get("name")
+            if not name:
+                continue
+            if name in self.names:
+                raise ValueError("Duplicate batch entry name {0}.".format(name))
+            self.names[name] = index
+        self.dependencies = []
+        self.dependents = [[] for entry in entries]
+        for index, entry in enumerate(entries):
+            dependencies = []
+            for name in entry.get("dependencies") or []:
+                if name not in self.names:
+                    raise ValueError(
+                        "Batch entry {0} depends on unknown entry {1}.".format(
+                            index, name
+                        )
+                    )
+                dependencies.append(self.names[name])
+                self.dependents[self.names[name]].append(index)
+            self.dependencies.append(dependencies)
+        self.states = [WAITING] * len(entries)
+        self.reasons = [None] * len(entries)
+        self._check_cycles()
+
+    def ready(self):
+        """Return the entries that can be submitted now.
+
+        Returns:
+            list[int] -- The waiting entries whose dependencies all succeeded.
+        """
+        return [
+            index
+            for index, state in enumerate(self.states)
+            if state == WAITING
+            and all(self.states[dep] == SUCCEEDED for dep in self.dependencies[index])
+        ]
+
+    def submit(self, index):
+        """Record an entry was submitted.
+
+        Arguments:
+            index {int} -- The entry.
+        """
+        self.states[index] = SUBMITTED
+
+    def finish(self, index, succeeded):
+        """Record the outcome of an entry, and skip the entries that
+        depend on it when it failed.
+
+        Arguments:
+            index {int} -- The entry.
+            succeeded {bool} -- Whether the entry succeeded.
+
+        Returns:
+            list[int] -- The entries skipped because of this outcome.
+        """
+        self.states[index] = SUCCEEDED if succeeded else FAILED
+        if succeeded:
+            return []
+        skipped = []
+        failed = [index]
+        while failed:
+            cause = failed.pop()
+            for dependent in self.dependents[cause]:
+                if self.states[dependent] != WAITING:
+                    continue
+                self.states[dependent] = SKIPPED
+                self.reasons[dependent] = cause
+                skipped.append(dependent)
+                failed.append(dependent)
+        return skipped
+
+    def waiting(self):
+        """Return the entries neither submitted nor skipped yet.
+
+        Returns:
+            list[int] -- The waiting entries.
+        """
+        return [index for index, state in enumerate(self.states) if state == WAITING]
+
+    def name(self, index):
+        """Return the name of an entry, or its index when it has none.
+
+        Arguments:
+            index {int} -- The entry.
+
+        Returns:
+            str -- The name of the entry.
+        """
+        for name, named in self.names.items():
+            if named == index:
+                return name
+        return str(index)
+
+    def _check_cycles(self):
+        """Raise ValueError when the dependencies form a cycle."""
+        visiting = set()
+        visited = set()
+        for root in range(len(self.states)):
+            if root in visited:
+                continue
+            stack = [(root, iter(self.dependencies[root]))]
+            visiting.add(root)
+            while stack:
+                index, dependencies = stack[-1]
+                dependency = next(dependencies, None)
+                if dependency is None:
+                    stack.pop()
+                    visiting.discard(index)
+                    visited.add(index)
+                elif dependency in visiting:
+                    raise ValueError(
+                        "Batch entry {0} is part of a dependency cycle.".format(
+                            self.name(dependency)
+                        )
+                    )
+                elif dependency not in visited:
+                    visiting.add(dependency)
+                    stack.append((dependency, iter(self.dependencies[dependency])))
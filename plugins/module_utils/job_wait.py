@@ -0,0 +1,250 @@
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from time import sleep
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.retry import (
+    RetryPolicy,
+    monotonic,
+)
+
+# Statuses of jobs that have not ended yet
+QUEUED_STATUSES = ["INPUT"]
+ACTIVE_STATUSES = ["AC"]
+
+
+class JobWaiter(object):
+    def __init__(
+        self,
+        list_jobs,
+        interval=0.1,
+        max_interval=5.0,
+        backoff=1.5,
+        jitter=0.0,
+        retry=None,
+    ):
+        """Poll JES for the status of a job, waiting a little longer between
+        each query, so short jobs are seen soon after they end while long
+        jobs are not queried more than once every max_interval seconds.
+
+        Arguments:
+            list_jobs {callable} -- Returns the list of jobs with a job_id
+            keyword argument, or of all the jobs of the user without it,
+            such as zoautil_py Jobs.list.
+
+        Keyword Arguments:
+            interval {float} -- Seconds to wait after the first query. (default: {0.1})
+            max_interval {float} -- Longest wait between two queries. (default: {5.0})
+            backoff {float} -- Factor applied to the wait after each query.
+            (default: {1.5})
+            jitter {float} -- Fraction of each wait added or removed at
+            random. (default: {0.0})
+            retry {RetryPolicy} -- Retries each list_jobs call. An IndexError
+            left once it gives up means the job is not listed. Without it,
+            the first IndexError does. (default: {None})
+        """
+        self.list_jobs = list_jobs
+        if retry is None:
+            retry = RetryPolicy(attempts=1, retry_on=(IndexError,))
+        self.retry = retry
+        self.policy = RetryPolicy(
+            interval=interval,
+            max_interval=max_interval,
+            backoff=backoff,
+            jitter=jitter,
+            sleep=_sleep,
+        )
+        self.polls = 0
+        self.states = {}
+        # The monotonic time each job was first listed at
+        self.seen = {}
+
+    def find(self, job_id, timeout=10):
+        """Query a job until JES lists it.
+
+        Arguments:
+            job_id {str} -- The job ID.
+
+        Keyword Arguments:
+            timeout {float} -- Seconds to keep querying. (default: {10})
+
+        Returns:
+            list[dict] -- The jobs listed for the job ID, or None when the
+            job was not listed before the timeout.
+        """
+        deadline = monotonic() + timeout
+        for jobs in self._poll([job_id], deadline):
+            if jobs:
+                return [jobs.get(job_id)]
+        return None
+
+    def wait(self, job_id, timeout, start=None):
+        """Query a job until it ends or the timeout expires.
+
+        Arguments:
+            job_id {str} -- The job ID.
+            timeout {float} -- Seconds to wait for the job to end.
+
+        Keyword Arguments:
+            start {float} -- The monotonic time the job was submitted at, used
+            to measure the queue time. (default: {None})
+
+        Returns:
+            dict -- The last listing of the job in job, whether the timeout
+            expired in timed_out, the seconds spent waiting in duration, and
+            the visible_time, queue_time and execution_time of the job
+            measured by polling, None when they could not be observed.
+        """
+        return self.wait_all([job_id], timeout, start).get(job_id)
+
+    def wait_all(self, job_ids, timeout, start=None, return_when="all"):
+        """Query jobs until they all end, or any of them with
+        return_when="any", or the timeout expires.
+
+        While more than one job is pending, each query lists all the jobs
+        at once and only the jobs missing from that list are queried by ID.
+        The waiter remembers what it observed of each job, so a job can be
+        waited for again by a later call without losing its timing.
+
+        Arguments:
+            job_ids {list[str]} -- The job IDs.
+            timeout {float} -- Seconds to wait for the jobs to end.
+
+        Keyword Arguments:
+            start {Union[float, dict[str, float]]} -- The monotonic time the
+            jobs were submitted at, or a time per job ID. (default: {None})
+            return_when {str} -- Either all or any. (default: {"all"})
+
+        Returns:
+            dict[str, dict] -- The result of wait for each job ID.
+        """
+        started = monotonic()
+        deadline = started + timeout
+        for job_id in job_ids:
+            if job_id in self.states:
+                continue
+            submitted = start
+            if isinstance(start, dict):
+                submitted = start.get(job_id)
+            self.states[job_id] = dict(
+                job=None,
+                start=started if submitted is None else submitted,
+                waiting_since=started,
+                running_since=None,
+                ended_at=None,
+            )
+        pending = [
+            job_id for job_id in job_ids if self.states[job_id]["ended_at"] is None
+        ]
+        ended = len(pending) < len(job_ids)
+        if pending and not (ended and return_when == "any"):
+            for jobs in self._poll(pending, deadline):
+                now = monotonic()
+                for job_id in list(pending):
+                    state = self.states[job_id]
+                    state["job"] = jobs.get(job_id) or state.get("job")
+                    status = state["job"].get("status") if state["job"] else None
+                    if status in ACTIVE_STATUSES:
+                        if state["running_since"] is None:
+                            state["running_since"] = now
+                    elif status is not None and status not in QUEUED_STATUSES:
+                        state["ended_at"] = now
+                        pending.remove(job_id)
+                        ended = True
+                if not pending or (ended and return_when == "any"):
+                    break
+        now = monotonic()
+        return dict((job_id, self._result(job_id, now)) for job_id in job_ids)
+
+    def _result(self, job_id, now):
+        """Build the result of wait from what was observed of a job.
+
+        Arguments:
+            job_id {str} -- The job ID.
+            now {float} -- The monotonic time the wait ended at.
+
+        Returns:
+            dict -- The result of wait.
+        """
+        state = self.states[job_id]
+        result = dict(
+            job=state.get("job"),
+            timed_out=state.get("ended_at") is None,
+            duration=now - state.get("waiting_since"),
+            visible_time=None,
+            queue_time=None,
+            execution_time=None,
+            polls=self.polls,
+            waited=self.policy.waited,
+        )
+        if job_id in self.seen:
+            result["visible_time"] = max(self.seen[job_id] - state.get("start"), 0.0)
+        if state.get("ended_at") is not None:
+            result["duration"] = state.get("ended_at") - state.get("waiting_since")
+        if state.get("running_since") is not None:
+            result["queue_time"] = state.get("running_since") - state.get("start")
+            if state.get("ended_at") is not None:
+                result["execution_time"] = (
+                    state.get("ended_at") - state.get("running_since")
+                )
+        return result
+
+    def _poll(self, job_ids, deadline):
+        """Query jobs, sleeping between queries, until the deadline.
+
+        Arguments:
+            job_ids {list[str]} -- The IDs of the jobs still pending, which
+            the caller may shorten between queries.
+            deadline {float} -- The monotonic time to stop at.
+
+        Yields:
+            dict[str, dict] -- The listing of each job ID, jobs that are not
+            listed yet are left out.
+        """
+        delays = self.policy.delays()
+        while True:
+            jobs = {}
+            if len(job_ids) > 1:
+                jobs = self._list(None, job_ids)
+            for job_id in job_ids:
+                if job_id not in jobs:
+                    jobs.update(self._list(job_id, [job_id]))
+            yield jobs
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return
+            self.policy.wait(min(next(delays), remaining))
+
+    def _list(self, job_id, job_ids):
+        """List jobs, by ID or all the jobs of the user when job_id is None.
+
+        Arguments:
+            job_id {str} -- The job ID to list, or None.
+            job_ids {list[str]} -- The job IDs to keep from the listing.
+
+        Returns:
+            dict[str, dict] -- The listing of each job ID found.
+        """
+        self.polls += 1
+        try:
+            if job_id is None:
+                listed = self.retry.call(self.list_jobs)
+            else:
+                listed = self.retry.call(self.list_jobs, job_id=job_id)
+        except IndexError:
+            listed = []
+        jobs = dict(
+            (job.get("id"), job) for job in listed or [] if job.get("id") in job_ids
+        )
+        now = monotonic()
+        for listed_id in jobs:
+            self.seen.setdefault(listed_id, now)
+        return jobs
+
+
+def _sleep(seconds):
+    """Sleep through the module global, so the wait can be replaced."""
+    sleep(seconds)
@@ -0,0 +1,141 @@
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from random import uniform
+from time import sleep as _sleep
+
+try:
+    from time import monotonic
+except ImportError:
+    from time import time as monotonic
+
+
+class RetryPolicy(object):
+    def __init__(
+        self,
+        attempts=None,
+        interval=0.1,
+        max_interval=5.0,
+        backoff=2.0,
+        jitter=0.0,
+        deadline=None,
+        retry_on=(Exception,),
+        classify=None,
+        sleep=None,
+    ):
+        """Retry a call with exponential backoff, within a number of
+        attempts and a deadline, and keep metrics on the attempts.
+
+        Arguments and keyword arguments are all optional.
+
+        Keyword Arguments:
+            attempts {int} -- The most calls, unlimited when None.
+            (default: {None})
+            interval {float} -- Seconds to wait before the first retry.
+            (default: {0.1})
+            max_interval {float} -- Longest wait between two calls.
+            (default: {5.0})
+            backoff {float} -- Factor applied to the wait after each retry.
+            (default: {2.0})
+            jitter {float} -- Fraction of each wait added or removed at
+            random, so concurrent callers do not retry in step. (default: {0.0})
+            deadline {float} -- Seconds after the first call past which no
+            retry is made, unlimited when None. (default: {None})
+            retry_on {tuple[type]} -- The exceptions that may be transient.
+            (default: {(Exception,)})
+            classify {callable} -- Called with an exception of retry_on,
+            returns whether to retry it. (default: {None})
+            sleep {callable} -- Called with the seconds to wait between two
+            calls, time.sleep when None. (default: {None})
+        """
+        self.attempts = attempts
+        self.interval = interval
+        self.max_interval = max(max_interval, interval)
+        self.backoff = max(backoff, 1.0)
+        self.jitter = jitter
+        self.deadline = deadline
+        self.retry_on = retry_on
+        self.classify = classify
+        self.sleep = sleep or _sleep
+        self.calls = 0
+        self.retries = 0
+        self.waited = 0.0
+        self.errors = {}
+
+    def delays(self):
+        """Generate the successive waits between calls.
+
+        Yields:
+            float -- The seconds to wait before the next call.
+        """
+        interval = self.interval
+        while True:
+            delay = interval
+            if self.jitter:
+                delay += uniform(-self.jitter, self.jitter) * interval
+            yield max(delay, 0.0)
+            interval = min(interval * self.backoff, self.max_interval)
+
+    def call(self, func, *args, **kwargs):
+        """Call a function, retrying the errors classified as transient.
+
+        Arguments:
+            func {callable} -- The function to call with args and kwargs.
+
+        Raises:
+            Exception: The last error, when it is not transient or no
+            attempt or time is left to retry it.
+
+        Returns:
+            object -- What func returned.
+        """
+        started = monotonic()
+        delays = self.delays()
+        attempt = 0
+        while True:
+            attempt += 1
+            self.calls += 1
+            try:
+                return func(*args, **kwargs)
+            except self.retry_on as e:
+                name = type(e).__name__
+                self.errors[name] = self.errors.get(name, 0) + 1
+                if self.classify is not None and not self.classify(e):
+                    raise
+                if self.attempts is not None and attempt >= self.attempts:
+                    raise
+                delay = next(delays)
+                if self.deadline is not None:
+                    remaining = started + self.deadline - monotonic()
+                    if remaining <= 0:
+                        raise
+                    delay = min(delay, remaining)
+                self.retries += 1
+                self.wait(delay)
+
+    def wait(self, delay):
+        """Sleep between two calls, counting the time waited.
+
+        Arguments:
+            delay {float} -- The seconds to wait.
+        """
+        self.sleep(delay)
+        self.waited += delay
+
+    def metrics(self):
+        """Return the metrics of the calls made through the policy.
+
+        Returns:
+            dict -- The calls and retries made, the seconds waited between
+            them, and the count of errors by exception name.
+        """
+        return dict(
+            calls=self.calls,
+            retries=self.retries,
+            waited=self.waited,
+            errors=dict(self.errors),
+        )
@@ -0,0 +1,162 @@
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from os import chmod, environ, fdopen, geteuid, lstat, mkdir, path, remove, rename
+from stat import S_IEXEC, S_IREAD, S_IWRITE, S_IMODE, S_ISDIR
+from tempfile import mkstemp
+import hashlib
+
+# Bumped whenever the layout of the cache changes, so installed
+# scripts from an older layout are never picked up.
+REXX_CACHE_VERSION = "1"
+
+# Environment variable holding the USS directory of the cache.
+REXX_CACHE_ENV = "ANSIBLE_ZOS_REXX_CACHE"
+
+REXX_CACHE_MODE = S_IREAD | S_IWRITE | S_IEXEC
+
+
+def install_rexx(name, script, cache_dir=None):
+    """Install a REXX script into the helper cache, unless an identical copy
+    is already installed, and return the path to run it from.
+
+    Scripts are stored as <cache_dir>/rexx.v<version>/<hash>/<name>, where
+    hash is derived from the cache version and the script content. An
+    installed script is verified against its hash before it is reused and
+    replaced when it does not match.
+
+    Arguments:
+        name {str} -- The file name of the script.
+        script {str} -- The REXX source.
+
+    Keyword Arguments:
+        cache_dir {str} -- The cache directory, the ANSIBLE_ZOS_REXX_CACHE
+        environment variable or /tmp/.ansible_zos_core_<uid> when not
+        provided. (default: {None})
+
+    Raises:
+        RuntimeError: When the cache directory is not a directory owned by
+        the current user.
+
+    Returns:
+        str -- The absolute path of the installed script.
+    """
+    digest = _rexx_digest(script)
+    script_dir = path.join(_cache_root(cache_dir), digest[:16])
+    _make_private_dir(script_dir)
+    script_path = path.join(script_dir, name)
+    if _installed_digest(script_path) == digest:
+        return script_path
+    fd, tmp_path = mkstemp(prefix="." + name + ".", dir=script_dir)
+    try:
+        with fdopen(fd, "w") as f:
+            f.write(script)
+        chmod(tmp_path, S_IEXEC | S_IREAD | S_IWRITE)
+        rename(tmp_path, script_path)
+    except Exception:
+        if path.exists(tmp_path):
+            remove(tmp_path)
+        raise
+    return script_path
+
+
+def private_cache_dir(name, cache_dir=None):
+    """Return a directory of the per-user helper cache, creating it when
+    needed. Only the current user can access it.
+
+    Arguments:
+        name {str} -- The directory name inside the cache.
+
+    Keyword Arguments:
+        cache_dir {str} -- The cache directory, the ANSIBLE_ZOS_REXX_CACHE
+        environment variable or /tmp/.ansible_zos_core_<uid> when not
+        provided. (default: {None})
+
+    Raises:
+        RuntimeError: When the cache directory is not a directory owned by
+        the current user.
+
+    Returns:
+        str -- The directory.
+    """
+    if not cache_dir:
+        cache_dir = environ.get(REXX_CACHE_ENV)
+    if not cache_dir:
+        cache_dir = "/tmp/.ansible_zos_core_{0}".format(geteuid())
+    _make_private_dir(cache_dir)
+    dir_path = path.join(cache_dir, name)
+    _make_private_dir(dir_path)
+    return dir_path
+
+
+def _cache_root(cache_dir=None):
+    """Return the versioned cache directory, creating it when needed.
+
+    Keyword Arguments:
+        cache_dir {str} -- The cache directory. (default: {None})
+
+    Returns:
+        str -- The versioned cache directory.
+    """
+    return private_cache_dir("rexx.v" + REXX_CACHE_VERSION, cache_dir)
+
+
+def _make_private_dir(dir_path):
+    """Create a directory only the current user can access, or verify
+    an existing one is safe to run scripts from.
+
+    Arguments:
+        dir_path {str} -- The directory to create.
+
+    Raises:
+        RuntimeError: When the path is not a directory owned by the current
+        user or it is writable by others.
+    """
+    try:
+        mkdir(dir_path, REXX_CACHE_MODE)
+    except OSError:
+        if not path.isdir(dir_path):
+            raise
+    st = lstat(dir_path)
+    if not S_ISDIR(st.st_mode) or st.st_uid != geteuid():
+        raise RuntimeError(
+            "REXX cache directory {0} is not a directory owned by "
+            "the current user.".format(dir_path)
+        )
+    if S_IMODE(st.st_mode) & 0o022:
+        raise RuntimeError(
+            "REXX cache directory {0} is writable by other users.".format(dir_path)
+        )
+
+
+def _rexx_digest(script):
+    """Return the hash identifying a script in the cache.
+
+    Arguments:
+        script {str} -- The REXX source.
+
+    Returns:
+        str -- The hex digest.
+    """
+    content = REXX_CACHE_VERSION + "\n" + script
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _installed_digest(script_path):
+    """Return the hash of a script already in the cache.
+
+    Arguments:
+        script_path {str} -- The path of the installed script.
+
+    Returns:
+        str -- The hex digest, or None when the script is not installed.
+    """
+    try:
+        with open(script_path, "r") as f:
+            return _rexx_digest(f.read())
+    except (IOError, OSError):
+        return None
@@ -0,0 +1,257 @@
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from os import fdopen, path, remove, rename
+from tempfile import mkstemp
+from time import time
+import json
+import re
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.rexx import (
+    private_cache_dir,
+)
+
+STATUS_CACHE_VERSION = "1"
+
+# Seconds the status of a job that has not ended is served from the cache
+STATUS_CACHE_TTL = 5
+
+# Most jobs kept in the cache, the least recently listed are dropped first
+STATUS_CACHE_MAX_ENTRIES = 4096
+
+# The Jobs.list statuses and job_output return code messages of the jobs
+# that ended, such as CC, CC 0008, ABENDU0100, ABEND S0C4, JCLERR and
+# JCL ERROR. Any other status may still change.
+OUTPUT_RET_CODE = re.compile(
+    r"^\s*(?:(?P<cc>CC)\s*(?P<rc>[0-9]+)?|(?P<abend>ABEND)\s*(?P<code>[SU]\w+)?"
+    r"|(?P<jclerr>JCL\s*ERR)|(?P<canceled>CANCELED))"
+)
+
+
+def is_final_status(status):
+    """Check whether a Jobs.list status is the status of a job that ended.
+
+    Arguments:
+        status {str} -- The status listed by Jobs.list.
+
+    Returns:
+        bool -- True for CC, ABEND, JCLERR and CANCELED, False for any
+        other status or when there is no status.
+    """
+    return bool(status and OUTPUT_RET_CODE.match(status))
+
+
+class JobStatusCache(object):
+    def __init__(self, ttl=None, cache_dir=None, max_entries=None):
+        """Cache of the Jobs.list listing of jobs, shared by the modules
+        running on a managed node as the same user.
+
+        The listings are kept in a single file keyed by job ID. The listing
+        of a job that ended is served until the job is dropped from the
+        cache, the listing of a job in any other status only for ttl
+        seconds after it was listed.
+
+        Keyword Arguments:
+            ttl {float} -- Seconds a job that has not ended is served for.
+            (default: {STATUS_CACHE_TTL})
+            cache_dir {str} -- The per-user cache directory, see
+            rexx.private_cache_dir. (default: {None})
+            max_entries {int} -- Most jobs kept. (default: {STATUS_CACHE_MAX_ENTRIES})
+        """
+        self.ttl = STATUS_CACHE_TTL if ttl is None else ttl
+        self.max_entries = max_entries or STATUS_CACHE_MAX_ENTRIES
+        self.cache_path = path.join(
+            private_cache_dir("status.v" + STATUS_CACHE_VERSION, cache_dir),
+            "jobs.json",
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, job_id):
+        """Return the cached listing of a job.
+
+        Arguments:
+            job_id {str} -- The job ID.
+
+        Returns:
+            dict -- The listing of the job, or None when it is not cached or
+            no longer fresh.
+        """
+        entry = self._load().get(job_id)
+        if entry is not None and (
+            is_final_status(entry.get("job").get("status"))
+            or time() - entry.get("listed_at") <= self.ttl
+        ):
+            self.hits += 1
+            return entry.get("job")
+        self.misses += 1
+        return None
+
+    def get_all(self, job_ids):
+        """Return the cached listings of several jobs.
+
+        Arguments:
+            job_ids {list[str]} -- The job IDs.
+
+        Returns:
+            list[dict] -- The listings in the order of job_ids, or None when
+            any of them is not served from the cache.
+        """
+        jobs = []
+        for job_id in job_ids:
+            job = self.get(job_id)
+            if job is None:
+                return None
+            jobs.append(job)
+        return jobs
+
+    def put(self, jobs):
+        """Store the listing of jobs.
+
+        Arguments:
+            jobs {list[dict]} -- The jobs listed by Jobs.list.
+        """
+        jobs = [job for job in jobs or [] if job and job.get("id")]
+        if not jobs:
+            return
+        entries = self._load()
+        now = time()
+        for job in jobs:
+            entries[job.get("id")] = dict(job=job, listed_at=now)
+        if len(entries) > self.max_entries:
+            kept = sorted(
+                entries.items(), key=lambda item: item[1].get("listed_at")
+            )[-self.max_entries:]
+            entries = dict(kept)
+        self._save(entries)
+
+    def put_output(self, jobs):
+        """Store the status of the jobs read by job_output that ended.
+
+        Arguments:
+            jobs {list[dict]} -- The jobs returned by job_output.
+        """
+        self.put([listing for listing in map(output_listing, jobs) if listing])
+
+    def lister(self, list_jobs):
+        """Wrap a function listing jobs, such as Jobs.list, to serve the
+        jobs listed by ID from the cache and store every job it lists.
+
+        Arguments:
+            list_jobs {callable} -- Lists the jobs.
+
+        Returns:
+            callable -- Takes the same arguments as list_jobs.
+        """
+
+        def cached_list_jobs(*args, **kwargs):
+            job_id = kwargs.get("job_id")
+            if job_id and not args and len(kwargs) == 1:
+                job = self.get(job_id)
+                if job is not None:
+                    return [job]
+            jobs = list_jobs(*args, **kwargs)
+            self.put(jobs)
+            return jobs
+
+        return cached_list_jobs
+
+    def recorder(self, list_jobs):
+        """Wrap a function listing jobs, such as Jobs.list, to store the
+        jobs it lists that ended. The cache is never read, so a caller
+        waiting for a job sees its end as soon as JES lists it.
+
+        Arguments:
+            list_jobs {callable} -- Lists the jobs.
+
+        Returns:
+            callable -- Takes the same arguments as list_jobs.
+        """
+
+        def recorded_list_jobs(*args, **kwargs):
+            jobs = list_jobs(*args, **kwargs)
+            self.put(
+                [job for job in jobs or [] if job and is_final_status(job.get("status"))]
+            )
+            return jobs
+
+        return recorded_list_jobs
+
+    def metrics(self):
+        """Return how often the cache served a job.
+
+        Returns:
+            dict -- The number of hits and misses.
+        """
+        return dict(hits=self.hits, misses=self.misses)
+
+    def _load(self):
+        """Read the cache file.
+
+        Returns:
+            dict[str, dict] -- The entries by job ID, empty when the file is
+            missing or cannot be read.
+        """
+        try:
+            with open(self.cache_path, "r") as f:
+                entries = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+        if not isinstance(entries, dict):
+            return {}
+        return entries
+
+    def _save(self, entries):
+        """Replace the cache file, so concurrent readers see either the
+        previous or the new entries.
+
+        Arguments:
+            entries {dict[str, dict]} -- The entries by job ID.
+        """
+        fd, tmp_path = mkstemp(prefix=".", dir=path.dirname(self.cache_path))
+        try:
+            with fdopen(fd, "w") as f:
+                json.dump(entries, f)
+            rename(tmp_path, self.cache_path)
+        except Exception:
+            if path.exists(tmp_path):
+                remove(tmp_path)
+            raise
+
+
+def output_listing(job):
+    """Build the Jobs.list listing of a job read by job_output.
+
+    Arguments:
+        job {dict} -- A job returned by job_output.
+
+    Returns:
+        dict -- The listing, or None when the job has not ended.
+    """
+    match = OUTPUT_RET_CODE.match((job.get("ret_code") or {}).get("msg") or "")
+    if not match or not job.get("job_id"):
+        return None
+    if match.group("cc"):
+        rc = match.group("rc")
+        status, ret = "CC", rc.zfill(4) if rc else "?"
+    elif match.group("abend"):
+        code = match.group("code") or ""
+        if code.startswith("U"):
+            status, ret = "ABEND" + code, "?"
+        else:
+            status, ret = "ABEND", code or "?"
+    elif match.group("jclerr"):
+        status, ret = "JCLERR", "?"
+    else:
+        status, ret = "CANCELED", "?"
+    return {
+        "id": job.get("job_id"),
+        "name": job.get("job_name"),
+        "owner": job.get("owner"),
+        "class": job.get("class"),
+        "status": status,
+        "return": ret,
+    }
@@ -0,0 +1,97 @@
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from contextlib import contextmanager
+from time import time
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.job_wait import (
+    monotonic,
+)
+
+
+class Timing(object):
+    def __init__(self, events=False):
+        """Measure the phases of a module run with a monotonic clock, and
+        optionally record timestamped events for callback plugins.
+
+        Keyword Arguments:
+            events {bool} -- Record events. (default: {False})
+        """
+        self.start = monotonic()
+        self.wall_start = time()
+        self.phases = {}
+        self.events = [] if events else None
+        self.event("module_start", self.start)
+
+    def event(self, name, at=None, **details):
+        """Record an event, when events are enabled.
+
+        Arguments:
+            name {str} -- The event name.
+
+        Keyword Arguments:
+            at {float} -- The monotonic time of the event, now when not
+            provided. (default: {None})
+            details -- Other fields of the event, such as the job_id.
+        """
+        if self.events is None:
+            return
+        if at is None:
+            at = monotonic()
+        event = dict(
+            event=name, time=self.wall_start + at - self.start, elapsed=at - self.start
+        )
+        event.update(details)
+        self.events.append(event)
+
+    def add(self, phase, seconds):
+        """Add seconds to a phase.
+
+        Arguments:
+            phase {str} -- The phase name.
+            seconds {float} -- The seconds spent.
+        """
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        """Measure the time spent in a block, recording <name>_start and
+        <name>_end events.
+
+        Arguments:
+            name {str} -- The phase name.
+        """
+        started = monotonic()
+        self.event(name + "_start", started)
+        try:
+            yield
+        finally:
+            ended = monotonic()
+            self.add(name, ended - started)
+            self.event(name + "_end", ended)
+
+    def result(self):
+        """Return the timing breakdown.
+
+        Returns:
+            dict -- The wall clock time the module started at in
+            module_start, the seconds spent in each phase, and the seconds
+            since the start in total.
+        """
+        timing = dict(self.phases)
+        timing["module_start"] = self.wall_start
+        timing["total"] = monotonic() - self.start
+        return timing
+
+    def result_events(self):
+        """Return the recorded events ordered by time.
+
+        Returns:
+            list[dict] -- The events, or None when they are not recorded.
+        """
+        if self.events is None:
+            return None
+        return sorted(self.events, key=lambda event: event.get("elapsed"))
@@ -30,19 +30,29 @@ description:
     like "*".
   - If there is no ddname, or if ddname="?", output of all the ddnames under
     the given job will be displayed.
+  - If one or more ddnames are given, only those data definitions are read
+    from the spool.
+  - The REXX script that reads the spool is installed once in a per-user
+    directory, /tmp/.ansible_zos_core_<uid> unless the ANSIBLE_ZOS_REXX_CACHE
+    environment variable names another USS directory.
 version_added: "2.9"
 author: "Jack Ho (@jacklotusho)"
 options:
   job_id:
     description:
-      - The z/OS job ID of the job containing the spool file.
-        (e.g "STC02560", "STC*")
-    type: str
+      - The z/OS job ID or list of job IDs of the jobs containing the
+        spool files. (e.g "STC02560", "STC*", ["JOB00134", "JOB00135"])
+      - All the jobs are read in a single SDSF session.
+    type: list
+    elements: str
     required: false
   job_name:
     description:
-      - The name of the batch job. (e.g "TCPIP", "C*")
-    type: str
+      - The name or list of names of the batch jobs.
+        (e.g "TCPIP", "C*", "PAY%OLL", ["HELLO", "WORLD"])
+      - In a name, * matches any characters and % a single character.
+    type: list
+    elements: str
     required: false
   owner:
     description:
@@ -51,9 +61,162 @@ options:
     required: false
   ddname:
     description:
-      - Data definition name. (e.g "JESJCL", "?")
+      - Data definition name or list of data definition names.
+        (e.g "JESJCL", "?", ["JESMSGLG", "JESYSMSG"])
+    type: list
+    elements: str
+    required: false
+  stream:
+    description:
+      - Read the job output incrementally while it is being gathered instead
+        of buffering all of it first.
+      - Keeps memory use on the managed node roughly constant regardless of
+        the size of the spool, apart from content returned inline.
+    type: bool
+    required: false
+    default: false
+  spill_threshold:
+    description:
+      - When a ddname has more lines than this, its content is written to a
+        file on the managed node instead of being returned inline.
+      - The path of the file is returned in C(content_path) and C(content)
+        is returned empty.
+      - Setting this option enables I(stream).
+    type: int
+    required: false
+  spill_dir:
+    description:
+      - The directory on the managed node where ddnames exceeding
+        I(spill_threshold) are written.
+      - If not provided, a new temporary directory is created.
+      - Files are not removed by the module.
+    type: path
+    required: false
+  dest:
+    description:
+      - Write the content of every ddname on the managed node instead of
+        returning it in the module result, which then only holds the
+        attributes of each ddname and the C(content_path) it was written to.
+      - An absolute USS path is a directory, created when missing, that
+        receives one file per ddname named <job id>.<ddname id>.<ddname>.
+      - Otherwise it is the name of an existing PDS or PDSE that receives one
+        member per ddname named D followed by the ddname id padded to 7
+        digits, for example D0000002. A data set holds the output of a
+        single job.
+      - Mutually exclusive with I(spill_threshold) and I(local_dest).
+    type: str
+    required: false
+  local_dest:
+    description:
+      - Fetch the content of every ddname to this directory on the
+        controller instead of returning it in the module result.
+      - Files are named <job id>.<ddname id>.<ddname> and their controller
+        paths are returned in C(content_path).
+      - Mutually exclusive with I(spill_threshold) and I(dest).
+    type: path
+    required: false
+  start_line:
+    description:
+      - The first line of each ddname to return, starting at 1.
+      - Must be at least 1.
+      - Use the C(next_line) returned for a ddname to continue reading it.
+      - Mutually exclusive with I(tail).
+    type: int
+    required: false
+  max_lines:
+    description:
+      - The maximum number of lines to return for each ddname, at least 1.
+      - The limit is applied while the spool is browsed, lines past the limit
+        are never read.
+    type: int
+    required: false
+  tail:
+    description:
+      - Return only the last I(tail) lines of each ddname, at least 1.
+      - Mutually exclusive with I(start_line).
+    type: int
+    required: false
+  follow:
+    description:
+      - The C(cursor) returned for a job by a previous call.
+      - Only lines written to each ddname since that call are returned,
+        ddnames not in the cursor are returned from their first line.
+      - Use with a I(job_id) that selects a single job, the task fails when
+        more than one job matches.
+      - Mutually exclusive with I(start_line) and I(tail).
+    type: dict
+    required: false
+  step_summary:
+    description:
+      - Add the C(steps) of each job, with the condition code or abend of
+        every step, parsed from JESYSMSG and JESMSGLG.
+      - Those ddnames are read in a separate pass when I(ddname),
+        I(start_line), I(max_lines), I(tail), I(follow) or I(dest) leave
+        them out of the output.
+    type: bool
+    required: false
+    default: false
+  wire_format:
+    description:
+      - How the job output is written by the REXX script on the managed node
+        and read by the module.
+      - C(framed) writes the spool lines as they are, preceded by their
+        count, instead of escaping each of them into a JSON string, which
+        is cheaper for large outputs.
+      - The returned I(jobs) are the same with either format.
+    type: str
+    required: false
+    default: json
+    choices:
+      - json
+      - framed
+  compress:
+    description:
+      - Compress the job output on the managed node and expand it on the
+        controller, to reduce the size of the module result sent over the
+        connection.
+      - The returned I(jobs) are the same as without compression.
+    type: str
+    required: false
+    choices:
+      - zlib
+      - gzip
+  cache:
+    description:
+      - Keep the output of jobs that ended with CC, ABEND or JCL ERROR in a
+        cache on the controller, keyed by host, job ID and ddname.
+      - When all the requested jobs and ddnames are in the cache, the output
+        is returned without connecting to the managed node.
+      - Only used when I(job_id) lists job IDs without patterns and none of
+        I(job_name), I(owner), I(start_line), I(max_lines), I(tail),
+        I(follow) and I(spill_threshold) are used.
+    type: bool
+    required: false
+    default: false
+  cache_dir:
+    description:
+      - The controller directory holding the cache.
     type: str
     required: false
+    default: ~/.ansible/zos_job_output_cache
+  cache_max_size:
+    description:
+      - The size of the cache in megabytes. The least recently used entries
+        are removed when the cache grows over this size.
+    type: int
+    required: false
+    default: 256
+  status_cache:
+    description:
+      - Record the status of the jobs read that ended with CC, ABEND,
+        JCL ERROR or CANCELED in the status cache on the managed node, so
+        zos_job_submit and zos_job_query tasks using I(status_cache) read
+        it without querying JES.
+      - The status is read from the spool along with the output, so the
+        cache is not read by this module.
+    type: bool
+    required: false
+    default: false
 """
 
 EXAMPLES = r"""
@@ -62,6 +225,13 @@ EXAMPLES = r"""
     job_id: "STC02560"
     ddname: "JESMSGLG"
 
+- name: Job output with several ddnames
+  zos_job_output:
+    job_id: "STC02560"
+    ddname:
+      - "JESMSGLG"
+      - "JESYSMSG"
+
 - name: JES Job output without ddname
   zos_job_output:
     job_id: "STC02560"
@@ -72,6 +242,69 @@ EXAMPLES = r"""
     job_name: "*"
     owner: "IBMUSER"
     ddname: "?"
+
+- name: Last 200 lines of the job log
+  zos_job_output:
+    job_id: "STC02560"
+    ddname: "JESMSGLG"
+    tail: 200
+
+- name: Job output read 1000 lines at a time
+  zos_job_output:
+    job_id: "JOB00134"
+    ddname: "SYSPRINT"
+    start_line: "{{ previous.jobs[0].ddnames[0].next_line | default(1) }}"
+    max_lines: 1000
+
+- name: Follow the output of a running job
+  zos_job_output:
+    job_id: "STC02560"
+    follow: "{{ previous.jobs[0].cursor }}"
+  register: previous
+
+- name: Job output of several jobs at once
+  zos_job_output:
+    job_id:
+      - "JOB00134"
+      - "JOB00135"
+    ddname: "SYSPRINT"
+
+- name: Condition codes of each step, without the rest of the spool
+  zos_job_output:
+    job_id: "JOB00134"
+    ddname: "JESMSGLG"
+    step_summary: true
+
+- name: Archive the job output to a USS directory
+  zos_job_output:
+    job_id: "JOB00134"
+    dest: "/u/tester/joblogs"
+
+- name: Archive the job output to the members of a PDS
+  zos_job_output:
+    job_id: "JOB00134"
+    dest: "TESTER.JOBLOGS.JOB00134"
+
+- name: Fetch the job output to a directory on the controller
+  zos_job_output:
+    job_id: "JOB00134"
+    local_dest: "/var/log/zos/joblogs"
+
+- name: Job output of a large job, compressed while it is transferred
+  zos_job_output:
+    job_id: "JOB00134"
+    compress: zlib
+
+- name: Job output of a finished job, read from the controller-side cache
+  zos_job_output:
+    job_id: "JOB00134"
+    cache: true
+
+- name: Job output with ddnames over 10000 lines written to files
+  zos_job_output:
+    job_id: "JOB00134"
+    spill_threshold: 10000
+    spill_dir: "/tmp/spool"
 """
 
 RETURN = r"""
@@ -165,6 +398,74 @@ jobs:
                "         6 //SYSUT2   DD SYSOUT=*                                                          ",
                "         7 //                                                                              "
              ]
+        content_path:
+          description:
+             The file, or data set member, holding the content of the ddname
+             when it was written out by I(spill_threshold), I(dest) or
+             I(local_dest) instead of being returned in C(content).
+          type: str
+          sample: /tmp/spool/JOB00134.2.JESMSGLG
+        content_lines:
+          description:
+             The number of lines written to C(content_path).
+          type: int
+          sample: 17
+        first_line:
+          description:
+             The line number of the first line in C(content).
+          type: int
+          sample: 1
+        next_line:
+          description:
+             The line number to pass to I(start_line) to continue reading
+             the ddname, or null when the end of the ddname was reached.
+          type: int
+          sample: 18
+    cursor:
+      description:
+         The number of lines read so far from each ddname, keyed by ddname id.
+         Pass it to I(follow) to only read lines written since this call.
+      type: dict
+      sample: {"2": 17, "3": 14, "4": 19}
+    steps:
+      description:
+         The steps of the job, parsed from the IEF142I, IEF272I and IEF472I
+         messages of JESYSMSG, with the program named by the SMF000I
+         messages of JESMSGLG when they are present.
+      returned: when I(step_summary=true)
+      type: list
+      elements: dict
+      contains:
+        stepname:
+          description:
+             The name of the job step.
+          type: str
+          sample: STEP0001
+        procstep:
+          description:
+             The name of the step in the procedure run by the job step.
+          type: str
+          sample: ""
+        program:
+          description:
+             The program run by the step, when SMF000I messages are written.
+          type: str
+          sample: IEBGENER
+        executed:
+          description:
+             Whether the step was run.
+          type: bool
+          sample: true
+        rc:
+          description:
+             The condition code of the step.
+          type: int
+          sample: 0
+        abend:
+          description:
+             The system or user abend code of the step.
+          type: str
+          sample: S0C4
     ret_code:
       description:
          Return code output collected from job log.
@@ -320,6 +621,21 @@ jobs:
         "subsystem": "STL1"
       }
   ]
+job_index:
+  description:
+      Maps each job ID to the position of its job in I(jobs).
+  returned: success
+  type: dict
+  sample:
+    {
+      "JOB00134": 0,
+      "JOB00135": 1
+    }
+cached:
+  description:
+      Indicates if the output was read from the controller-side cache.
+  returned: when I(cache=true)
+  type: bool
 changed:
     description:
       Indicates if any changes were made during module operation
@@ -329,36 +645,160 @@ changed:
 
 
 from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.job import job_output
-from tempfile import NamedTemporaryFile
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.job import (
+    compress_jobs,
+    job_output,
+)
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.status_cache import (
+    JobStatusCache,
+)
+from os import makedirs, path
+from shutil import rmtree
+from tempfile import NamedTemporaryFile, mkdtemp
+
+try:
+    from zoautil_py import Datasets
+except Exception:
+    Datasets = ""
 
 
 def run_module():
     module_args = dict(
-        job_id=dict(type="str", required=False),
-        job_name=dict(type="str", required=False),
+        job_id=dict(type="list", elements="str", required=False),
+        job_name=dict(type="list", elements="str", required=False),
         owner=dict(type="str", required=False),
-        ddname=dict(type="str", required=False),
+        ddname=dict(type="list", elements="str", required=False),
+        stream=dict(type="bool", required=False, default=False),
+        spill_threshold=dict(type="int", required=False),
+        spill_dir=dict(type="path", required=False),
+        dest=dict(type="str", required=False),
+        local_dest=dict(type="path", required=False),
+        start_line=dict(type="int", required=False),
+        max_lines=dict(type="int", required=False),
+        tail=dict(type="int", required=False),
+        follow=dict(type="dict", required=False),
+        step_summary=dict(type="bool", required=False, default=False),
+        wire_format=dict(
+            type="str", required=False, default="json", choices=["json", "framed"]
+        ),
+        compress=dict(type="str", required=False, choices=["zlib", "gzip"]),
+        cache=dict(type="bool", required=False, default=False),
+        cache_dir=dict(
+            type="str", required=False, default="~/.ansible/zos_job_output_cache"
+        ),
+        cache_max_size=dict(type="int", required=False, default=256),
+        status_cache=dict(type="bool", required=False, default=False),
     )
 
-    module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+        mutually_exclusive=[
+            ["start_line", "tail", "follow"],
+            ["spill_threshold", "dest", "local_dest"],
+        ],
+    )
 
     job_id = module.params.get("job_id")
     job_name = module.params.get("job_name")
     owner = module.params.get("owner")
     ddname = module.params.get("ddname")
+    stream = module.params.get("stream")
+    spill_threshold = module.params.get("spill_threshold")
+    spill_dir = module.params.get("spill_dir")
+    start_line = module.params.get("start_line")
+    max_lines = module.params.get("max_lines")
+    tail = module.params.get("tail")
+    follow = module.params.get("follow")
+    compress = module.params.get("compress")
+    dest = module.params.get("dest")
+    step_summary = module.params.get("step_summary")
 
     if not job_id and not job_name and not owner:
         module.fail_json(msg="Please provide a job_id or job_name or owner")
+    for name in ("start_line", "max_lines", "tail"):
+        if module.params.get(name) is not None and module.params.get(name) < 1:
+            module.fail_json(msg="The option {0} must be at least 1.".format(name))
 
+    data_set = None
     try:
-        results = job_output(module, job_id, owner, job_name, ddname)
+        if dest:
+            spill_threshold = 0
+            if dest.startswith("/"):
+                spill_dir = dest
+                if not path.isdir(spill_dir):
+                    makedirs(spill_dir)
+            else:
+                spill_dir = mkdtemp(prefix="ansible-zos-spool-")
+                # set once the directory exists, so only it is removed
+                data_set = dest.upper()
+        results = job_output(
+            module,
+            job_id,
+            owner,
+            job_name,
+            ddname,
+            stream=stream,
+            spill_threshold=spill_threshold,
+            spill_dir=spill_dir,
+            start_line=start_line,
+            max_lines=max_lines,
+            tail=tail,
+            follow=follow,
+            wire_format=module.params.get("wire_format"),
+            step_summary=step_summary,
+        )
+        results["job_index"] = dict(
+            (job.get("job_id"), index)
+            for index, job in enumerate(results.get("jobs"))
+        )
+        if data_set:
+            copy_to_members(results.get("jobs"), data_set)
+        if module.params.get("status_cache"):
+            JobStatusCache().put_output(results.get("jobs"))
         results["changed"] = False
+        if compress:
+            results = compress_jobs(results, compress)
     except Exception as e:
         module.fail_json(msg=repr(e))
+    finally:
+        if data_set:
+            rmtree(spill_dir, ignore_errors=True)
     module.exit_json(**results)
 
 
+def copy_to_members(jobs, data_set):
+    """Copy the files written for each ddname of a job to members
+    of a partitioned data set.
+
+    Arguments:
+        jobs {list[dict]} -- The jobs returned by job_output, with the
+        content of every ddname written to a file.
+        data_set {str} -- The name of the PDS or PDSE.
+
+    Raises:
+        ValueError: When the output of more than one job was found.
+        RuntimeError: When a member cannot be written.
+    """
+    if len(jobs) > 1:
+        raise ValueError(
+            "A data set dest holds the output of a single job, "
+            "{0} jobs were found.".format(len(jobs))
+        )
+    for job in jobs:
+        for dd in job.get("ddnames"):
+            member = "{0}(D{1:07d})".format(data_set, int(dd.get("id")))
+            content_path = dd.get("content_path")
+            rc = Datasets.copy(content_path, member)
+            if rc != 0:
+                raise RuntimeError(
+                    "Failed to write {0} to {1}. RC: {2}".format(
+                        dd.get("ddname"), member, rc
+                    )
+                )
+            dd["content_path"] = member
+
+
 def main():
     run_module()
 
@@ -23,27 +23,136 @@ description:
   - Uses owner to filter the jobs by the job owner.
   - Uses system to filter the jobs by system where the job is running (or ran) on.
   - Uses job_id to filter the jobs by the job id.
+  - Several job names, owners or job IDs are resolved with a single listing
+    of the jobs on the managed node, matched in memory against each of them.
+  - The filters, I(fields), I(limit) and I(offset) are applied on the
+    managed node, so only the requested jobs are returned.
 author: "Ping Xiao (@xiaopingBJ)"
 options:
   job_name:
     description:
        - The job name to query.
-    type: str
+       - A list of job names, or a comma separated string, queries several
+         patterns at once. A job listed under several patterns is returned
+         once in I(jobs) and under each pattern in I(jobs_by_pattern).
+    type: list
+    elements: str
     required: False
-    default: "*"
+    default: ["*"]
   owner:
     description:
       - Identifies the owner of the job.
       - If no owner is set, the default set is 'none' and all jobs will be
         queried.
-    type: str
+      - A list of owners returns the jobs of any of them.
+    type: list
+    elements: str
     required: False
   job_id:
     description:
       - The job number that has been assigned to the job. These normally begin
         with STC, JOB, TSU and are followed by 5 digits.
+      - A list of job IDs returns each of them.
+    type: list
+    elements: str
+    required: False
+  status:
+    description:
+      - Only return the jobs in one of these statuses.
+      - ABEND includes user abends.
+    type: list
+    elements: str
+    required: False
+    choices:
+      - ACTIVE
+      - INPUT
+      - CC
+      - ABEND
+      - JCLERR
+      - CANCELED
+  min_rc:
+    description:
+      - Only return the jobs that completed with a return code of at least
+        this value.
+    type: int
+    required: False
+  max_rc:
+    description:
+      - Only return the jobs that completed with a return code of at most
+        this value.
+    type: int
+    required: False
+  fields:
+    description:
+      - The fields returned for each job, all of them when not set.
+    type: list
+    elements: str
+    required: False
+    choices:
+      - job_name
+      - owner
+      - job_id
+      - ret_code
+  limit:
+    description:
+      - The most jobs to return, after the filters and I(offset) are
+        applied.
+    type: int
+    required: False
+  offset:
+    description:
+      - The number of matching jobs to skip, to read a large result one page
+        at a time with I(limit).
+    type: int
+    required: False
+    default: 0
+  status_cache:
+    description:
+      - Read and record the status of the jobs in a cache on the managed
+        node, shared by the zos_job_submit, zos_job_query and zos_job_output
+        tasks run as the same user.
+      - When every requested I(job_id) is cached, JES is not queried.
+      - While waiting with I(wait_for), JES is always queried and only the
+        jobs that ended are recorded.
+      - The cache is kept in the directory set by the ANSIBLE_ZOS_REXX_CACHE
+        environment variable, or /tmp/.ansible_zos_core_<uid>.
+    type: bool
+    required: False
+    default: False
+  status_cache_ttl:
+    description:
+      - The seconds the status of a job that has not ended is read from the
+        cache. The status of a job that ended is always read from the cache.
+    type: int
+    required: False
+    default: 5
+  wait_for:
+    description:
+      - Wait for all the matching jobs, or any of them, to end before
+        returning them.
+      - While more than one job is running, each query lists all the
+        matching jobs at once, the same way the jobs are first listed.
+      - The jobs are waited for before the I(status) and return code
+        filters are applied.
     type: str
     required: False
+    choices:
+      - all
+      - any
+  wait_time_s:
+    description:
+      - The most seconds to wait for the jobs with I(wait_for).
+    type: int
+    required: False
+    default: 60
+  max_poll_interval_s:
+    description:
+      - The longest interval between two queries of the jobs with
+        I(wait_for). The interval starts at 0.1 seconds and grows after
+        each query.
+    type: int
+    required: False
+    default: 5
 '''
 
 EXAMPLES = r'''
@@ -55,6 +164,19 @@ EXAMPLES = r'''
   zos_job_query:
     job_name: "IYK3*"
 
+- name: Wait for every job of a batch to end, polling all of them at once
+  zos_job_query:
+    job_name: "PAYROLL*"
+    wait_for: all
+    wait_time_s: 600
+
+- name: Query jobs through the status cache shared with zos_job_submit
+  zos_job_query:
+    job_id:
+      - JOB01427
+      - JOB16577
+    status_cache: true
+
 - name: list the job with a jobname 'IYK3ZNA*' and jobid as JOB01427
   zos_job_query:
     job_name: IYK3ZNA*
@@ -64,6 +186,27 @@ EXAMPLES = r'''
   zos_job_query:
     job_name: IYK3ZNA*
     owner: BROWNAD
+
+- name: list the second page of 50 jobs that ended with a return code above 4
+  zos_job_query:
+    job_name: PAYROLL*
+    status: CC
+    min_rc: 5
+    fields:
+      - job_id
+      - ret_code
+    limit: 50
+    offset: 50
+
+- name: list the jobs of several job name prefixes and owners at once
+  zos_job_query:
+    job_name:
+      - IYK3*
+      - PAYROLL*
+      - NIGHTLY*
+    owner:
+      - BROWNAD
+      - BATCHID
 '''
 
 RETURN = r'''
@@ -127,6 +270,50 @@ jobs:
             "ret_code": { "msg": "CANCELED", "code": "null" },
         },
     ]
+total:
+  description:
+     The number of jobs matching the query and its filters, before
+     I(limit) and I(offset) are applied.
+  returned: success
+  type: int
+  sample: 1342
+jobs_by_pattern:
+  description:
+     The job IDs matching each job name pattern, or each job ID when
+     I(job_id) is used, among the returned jobs.
+  returned: success
+  type: dict
+  sample:
+    {
+        "IYK3*": ["JOB01427", "JOB16577"],
+        "PAYROLL*": []
+    }
+retry:
+  description:
+     How often Jobs.list was called before JES listed the jobs, and the
+     time spent waiting between the calls.
+  returned: when JES was queried
+  type: dict
+  contains:
+    calls:
+      description: The number of Jobs.list calls.
+      type: int
+      sample: 2
+    retries:
+      description: The number of calls retried after an error.
+      type: int
+      sample: 1
+    waited:
+      description: The seconds spent waiting between the calls.
+      type: float
+      sample: 0.052
+    errors:
+      description: The number of errors raised, by exception name.
+      type: dict
+      sample:
+        {
+            "IndexError": 1
+        }
 message:
   description:
      Message returned on failure.
@@ -134,6 +321,39 @@ message:
   returned: failure
   sample:
      msg: "List FAILED! no such job been found: IYK3Z0R9"
+timed_out:
+  description:
+     Whether I(wait_time_s) expired before all the jobs, or any of them,
+     ended.
+  returned: when I(wait_for) is set
+  type: bool
+  sample: false
+duration:
+  description:
+     The seconds spent waiting for the jobs.
+  returned: when I(wait_for) is set
+  type: float
+  sample: 12.642
+polls:
+  description:
+     The number of times JES was queried while waiting.
+  returned: when I(wait_for) is set
+  type: int
+  sample: 9
+status_cache:
+  description:
+     How many jobs were read from the status cache.
+  returned: when I(status_cache=true)
+  type: dict
+  contains:
+    hits:
+      description: The number of jobs read from the cache.
+      type: int
+      sample: 2
+    misses:
+      description: The number of jobs not cached or no longer fresh.
+      type: int
+      sample: 0
 '''
 
 try:
@@ -142,15 +362,52 @@ except Exception:
     Jobs = ""
 from ansible.module_utils.basic import AnsibleModule
 import re
-from time import sleep
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.job_wait import (
+    JobWaiter,
+)
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.retry import (
+    RetryPolicy,
+)
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.status_cache import (
+    JobStatusCache,
+)
+
+# The statuses the query can filter on, with the prefix of the status
+# Jobs.list reports for them
+STATUS_PREFIXES = {
+    "ACTIVE": "AC",
+    "INPUT": "INPUT",
+    "CC": "CC",
+    "ABEND": "ABEND",
+    "JCLERR": "JCLERR",
+    "CANCELED": "CANCELED",
+}
+STATUSES = ["ACTIVE", "INPUT", "CC", "ABEND", "JCLERR", "CANCELED"]
+
+FIELDS = ["job_name", "owner", "job_id", "ret_code"]
+
+# Jobs.list raises IndexError while JES does not list the jobs yet, which
+# is retried with a growing wait for at most QUERY_RETRY_DEADLINE seconds
+QUERY_RETRY_DEADLINE = 3.0
 
 
 def run_module():
 
     module_args = dict(
-        job_name=dict(type="str", required=False, default="*"),
-        owner=dict(type="str", required=False),
-        job_id=dict(type="str", required=False),
+        job_name=dict(type="list", elements="str", required=False, default=["*"]),
+        owner=dict(type="list", elements="str", required=False),
+        job_id=dict(type="list", elements="str", required=False),
+        status=dict(type="list", elements="str", required=False, choices=STATUSES),
+        min_rc=dict(type="int", required=False),
+        max_rc=dict(type="int", required=False),
+        fields=dict(type="list", elements="str", required=False, choices=FIELDS),
+        limit=dict(type="int", required=False),
+        offset=dict(type="int", required=False, default=0),
+        status_cache=dict(type="bool", required=False, default=False),
+        status_cache_ttl=dict(type="int", required=False, default=5),
+        wait_for=dict(type="str", required=False, choices=["all", "any"]),
+        wait_time_s=dict(type="int", required=False, default=60),
+        max_poll_interval_s=dict(type="int", required=False, default=5),
     )
 
     result = dict(changed=False, message="")
@@ -160,65 +417,321 @@ def run_module():
     if module.check_mode:
         return result
 
+    retry = query_retry_policy()
+    cache = None
     try:
         validate_arguments(module.params)
-        jobs_raw = query_jobs(module.params)
-        jobs = parsing_jobs(jobs_raw)
+        if module.params.get("status_cache"):
+            cache = JobStatusCache(module.params.get("status_cache_ttl"))
+        jobs_raw = query_jobs(module.params, retry, cache)
+        jobs_raw, jobs_by_pattern = match_jobs(
+            jobs_raw,
+            module.params.get("job_name"),
+            module.params.get("owner"),
+            module.params.get("job_id"),
+        )
+        if not jobs_raw:
+            raise RuntimeError(
+                "List FAILED! no such job name been found: "
+                + ",".join(module.params.get("job_id") or module.params.get("job_name"))
+            )
+        if module.params.get("wait_for"):
+            jobs_raw, waited = wait_jobs(jobs_raw, module.params, cache)
+            result.update(waited)
+        jobs_raw = filter_jobs(jobs_raw, module.params)
+        total = len(jobs_raw)
+        jobs_raw = page_jobs(
+            jobs_raw, module.params.get("offset"), module.params.get("limit")
+        )
+        jobs = project_jobs(parsing_jobs(jobs_raw), module.params.get("fields"))
     except Exception as e:
+        result["retry"] = retry.metrics()
+        if cache is not None:
+            result["status_cache"] = cache.metrics()
         module.fail_json(msg=e, **result)
+    listed = set(job.get("id") for job in jobs_raw)
     result["jobs"] = jobs
+    result["jobs_by_pattern"] = dict(
+        (pattern, [job_id for job_id in job_ids if job_id in listed])
+        for pattern, job_ids in jobs_by_pattern.items()
+    )
+    result["total"] = total
+    result["retry"] = retry.metrics()
+    if cache is not None:
+        result["status_cache"] = cache.metrics()
     module.exit_json(**result)
 
 
 def validate_arguments(params):
-    job_name_in = params.get("job_name")
-    job_id = params.get("job_id")
-    owner = params.get("owner")
-    if job_name_in or job_id:
-        if job_name_in and job_name_in != "*":
-            job_name_pattern = re.compile(r"^[a-zA-Z$#@%][0-9a-zA-Z$#@%]{0,7}$")
-            job_name_pattern_with_star = re.compile(
-                r"^[a-zA-Z$#@%][0-9a-zA-Z$#@%]{0,6}\*$"
-            )
+    job_names = params.get("job_name") or []
+    job_ids = params.get("job_id") or []
+    owners = params.get("owner") or []
+    if job_names or job_ids:
+        job_name_pattern = re.compile(r"^[a-zA-Z$#@%][0-9a-zA-Z$#@%]{0,7}$")
+        job_name_pattern_with_star = re.compile(r"^[a-zA-Z$#@%][0-9a-zA-Z$#@%]{0,6}\*$")
+        for job_name_in in job_names:
+            if job_name_in == "*":
+                continue
             m = job_name_pattern.search(job_name_in)
             n = job_name_pattern_with_star.search(job_name_in)
-            if m or n:
-                pass
-            else:
+            if not (m or n):
                 raise RuntimeError("Failed to validate the job name: " + job_name_in)
-        if job_id:
-            job_id_pattern = re.compile("(JOB|TSU|STC)[0-9]{5}$")
+        job_id_pattern = re.compile("(JOB|TSU|STC)[0-9]{5}$")
+        for job_id in job_ids:
             if not job_id_pattern.search(job_id):
                 raise RuntimeError("Failed to validate the job id: " + job_id)
     else:
         raise RuntimeError("Argument Error:Either job name(s) or job id is required")
-    if job_id and owner:
+    if job_ids and owners:
         raise RuntimeError("Argument Error:job id can not be co-exist with owner")
 
 
-def query_jobs(params, count=0):
-    job_name_in = params.get("job_name")
-    job_id = params.get("job_id")
-    owner = params.get("owner")
-    jobs = []
+def query_retry_policy():
+    """Return the policy Jobs.list is retried with.
+
+    Returns:
+        RetryPolicy -- Retries IndexError with a growing, jittered wait for
+        at most QUERY_RETRY_DEADLINE seconds.
+    """
+    return RetryPolicy(
+        interval=0.05,
+        max_interval=1.0,
+        backoff=2.0,
+        jitter=0.2,
+        deadline=QUERY_RETRY_DEADLINE,
+        retry_on=(IndexError,),
+    )
+
+
+def query_jobs(params, retry=None, cache=None):
+    """List the jobs that may match the query with a single Jobs.list call.
+
+    A single job ID, owner or job name is passed to Jobs.list to narrow
+    the scan, several of them are matched in memory by match_jobs.
+
+    Arguments:
+        params {dict} -- The module parameters.
+
+    Keyword Arguments:
+        retry {RetryPolicy} -- Retries Jobs.list while it raises IndexError,
+        query_retry_policy when None. (default: {None})
+        cache {JobStatusCache} -- Serves the jobs when every job ID is cached,
+        and records the jobs listed. (default: {None})
+
+    Returns:
+        list[dict] -- The jobs listed by Jobs.list.
+    """
+    job_names = params.get("job_name") or ["*"]
+    job_ids = params.get("job_id") or []
+    owners = params.get("owner") or []
+    if retry is None:
+        retry = query_retry_policy()
+    if cache is not None and job_ids:
+        jobs = cache.get_all(job_ids)
+        if jobs is not None:
+            return jobs
+    if len(job_ids) == 1:
+        jobs = retry.call(Jobs.list, job_id=job_ids[0])
+    else:
+        jobs = retry.call(
+            Jobs.list,
+            owner=owners[0] if len(owners) == 1 and not job_ids else "*",
+            job_name=job_names[0] if len(job_names) == 1 and not job_ids else "*",
+        )
+    if cache is not None:
+        cache.put(jobs)
+    return jobs or []
+
+
+def wait_jobs(jobs_raw, params, cache=None):
+    """Poll JES until all the listed jobs end, or any of them, or the wait
+    time expires.
+
+    While more than one job is pending, each poll lists the jobs the same
+    way query_jobs did, so waiting for many jobs costs a single listing
+    per poll.
+
+    Arguments:
+        jobs_raw {list[dict]} -- The jobs matching the query.
+        params {dict} -- The module parameters.
+
+    Keyword Arguments:
+        cache {JobStatusCache} -- Records the polled jobs that ended. It does
+        not serve them, so the end of a job is seen as soon as JES lists it.
+        (default: {None})
+
+    Returns:
+        tuple(list[dict], dict) -- The last listing of each job, and whether
+        the wait timed out, the seconds waited and the number of polls.
+    """
+    retry = RetryPolicy(attempts=1, retry_on=(IndexError,))
+
+    def list_jobs(job_id=None):
+        if job_id is not None:
+            return Jobs.list(job_id=job_id)
+        return query_jobs(params, retry)
+
+    if cache is not None:
+        list_jobs = cache.recorder(list_jobs)
+    waiter = JobWaiter(list_jobs, max_interval=params.get("max_poll_interval_s"))
+    job_ids = [job.get("id") for job in jobs_raw]
+    waited = waiter.wait_all(
+        job_ids, params.get("wait_time_s"), return_when=params.get("wait_for")
+    )
+    jobs = [waited[job.get("id")].get("job") or job for job in jobs_raw]
+    results = waited.values()
+    ended = [result for result in results if not result.get("timed_out")]
+    if params.get("wait_for") == "any":
+        timed_out = not ended
+    else:
+        timed_out = len(ended) < len(job_ids)
+    return (
+        jobs,
+        dict(
+            timed_out=timed_out,
+            duration=max(result.get("duration") for result in results),
+            polls=waiter.polls,
+        ),
+    )
+
+
+def filter_jobs(jobs_raw, params):
+    """Keep the listed jobs matching the status and return code filters
+    of the query.
+
+    Arguments:
+        jobs_raw {list[dict]} -- The jobs listed by Jobs.list.
+        params {dict} -- The module parameters.
+
+    Returns:
+        list[dict] -- The matching jobs, in the same order.
+    """
+    statuses = [STATUS_PREFIXES.get(status) for status in params.get("status") or []]
+    min_rc = params.get("min_rc")
+    max_rc = params.get("max_rc")
+    filtered = []
+    for job in jobs_raw:
+        status = (job.get("status") or "").upper()
+        if statuses and not any(status.startswith(prefix) for prefix in statuses):
+            continue
+        if min_rc is not None or max_rc is not None:
+            rc = _return_code(job)
+            if rc is None:
+                continue
+            if min_rc is not None and rc < min_rc:
+                continue
+            if max_rc is not None and rc > max_rc:
+                continue
+        filtered.append(job)
+    return filtered
+
+
+def page_jobs(jobs, offset=0, limit=None):
+    """Return the jobs of one page of the result.
+
+    Arguments:
+        jobs {list} -- The jobs.
+
+    Keyword Arguments:
+        offset {int} -- The number of jobs to skip. (default: {0})
+        limit {int} -- The most jobs to return, all when None. (default: {None})
+
+    Returns:
+        list -- The jobs of the page.
+    """
+    offset = max(offset or 0, 0)
+    if limit is None:
+        return jobs[offset:]
+    return jobs[offset:offset + max(limit, 0)]
+
+
+def project_jobs(jobs, fields=None):
+    """Keep the requested fields of each job.
+
+    Arguments:
+        jobs {list[dict]} -- The jobs built by parsing_jobs.
+
+    Keyword Arguments:
+        fields {list[str]} -- The fields to keep, all when not provided.
+        (default: {None})
+
+    Returns:
+        list[dict] -- The jobs with only the requested fields.
+    """
+    if not fields:
+        return jobs
+    return [dict((field, job.get(field)) for field in fields) for job in jobs]
+
+
+def _return_code(job):
+    if "CC" not in (job.get("status") or ""):
+        return None
     try:
-        if job_id:
-            jobs = Jobs.list(job_id=job_id)
-        elif owner:
-            jobs = Jobs.list(owner=owner, job_name=job_name_in)
-        else:
-            jobs = Jobs.list(job_name=job_name_in)
-        if not jobs:
-            raise RuntimeError(
-                "List FAILED! no such job name been found: " + job_name_in
-            )
-    except IndexError:
-        if count > 12:
-            raise
-        sleep(0.25)
-        count += 1
-        jobs = query_jobs(params, count)
-    return jobs
+        return int(job.get("return"))
+    except (TypeError, ValueError):
+        return None
+
+
+def compile_pattern(pattern):
+    """Compile a job name, owner or job ID pattern, where * matches any
+    characters, into a case insensitive regular expression.
+
+    Arguments:
+        pattern {str} -- The pattern.
+
+    Returns:
+        Pattern -- The compiled expression, matching whole values.
+    """
+    return re.compile(
+        "^" + ".*".join(re.escape(part) for part in pattern.split("*")) + "$",
+        re.IGNORECASE,
+    )
+
+
+def match_jobs(jobs_raw, job_names=None, owners=None, job_ids=None):
+    """Match listed jobs against several patterns at once.
+
+    With job IDs, a job matches the ID it has. Otherwise a job matches
+    every job name pattern its name matches, when its owner matches any
+    of the owner patterns.
+
+    Arguments:
+        jobs_raw {list[dict]} -- The jobs listed by Jobs.list.
+
+    Keyword Arguments:
+        job_names {list[str]} -- The job name patterns. (default: {None})
+        owners {list[str]} -- The owner patterns. (default: {None})
+        job_ids {list[str]} -- The job IDs. (default: {None})
+
+    Returns:
+        tuple(list[dict], dict[str, list[str]]) -- The matching jobs without
+        duplicates, in the order they were listed, and the IDs of the jobs
+        matching each pattern.
+    """
+    if job_ids:
+        patterns = [(job_id, compile_pattern(job_id), "id") for job_id in job_ids]
+    else:
+        patterns = [
+            (job_name, compile_pattern(job_name), "name")
+            for job_name in job_names or ["*"]
+        ]
+    owner_matchers = [compile_pattern(owner) for owner in owners or []]
+    jobs_by_pattern = dict((pattern, []) for pattern, matcher, key in patterns)
+    matched = []
+    seen = set()
+    for job in jobs_raw:
+        if owner_matchers and not any(
+            matcher.match(job.get("owner") or "") for matcher in owner_matchers
+        ):
+            continue
+        for pattern, matcher, key in patterns:
+            if not matcher.match(job.get(key) or ""):
+                continue
+            jobs_by_pattern[pattern].append(job.get("id"))
+            if job.get("id") not in seen:
+                seen.add(job.get("id"))
+                matched.append(job)
+    return matched, jobs_by_pattern
 
 
 def parsing_jobs(jobs_raw):
@@ -23,13 +23,18 @@ description:
     - Submit a job and optionally monitor for its execution.
     - Optionally wait for the job output until the job finishes.
     - For the uncataloged dataset, specify the volume serial number.
+    - The REXX scripts used to submit from a volume and to read job output
+      are installed once in a per-user directory, /tmp/.ansible_zos_core_<uid>
+      unless the ANSIBLE_ZOS_REXX_CACHE environment variable names another
+      USS directory.
 version_added: "2.9"
 options:
   src:
-    required: true
+    required: false
     type: str
     description:
       - The source directory or data set containing the JCL to submit.
+      - Required unless using the I(batch) option.
       - It could be physical sequential data set or a partitioned data set
         qualified by a member or a path. (e.g "USER.TEST","USER.JCL(TEST)")
       - Or an USS file. (e.g "/u/tester/demo/sample.jcl")
@@ -48,6 +53,10 @@ options:
       - DATA_SET can be a PDS, PDSE, or sequential data set.
       - USS means the JCL location is located in Unix System Services (USS).
       - LOCAL means locally to the ansible control node.
+      - LOCAL files up to 1 MB are converted to EBCDIC on the control node
+        and sent with the module arguments, so they are submitted in a
+        single remote execution. Larger files are copied to the managed
+        node first.
   wait:
     required: false
     default: false
@@ -63,6 +72,38 @@ options:
       - When wait is true, the module will wait for a maximum of 60 seconds by
         default.
       - User can set the wait time manually in this option.
+  poll_interval_s:
+    required: false
+    default: 0.1
+    type: float
+    description:
+      - When wait is true, the seconds between the first two queries of the
+        job status. The interval grows by I(poll_backoff) after each query.
+  max_poll_interval_s:
+    required: false
+    default: 5
+    type: float
+    description:
+      - The longest interval between two queries of the job status.
+  poll_backoff:
+    required: false
+    default: 1.5
+    type: float
+    description:
+      - The factor the interval between two queries of the job status grows
+        by after each query.
+  status_cache:
+    required: false
+    default: false
+    type: bool
+    description:
+      - Record the status of the jobs that ended in a cache on the managed
+        node, shared by the zos_job_submit, zos_job_query and zos_job_output
+        tasks run as the same user.
+      - The jobs waited for are always queried from JES, so their end is
+        seen as soon as JES lists it.
+      - The cache is kept in the directory set by the ANSIBLE_ZOS_REXX_CACHE
+        environment variable, or /tmp/.ansible_zos_core_<uid>.
   max_rc:
     required: false
     type: int
@@ -71,13 +112,16 @@ options:
         allowed without failing the module.
       - The ``max_rc`` is only checked when ``wait=true``, otherwise, it is
         ignored.
+      - The return code of the job is checked without reading the spool, so
+        it does not need ``return_output=true``.
   return_output:
     required: false
     default: true
     type: bool
     description:
       - Whether to print the DD output.
-      - If false, an empty list will be returned in ddnames field.
+      - If false, the spool is not browsed. The ddnames field only holds the
+        attributes of each data definition and every content is an empty list.
   volume:
     required: false
     type: str
@@ -89,19 +133,173 @@ options:
     required: false
     default: UTF-8
     type: str
+    description:
+      - The encoding of the local JCL file on the ansible control node.
+      - Any encoding known to Python, such as UTF-8, ASCII, ISO-8859-1 or
+        CP1252, is converted to I(target_encoding) on the z/OS platform.
+      - An EBCDIC code page listed in I(target_encoding) is converted to
+        I(target_encoding) when they differ.
+      - If it is EBCDIC, the file will be unchanged when submitted on the
+        z/OS platform.
+      - The file is converted in chunks and fed to the standard input of
+        the submit command, without writing the converted JCL to a file.
+  target_encoding:
+    required: false
+    default: IBM-1047
+    type: str
     choices:
-      - UTF-8
-      - ASCII
-      - ISO-8859-1
-      - EBCDIC
       - IBM-037
+      - IBM-273
+      - IBM-500
+      - IBM-875
+      - IBM-1026
       - IBM-1047
+      - IBM-1140
     description:
-      - The encoding of the local JCL file on the ansible control node.
-      - If it is UTF-8, ASCII, ISO-8859-1, the file will be converted to EBCDIC
-        on the z/OS platform.
-      - If it is EBCDIC, IBM-037, IBM-1047, the file will be unchanged when
-        submitted on the z/OS platform.
+      - The EBCDIC code page a LOCAL file is converted to before it is
+        submitted.
+      - Line feeds are converted to the EBCDIC new line character (0x15)
+        in every code page.
+  wire_format:
+    required: false
+    default: json
+    type: str
+    choices:
+      - json
+      - framed
+    description:
+      - How the job output is written by the REXX script on the managed node
+        and read by the module, see the I(wire_format) option of
+        zos_job_output.
+      - C(framed) avoids escaping every spool line into a JSON string.
+  timing_events:
+    required: false
+    default: false
+    type: bool
+    description:
+      - Return the timestamped events of the task in I(timing_events), to be
+        consumed by a callback plugin.
+      - The I(timing) breakdown is always returned.
+  jcl_cache:
+    required: false
+    default: false
+    type: bool
+    description:
+      - Keep LOCAL JCL too large to be sent with the module arguments in a
+        cache on the managed node, named after the hash of the converted
+        JCL, and only upload it when the cache does not hold it yet.
+      - The cache is kept in the per-user directory used for the REXX
+        scripts. Every cached copy is verified against its hash before it
+        is submitted.
+  jcl_cache_max_size:
+    required: false
+    default: 64
+    type: int
+    description:
+      - The size of the JCL cache on the managed node in megabytes. The
+        least recently submitted JCL is removed when the cache grows over
+        this size.
+  step_summary:
+    required: false
+    default: false
+    type: bool
+    description:
+      - Add the C(steps) of the job, with the condition code or abend of
+        every step, parsed from JESYSMSG and JESMSGLG.
+      - Only used when ``wait=true``. With ``return_output=false`` only
+        JESYSMSG and JESMSGLG are read from the spool.
+  compress:
+    required: false
+    type: str
+    choices:
+      - zlib
+      - gzip
+    description:
+      - Compress the job output on the managed node and expand it on the
+        controller, to reduce the size of the module result sent over the
+        connection.
+      - The returned I(jobs) are the same as without compression.
+  cache:
+    required: false
+    default: false
+    type: bool
+    description:
+      - Store the output of the job in the controller-side cache used by
+        M(zos_job_output) once it ended with CC, ABEND or JCL ERROR.
+      - Only used with I(wait=true) and I(return_output=true).
+  cache_dir:
+    required: false
+    default: ~/.ansible/zos_job_output_cache
+    type: str
+    description:
+      - The controller directory holding the cache.
+  cache_max_size:
+    required: false
+    default: 256
+    type: int
+    description:
+      - The size of the cache in megabytes. The least recently used entries
+        are removed when the cache grows over this size.
+  batch:
+    required: false
+    type: list
+    elements: dict
+    description:
+      - Submit several jobs in a single module call.
+      - The entries without I(dependencies) are submitted first, then, when
+        I(wait=true), waited for together with a single listing of the jobs
+        of the user per status query, up to I(wait_time_s) seconds.
+      - An entry with I(dependencies) is submitted as soon as all the
+        entries it depends on ended with a condition code within their
+        I(max_rc), so independent chains of jobs run in parallel. It is
+        skipped when any of them fails, abends or is skipped.
+      - The output of every job is read in one SDSF session and returned in
+        I(jobs). The outcome of each entry is returned in I(batch) in the
+        same order.
+      - The module fails when any entry fails to submit or exceeds its
+        I(max_rc), after all the entries are processed.
+      - Mutually exclusive with I(src).
+    suboptions:
+      src:
+        required: true
+        type: str
+        description:
+          - The data set or USS file containing the JCL to submit.
+      location:
+        required: false
+        default: DATA_SET
+        type: str
+        choices:
+          - DATA_SET
+          - USS
+        description:
+          - The JCL location. LOCAL is not supported in a batch.
+      volume:
+        required: false
+        type: str
+        description:
+          - The volume serial (VOLSER) where the data set resides.
+          - All the entries on a volume that are ready at the same time are
+            submitted by a single run of the installed REXX helper, which
+            reports the job ID of each of them.
+      max_rc:
+        required: false
+        type: int
+        description:
+          - The maximum return code allowed for this job when I(wait=true).
+      name:
+        required: false
+        type: str
+        description:
+          - The name other entries use to depend on this entry.
+      dependencies:
+        required: false
+        type: list
+        elements: str
+        description:
+          - The names of the entries that must succeed before this entry is
+            submitted.
+          - Requires I(wait=true).
 """
 
 RETURN = r"""
@@ -122,10 +320,6 @@ jobs:
          The name of the batch job.
       type: str
       sample: HELLO
-    duration:
-      description: The total lapsed time the JCL ran for.
-      type: int
-      sample: 0
     ddnames:
       description:
          Data definition names.
@@ -184,6 +378,45 @@ jobs:
                "         6 //SYSUT2   DD SYSOUT=*                                                          ",
                "         7 //                                                                              "
              ]
+    steps:
+      description:
+         The steps of the job, parsed from the IEF142I, IEF272I and IEF472I
+         messages of JESYSMSG, with the program named by the SMF000I
+         messages of JESMSGLG when they are present.
+      returned: when I(step_summary=true)
+      type: list
+      elements: dict
+      contains:
+        stepname:
+          description:
+             The name of the job step.
+          type: str
+          sample: STEP0001
+        procstep:
+          description:
+             The name of the step in the procedure run by the job step.
+          type: str
+          sample: ""
+        program:
+          description:
+             The program run by the step, when SMF000I messages are written.
+          type: str
+          sample: IEBGENER
+        executed:
+          description:
+             Whether the step was run.
+          type: bool
+          sample: true
+        rc:
+          description:
+             The condition code of the step.
+          type: int
+          sample: 0
+        abend:
+          description:
+             The system or user abend code of the step.
+          type: str
+          sample: S0C4
     ret_code:
       description:
          Return code output collected from job log.
@@ -426,6 +659,68 @@ jobs:
               "subsystem": "STL1"
           }
      ]
+batch:
+  description:
+    The outcome of each entry of the I(batch) option, in the same order.
+  returned: when I(batch) is used
+  type: list
+  elements: dict
+  contains:
+    src:
+      description: The JCL submitted.
+      type: str
+      sample: TEST.UTILS(SAMPLE)
+    name:
+      description: The name of the entry.
+      type: str
+      sample: EXTRACT
+    job_id:
+      description: The job ID, null when the job could not be submitted.
+      type: str
+      sample: JOB00134
+    failed:
+      description:
+        Whether the job could not be submitted or exceeded I(max_rc).
+      type: bool
+      sample: false
+    skipped:
+      description:
+        Whether the entry was not submitted because an entry it depends on
+        did not succeed.
+      type: bool
+      sample: false
+    rc:
+      description:
+        The condition code of the job, null when the job did not end
+        normally or was not waited for.
+      type: int
+      sample: 0
+    msg:
+      description: Why the entry failed.
+      type: str
+      sample: ""
+    timed_out:
+      description: Whether the job had not ended within I(wait_time_s).
+      type: bool
+      sample: false
+    duration:
+      description: The seconds spent waiting until the job was seen ended.
+      type: float
+      sample: 2.375
+    visible_time:
+      description:
+        The seconds between the submission of the job and the first time
+        JES listed it.
+      type: float
+      sample: 0.125
+    queue_time:
+      description: The queue time of the job, measured by polling.
+      type: float
+      sample: 0.25
+    execution_time:
+      description: The execution time of the job, measured by polling.
+      type: float
+      sample: 2.125
 changed:
   description: Indicates if any changes were made during module operation.
   type: bool
@@ -435,6 +730,157 @@ message:
   returned: success
   type: str
   sample: Submit JCL operation succeeded.
+duration:
+  description:
+    The seconds spent waiting for the job to end, measured with a monotonic
+    clock.
+  returned: success
+  type: float
+  sample: 1.375
+queue_time:
+  description:
+    The seconds between the submission of the job and the first time it was
+    seen running, measured by polling. Null when the job was never seen
+    running.
+  returned: when I(wait=true)
+  type: float
+  sample: 0.25
+execution_time:
+  description:
+    The seconds between the first time the job was seen running and the
+    first time it was seen ended, measured by polling. Null when the job was
+    never seen running or did not end within I(wait_time_s).
+  returned: when I(wait=true)
+  type: float
+  sample: 1.125
+timing:
+  description:
+    A breakdown of where the time of the task went, in seconds measured
+    with a monotonic clock.
+    Phases that did not happen are left out.
+  returned: success
+  type: dict
+  contains:
+    module_start:
+      description: The wall clock time the module started at, in seconds
+        since the epoch.
+      type: float
+      sample: 1603024931.518
+    staging:
+      description:
+        The seconds spent decoding the JCL passed by the action plugin, or
+        reading and storing the JCL cache, on the managed node.
+      type: float
+      sample: 0.002
+    submit:
+      description: The seconds spent submitting the JCL to JES.
+      type: float
+      sample: 0.310
+    visible_time:
+      description:
+        The seconds between the submission of the job and the first time
+        JES listed it. Not returned for I(batch), see I(batch).
+      type: float
+      sample: 0.125
+    wait:
+      description: The seconds spent waiting for the job to end.
+      type: float
+      sample: 1.375
+    queue_time:
+      description: The same as the top level I(queue_time).
+      type: float
+      sample: 0.25
+    execution_time:
+      description: The same as the top level I(execution_time).
+      type: float
+      sample: 1.125
+    output_retrieval:
+      description: The seconds spent reading the job output from the spool.
+      type: float
+      sample: 0.875
+    polls:
+      description: The number of times JES was queried for the status of
+        the submitted jobs.
+      type: int
+      sample: 6
+    poll_wait:
+      description: The seconds spent sleeping between two JES queries.
+      type: float
+      sample: 0.812
+    total:
+      description: The seconds between the module start and the result.
+      type: float
+      sample: 2.596
+    controller_staging:
+      description:
+        The seconds the action plugin spent converting and uploading a
+        LOCAL file on the controller.
+      type: float
+      sample: 0.004
+    remote_executions:
+      description: The number of modules the action plugin ran on the
+        managed node, each of which starts Python on z/OS.
+      type: int
+      sample: 1
+    action_total:
+      description:
+        The seconds the action plugin spent on the task, including every
+        remote execution.
+      type: float
+      sample: 3.742
+retry:
+  description:
+     How often Jobs.list was called while waiting for the jobs, and the
+     time spent waiting between the retried calls.
+  returned: when JES was queried
+  type: dict
+  contains:
+    calls:
+      description: The number of Jobs.list calls.
+      type: int
+      sample: 3
+    retries:
+      description: The number of calls retried after an error.
+      type: int
+      sample: 1
+    waited:
+      description: The seconds spent waiting between the retried calls.
+      type: float
+      sample: 0.052
+    errors:
+      description: The number of errors raised, by exception name.
+      type: dict
+      sample:
+        {
+            "IndexError": 1
+        }
+timing_events:
+  description:
+    The events of the task, ordered by time, for callback plugins.
+    Events include module_start, staging_start, staging_end,
+    submit_start, submit_end, visible, running, ended, wait_start,
+    wait_end, output_retrieval_start, output_retrieval_end, action_start
+    and action_end.
+  returned: when I(timing_events=true)
+  type: list
+  elements: dict
+  contains:
+    event:
+      description: The event name.
+      type: str
+      sample: running
+    time:
+      description: The wall clock time of the event, in seconds since the epoch.
+      type: float
+      sample: 1603024931.953
+    elapsed:
+      description: The seconds since the module started.
+      type: float
+      sample: 0.435
+    job_id:
+      description: The job the event is about, for job events.
+      type: str
+      sample: JOB00134
 """
 
 EXAMPLES = r"""
@@ -462,6 +908,14 @@ EXAMPLES = r"""
     encoding: UTF-8
     volume:
 
+- name: Submit LOCAL job written in Windows-1252 as IBM-037
+  zos_job_submit:
+    src: /Users/maxy/ansible-playbooks/provision/sample.jcl
+    location: LOCAL
+    wait: false
+    encoding: CP1252
+    target_encoding: IBM-037
+
 - name: Submit uncatalogued PDS job
   zos_job_submit:
     src: TEST.UNCATLOG.JCL(SAMPLE)
@@ -469,6 +923,49 @@ EXAMPLES = r"""
     wait: false
     volume: P2SS01
 
+- name: Submit several jobs at once and wait for all of them
+  zos_job_submit:
+    batch:
+      - src: TEST.UTILS(EXTRACT)
+        max_rc: 4
+      - src: TEST.UTILS(LOAD)
+      - src: /u/tester/demo/report.jcl
+        location: USS
+    wait: true
+    wait_time_s: 600
+    return_output: false
+
+- name: Run a load after the extracts it depends on
+  zos_job_submit:
+    batch:
+      - name: EXTRACT1
+        src: TEST.UTILS(EXTRACT1)
+        max_rc: 4
+      - name: EXTRACT2
+        src: TEST.UTILS(EXTRACT2)
+      - src: TEST.UTILS(LOAD)
+        dependencies:
+          - EXTRACT1
+          - EXTRACT2
+    wait: true
+    wait_time_s: 1800
+
+- name: Submit a job and check the condition code of each step
+  zos_job_submit:
+    src: TEST.UTILs(SAMPLE)
+    location: DATA_SET
+    wait: true
+    return_output: false
+    step_summary: true
+    max_rc: 4
+
+- name: Submit a job and keep its output in the controller-side cache
+  zos_job_submit:
+    src: TEST.UTILs(SAMPLE)
+    location: DATA_SET
+    wait: true
+    cache: true
+
 - name: Submit long running PDS job, and wait for the job to finish
   zos_job_submit:
     src: TEST.UTILs(LONGRUN)
@@ -478,25 +975,81 @@ EXAMPLES = r"""
 """
 
 from ansible.module_utils.basic import AnsibleModule
-from pipes import quote
 
 try:
     from zoautil_py import Jobs
 except Exception:
     Jobs = ""
-from time import sleep
-from os import chmod, path, remove
-from tempfile import NamedTemporaryFile
+from os import path, remove
+from subprocess import Popen, PIPE
+import base64
 import re
-from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.job import job_output
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.encode import (
+    check_encoding,
+    iter_file,
+    transcode,
+)
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.jcl_cache import (
+    cached_jcl,
+    store_jcl,
+)
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.job import (
+    compress_jobs,
+    job_output,
+)
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.job_graph import (
+    JobGraph,
+)
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.job_wait import (
+    JobWaiter,
+    monotonic,
+)
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.retry import RetryPolicy
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.rexx import install_rexx
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.status_cache import (
+    JobStatusCache,
+)
+from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.timing import Timing
 from ansible_collections.ibm.ibm_zos_core.plugins.module_utils.better_arg_parser import (
     BetterArgParser,
 )
-from stat import S_IEXEC, S_IREAD, S_IWRITE
 
-"""time between job query checks to see if a job has completed, default 1 second"""
-POLLING_INTERVAL = 1
-POLLING_COUNT = 60
+# Submits the data sets given as index, data set and volume triples, and
+# says the index and the job ID, or ERROR and the reason, for each of them.
+# The ddname is reallocated only when the data set or volume changes.
+SUBMIT_VOLUME_REXX = """/*REXX*/
+PARSE UPPER ARG ARGS
+LAST = ''
+DO WHILE ARGS <> ''
+  PARSE VAR ARGS N DSN VOL ARGS
+  IF DSN VOL <> LAST THEN DO
+    LAST = ''
+    IF BPXWDYN("ALLOC DA('"DSN"') FI(ZSUBVOL) SHR REUSE VOL("VOL")") <> 0 THEN DO
+      SAY N 'ERROR ALLOCATION OF' DSN 'ON' VOL 'FAILED'
+      ITERATE
+    END
+    LAST = DSN VOL
+  END
+  DROP A.
+  ADDRESS MVS "EXECIO * DISKR ZSUBVOL (STEM A. FINIS"
+  IF RC <> 0 THEN DO
+    SAY N 'ERROR READING' DSN 'ENDED WITH RC' RC
+    ITERATE
+  END
+  SAY N SUBMIT('A.')
+END
+IF LAST <> '' THEN CALL BPXWDYN "FREE FI(ZSUBVOL)"
+"""
+
+# Fraction of each wait between JES queries varied at random, so the hosts
+# of a play do not all query JES at the same moment
+POLL_JITTER = 0.1
+
+# Jobs.list raises IndexError until JES lists a submitted job, which each
+# poll retries with a growing wait for at most LIST_RETRY_DEADLINE seconds
+LIST_RETRY_DEADLINE = 1.0
+
+DSN_REGEX = r"^(([A-Z]{1}[A-Z0-9]{0,7})([.]{1})){1,21}[A-Z]{1}[A-Z0-9]{0,7}([(]([A-Z]{1}[A-Z0-9]{0,7})[)]){0,1}?$"
 
 
 def submit_pds_jcl(src):
@@ -512,6 +1065,71 @@ def submit_pds_jcl(src):
 def submit_uss_jcl(src, module):
     """ Submit uss jcl. Use uss command submit -j jclfile. """
     rc, stdout, stderr = module.run_command(["submit", "-j", src])
+    return job_id_from_submit(rc, stdout, stderr)
+
+
+def submit_local_jcl(chunks):
+    """Submit EBCDIC JCL through the standard input of submit -j, one
+    chunk at a time, without writing it to a file.
+
+    Arguments:
+        chunks {Iterable[bytes]} -- The JCL, such as the chunks returned by
+        transcode, which may fail to convert part way.
+
+    Raises:
+        SubmitJCLError: When the JCL cannot be converted or submitted.
+
+    Returns:
+        str -- The job ID.
+    """
+    proc = Popen(["submit", "-j"], stdin=PIPE, stdout=PIPE, stderr=PIPE)
+    try:
+        for chunk in chunks:
+            proc.stdin.write(chunk)
+    except (LookupError, UnicodeError) as e:
+        # Never let submit read a partial job
+        proc.kill()
+        proc.communicate()
+        raise SubmitJCLError(
+            "The Local file encoding conversion failed. "
+            "Please check the source file. " + str(e)
+        )
+    except (IOError, OSError):
+        # submit ended early, its output tells why
+        pass
+    stdout, stderr = proc.communicate()
+    return job_id_from_submit(
+        proc.returncode,
+        stdout.decode("utf-8", "replace"),
+        stderr.decode("utf-8", "replace"),
+    )
+
+
+def get_cached_jcl(digest, uploaded, max_size):
+    """Return the cached copy of JCL, storing the uploaded copy first
+    when there is one.
+
+    Arguments:
+        digest {str} -- The digest of the JCL computed on the controller.
+        uploaded {str} -- The uploaded JCL, or None.
+        max_size {int} -- The size limit of the cache in megabytes.
+
+    Raises:
+        SubmitJCLError: When the JCL cannot be cached.
+
+    Returns:
+        str -- The path of the cached JCL, or None when it is not cached.
+    """
+    try:
+        if uploaded:
+            return store_jcl(digest, uploaded, max_size=max_size)
+        return cached_jcl(digest)
+    except (ValueError, RuntimeError, OSError) as e:
+        raise SubmitJCLError("The JCL cache is not usable. " + str(e))
+
+
+def job_id_from_submit(rc, stdout, stderr):
+    """ Return the job ID printed by submit -j. """
     if rc != 0:
         raise SubmitJCLError("SUBMIT JOB FAILED:  Stderr :" + stderr)
     if "Error" in stderr:
@@ -528,71 +1146,380 @@ def submit_uss_jcl(src, module):
 
 
 def submit_jcl_in_volume(src, vol, module):
-    script = """/*REXX*/
-ARG P1 P2
-ADDRESS TSO
-CALL BPXWDYN "ALLOC DA('"P1"') FI(TEST) SHR VOL("P2")"
-ADDRESS MVS "EXECIO * DISKR TEST (STEM A."
-X = SUBMIT('A.')
-SAY X
-"""
-    rc, stdout, stderr = copy_rexx_and_run(script, src, vol, module)
-    if "Error" in stdout:
-        raise SubmitJCLError("SUBMIT JOB FAILED: " + stdout)
-    elif "" == stdout:
-        raise SubmitJCLError("SUBMIT JOB FAILED, NO JOB ID IS RETURNED : " + stdout)
-    jobId = stdout.replace("\n", "").strip()
-    return jobId
+    """ Submit a data set on an uncataloged volume. """
+    job_id = submit_jcl_in_volumes([(src, vol)], module)[0]
+    if isinstance(job_id, SubmitJCLError):
+        raise job_id
+    return job_id
+
+
+def submit_jcl_in_volumes(members, module):
+    """Submit data sets or members on uncataloged volumes with a single run
+    of the installed volume submit helper.
+
+    The helper reads each entry through one ddname, reallocated only when
+    the data set or volume changes, so consecutive entries of the same
+    sequential data set share an allocation.
+
+    Arguments:
+        members {list[tuple(str, str)]} -- The data set name and volume
+        of each job to submit.
+        module {AnsibleModule} -- The AnsibleModule object from the running module.
+
+    Returns:
+        list[Union[str, SubmitJCLError]] -- The job ID of each entry, in the
+        same order, or the error it failed with.
+    """
+    outcomes = [None] * len(members)
+    args = []
+    for index, (src, vol) in enumerate(members):
+        try:
+            check_data_set_name(src)
+        except SubmitJCLError as e:
+            outcomes[index] = e
+            continue
+        args.append((index, src, vol))
+    if not args:
+        return outcomes
+    script_path = install_rexx("submit_volume.rexx", SUBMIT_VOLUME_REXX)
+    cmd = [script_path]
+    for index, src, vol in args:
+        cmd.extend([str(index), src, vol])
+    rc, stdout, stderr = module.run_command(cmd)
+    for line in stdout.splitlines():
+        index, sep, job_id = line.strip().partition(" ")
+        if not index.isdigit() or int(index) >= len(members):
+            continue
+        job_id = job_id.strip()
+        if not job_id or "Error" in job_id or job_id.startswith("ERROR"):
+            outcomes[int(index)] = SubmitJCLError("SUBMIT JOB FAILED: " + job_id)
+        else:
+            outcomes[int(index)] = job_id
+    for index, src, vol in args:
+        if outcomes[index] is None:
+            outcomes[index] = SubmitJCLError(
+                "SUBMIT JOB FAILED, NO JOB ID IS RETURNED : " + stdout + stderr
+            )
+    return outcomes
 
 
-def copy_rexx_and_run(script, src, vol, module):
-    delete_on_close = True
-    tmp_file = NamedTemporaryFile(delete=delete_on_close)
-    with open(tmp_file.name, "w") as f:
-        f.write(script)
-    chmod(tmp_file.name, S_IEXEC | S_IREAD | S_IWRITE)
-    pathName = path.dirname(tmp_file.name)
-    scriptName = path.basename(tmp_file.name)
-    rc, stdout, stderr = module.run_command(["./" + scriptName, src, vol], cwd=pathName)
-    return rc, stdout, stderr
+def check_data_set_name(src):
+    """ Raise SubmitJCLError when src is not a data set name. """
+    if not re.match(DSN_REGEX, src, re.IGNORECASE):
+        raise SubmitJCLError(
+            "The parameter src for data set is not a valid name pattern. "
+            "Please check the src input."
+        )
+
+
+def submit_src(src, location, volume, module):
+    """Submit the JCL of a data set or USS file.
+
+    Arguments:
+        src {str} -- The data set or USS file holding the JCL.
+        location {str} -- Either DATA_SET or USS.
+        volume {str} -- The volume of an uncataloged data set, or None.
+        module {AnsibleModule} -- The AnsibleModule object from the running module.
+
+    Raises:
+        SubmitJCLError: When the job cannot be submitted.
+
+    Returns:
+        str -- The job ID.
+    """
+    if location == "USS":
+        return submit_uss_jcl(src, module)
+    check_data_set_name(src)
+    if volume:
+        return submit_jcl_in_volume(src, volume, module)
+    return submit_pds_jcl(src)
+
 
+def submit_batch(
+    module, batch, wait, wait_time_s, return_output, step_summary, waiter, timing
+):
+    """Submit several jobs, each as soon as the entries it depends on
+    succeeded, and wait for all of them together.
 
-def get_job_info(module, jobId, return_output):
+    Arguments:
+        module {AnsibleModule} -- The AnsibleModule object from the running module.
+        batch {list[dict]} -- The src, location, volume, max_rc, name and
+        dependencies of each job.
+        wait {bool} -- Wait for the jobs to end.
+        wait_time_s {int} -- Seconds to wait for all the jobs.
+        return_output {bool} -- Browse the spool of the jobs.
+        step_summary {bool} -- Add the steps of each job.
+        waiter {JobWaiter} -- Queries the status of the jobs.
+        timing {Timing} -- Measures the phases of the module run.
+
+    Raises:
+        ValueError: When the dependencies are not valid, or are used
+        without waiting.
+
+    Returns:
+        dict -- The module result, with the output of the jobs in jobs and
+        the outcome of each entry of the batch in batch.
+    """
+    graph = JobGraph(batch)
+    if not wait and any(graph.dependencies):
+        raise ValueError("Batch entries with dependencies require wait=true.")
+    items = [
+        dict(
+            src=params.get("src"),
+            name=params.get("name"),
+            job_id=None,
+            failed=False,
+            skipped=False,
+            msg="",
+        )
+        for params in batch
+    ]
+
+    def skip(indexes):
+        for index in indexes:
+            items[index].update(
+                failed=True,
+                skipped=True,
+                msg="Not submitted because entry {0} did not succeed.".format(
+                    graph.name(graph.reasons[index])
+                ),
+            )
+
+    deadline = monotonic() + wait_time_s
+    submitted_at = {}
+    running = {}
+    waited = {}
+    while True:
+        ready = graph.ready()
+        # Entries on uncataloged volumes share one run of the REXX helper
+        on_volume = [
+            index
+            for index in ready
+            if batch[index].get("volume") and batch[index].get("location") != "USS"
+        ]
+        outcomes = {}
+        if on_volume:
+            volume_started = monotonic()
+            outcomes = dict(
+                zip(
+                    on_volume,
+                    submit_jcl_in_volumes(
+                        [
+                            (batch[index].get("src"), batch[index].get("volume"))
+                            for index in on_volume
+                        ],
+                        module,
+                    ),
+                )
+            )
+            timing.add("submit", monotonic() - volume_started)
+        for index in ready:
+            params = batch[index]
+            graph.submit(index)
+            submit_started = monotonic()
+            try:
+                if index in outcomes:
+                    job_id = outcomes.get(index)
+                    if isinstance(job_id, SubmitJCLError):
+                        raise job_id
+                else:
+                    job_id = submit_src(
+                        params.get("src"),
+                        params.get("location"),
+                        params.get("volume"),
+                        module,
+                    )
+            except SubmitJCLError as e:
+                items[index].update(failed=True, msg=e.msg)
+                skip(graph.finish(index, False))
+                continue
+            finally:
+                timing.add("submit", monotonic() - submit_started)
+            items[index]["job_id"] = job_id
+            if index in outcomes:
+                submit_started = volume_started
+            submitted_at[job_id] = submit_started
+            timing.event("submit_end", job_id=job_id)
+            running[job_id] = index
+        remaining = deadline - monotonic()
+        if not wait or not running or remaining <= 0:
+            break
+        with timing.phase("wait"):
+            results = waiter.wait_all(
+                list(running), remaining, start=submitted_at, return_when="any"
+            )
+        waited.update(results)
+        ended = [job_id for job_id, times in results.items() if not times["timed_out"]]
+        if not ended:
+            break
+        for job_id in ended:
+            index = running.pop(job_id)
+            rc = _completion_code(results[job_id].get("job"))
+            items[index]["rc"] = rc
+            max_rc = batch[index].get("max_rc")
+            if max_rc is not None and (rc is None or max_rc < rc):
+                items[index].update(
+                    failed=True,
+                    msg="The job return code {0} exceeds max_rc {1}.".format(
+                        rc, max_rc
+                    ),
+                )
+            skip(graph.finish(index, rc is not None and not items[index]["failed"]))
+    for index in graph.waiting():
+        items[index].update(
+            failed=True,
+            timed_out=True,
+            msg=(
+                "Not submitted because its dependencies did not end "
+                "within wait_time_s."
+            ),
+        )
+
+    job_ids = [item.get("job_id") for item in items if item.get("job_id")]
+    for job_id in job_ids:
+        add_job_events(timing, waiter, job_id)
+    jobs = []
+    if job_ids:
+        with timing.phase("output_retrieval"):
+            jobs = job_output(
+                module,
+                job_id=job_ids,
+                metadata_only=not return_output,
+                wire_format=module.params.get("wire_format"),
+                step_summary=wait and step_summary,
+            ).get("jobs")
+    jobs_by_id = dict((job.get("job_id"), job) for job in jobs)
+
+    for item in items:
+        times = waited.get(item.get("job_id"))
+        if times is None:
+            continue
+        item["timed_out"] = times.get("timed_out")
+        item["duration"] = times.get("duration")
+        item["visible_time"] = times.get("visible_time")
+        item["queue_time"] = times.get("queue_time")
+        item["execution_time"] = times.get("execution_time")
+
+    return dict(
+        changed=bool(job_ids),
+        jobs=[jobs_by_id.get(job_id) for job_id in job_ids if job_id in jobs_by_id],
+        batch=items,
+    )
+
+
+def add_job_events(timing, waiter, job_id):
+    """Record when JES first listed a job, and when the job was first seen
+    running and ended.
+
+    Arguments:
+        timing {Timing} -- Measures the phases of the module run.
+        waiter {JobWaiter} -- The waiter that queried the job.
+        job_id {str} -- The job ID.
+    """
+    state = waiter.states.get(job_id) or {}
+    for event, at in (
+        ("visible", waiter.seen.get(job_id)),
+        ("running", state.get("running_since")),
+        ("ended", state.get("ended_at")),
+    ):
+        if at is not None:
+            timing.event(event, at, job_id=job_id)
+
+
+def set_timing(result, timing, waiter=None, job_id=None, submitted_at=None):
+    """Add the timing breakdown, and the events when they are recorded,
+    to the module result.
+
+    Arguments:
+        result {dict} -- The module result.
+        timing {Timing} -- Measures the phases of the module run.
+
+    Keyword Arguments:
+        waiter {JobWaiter} -- The waiter that queried the job. (default: {None})
+        job_id {str} -- The job ID of a single job submission. (default: {None})
+        submitted_at {float} -- The monotonic time the job was submitted at.
+        (default: {None})
+    """
+    result["timing"] = timing.result()
+    if waiter is not None:
+        result["timing"]["polls"] = waiter.polls
+        result["timing"]["poll_wait"] = waiter.policy.waited
+    if job_id is not None:
+        seen = waiter.seen.get(job_id)
+        result["timing"]["visible_time"] = (
+            None if seen is None else max(seen - submitted_at, 0.0)
+        )
+        result["timing"]["queue_time"] = result.get("queue_time")
+        result["timing"]["execution_time"] = result.get("execution_time")
+    events = timing.result_events()
+    if events is not None:
+        result["timing_events"] = events
+
+
+def _completion_code(job_raw):
+    """Return the condition code of a job listed by Jobs.list.
+
+    Arguments:
+        job_raw {dict} -- The listing of the job.
+
+    Returns:
+        int -- The condition code, or None when the job did not complete
+        normally.
+    """
+    if not job_raw or "CC" not in (job_raw.get("status") or ""):
+        return None
+    try:
+        return int(parsing_job(job_raw).get("code"))
+    except (TypeError, ValueError):
+        return None
+
+
+def get_job_info(module, jobId, return_output, step_summary=False, waiter=None):
     result = dict()
     try:
-        output = query_jobs_status(jobId)
+        output = query_jobs_status(jobId, waiter)
     except SubmitJCLError:
         raise
 
-    result = job_output(module, job_id=jobId)
-
-    if not return_output:
-        for job in result.get("jobs", []):
-            job["ddnames"] = []
+    result = job_output(
+        module,
+        job_id=jobId,
+        metadata_only=not return_output,
+        wire_format=module.params.get("wire_format"),
+        step_summary=step_summary,
+    )
 
     result["changed"] = True
 
     return result
 
 
-def query_jobs_status(jobId):
+def list_retry_policy():
+    """Return the policy each Jobs.list call of the waiter is retried with.
+
+    Returns:
+        RetryPolicy -- Retries IndexError with a growing, jittered wait for
+        at most LIST_RETRY_DEADLINE seconds.
+    """
+    return RetryPolicy(
+        interval=0.05,
+        max_interval=0.5,
+        backoff=2.0,
+        jitter=0.2,
+        deadline=LIST_RETRY_DEADLINE,
+        retry_on=(IndexError,),
+    )
+
+
+def query_jobs_status(jobId, waiter=None):
     timeout = 10
-    output = None
-    while output is None and timeout > 0:
-        try:
-            output = Jobs.list(job_id=jobId)
-            sleep(1)
-            timeout = timeout - 1
-        except IndexError:
-            pass
-        except Exception as e:
-            raise SubmitJCLError(
-                repr(e)
-                + """
-            The output is """
-                + output
-            )
-    if output is None and timeout == 0:
+    if waiter is None:
+        waiter = JobWaiter(Jobs.list, jitter=POLL_JITTER, retry=list_retry_policy())
+    try:
+        output = waiter.find(jobId, timeout)
+    except Exception as e:
+        raise SubmitJCLError(repr(e))
+    if output is None:
         raise SubmitJCLError(
             "THE JOB CAN NOT BE QUERIED FROM JES (TIMEOUT=10s). PLEASE CHECK THE ZOS SYSTEM. IT IS SLOW TO RESPONSE."
         )
@@ -682,37 +1609,94 @@ def data_set_or_path_type(contents, resolve_dependencies):
 
 
 def encoding_type(contents, resolve_dependencies):
-    if not re.fullmatch(r"^[A-Z0-9-]{2,}$", str(contents), re.IGNORECASE,):
+    if not re.fullmatch(r"^[A-Z0-9-_]{2,}$", str(contents), re.IGNORECASE,):
         raise ValueError(
             'Invalid argument type for "{0}". expected "encoding"'.format(contents)
         )
+    try:
+        check_encoding(str(contents))
+    except LookupError:
+        raise ValueError(
+            'The encoding "{0}" is not supported.'.format(contents)
+        )
     return str(contents)
 
 
 def run_module():
 
     module_args = dict(
-        src=dict(type="str", required=True),
+        src=dict(type="str", required=False),
         wait=dict(type="bool", required=False),
         location=dict(
             type="str", default="DATA_SET", choices=["DATA_SET", "USS", "LOCAL"],
         ),
-        encoding=dict(
+        encoding=dict(type="str", default="UTF-8"),
+        target_encoding=dict(
             type="str",
-            default="UTF-8",
-            choices=["UTF-8", "ASCII", "ISO-8859-1", "EBCDIC", "IBM-037", "IBM-1047"],
+            default="IBM-1047",
+            choices=[
+                "IBM-037",
+                "IBM-273",
+                "IBM-500",
+                "IBM-875",
+                "IBM-1026",
+                "IBM-1047",
+                "IBM-1140",
+            ],
         ),
         volume=dict(type="str", required=False),
         return_output=dict(type="bool", required=False, default=True),
         wait_time_s=dict(type="int", default=60),
+        poll_interval_s=dict(type="float", default=0.1),
+        max_poll_interval_s=dict(type="float", default=5),
+        poll_backoff=dict(type="float", default=1.5),
+        status_cache=dict(type="bool", required=False, default=False),
         max_rc=dict(type="int", required=False),
         temp_file=dict(type="path", required=False),
+        local_content=dict(type="str", required=False, no_log=True),
+        jcl_digest=dict(type="str", required=False),
+        jcl_cache=dict(type="bool", required=False, default=False),
+        timing_events=dict(type="bool", required=False, default=False),
+        wire_format=dict(
+            type="str", required=False, default="json", choices=["json", "framed"]
+        ),
+        jcl_cache_max_size=dict(type="int", required=False, default=64),
+        step_summary=dict(type="bool", required=False, default=False),
+        compress=dict(type="str", required=False, choices=["zlib", "gzip"]),
+        cache=dict(type="bool", required=False, default=False),
+        cache_dir=dict(
+            type="str", required=False, default="~/.ansible/zos_job_output_cache"
+        ),
+        cache_max_size=dict(type="int", required=False, default=256),
+        batch=dict(
+            type="list",
+            elements="dict",
+            required=False,
+            options=dict(
+                src=dict(type="str", required=True),
+                location=dict(
+                    type="str", default="DATA_SET", choices=["DATA_SET", "USS"],
+                ),
+                volume=dict(type="str", required=False),
+                max_rc=dict(type="int", required=False),
+                name=dict(type="str", required=False),
+                dependencies=dict(
+                    type="list", elements="str", required=False
+                ),
+            ),
+        ),
     )
 
-    module = AnsibleModule(argument_spec=module_args, supports_check_mode=True)
+    module = AnsibleModule(
+        argument_spec=module_args,
+        supports_check_mode=True,
+        mutually_exclusive=[["src", "batch"]],
+        required_one_of=[["src", "batch"]],
+    )
+    timing = Timing(module.params.get("timing_events"))
 
     arg_defs = dict(
-        src=dict(arg_type=data_set_or_path_type, required=True),
+        src=dict(arg_type=data_set_or_path_type, required=False),
         wait=dict(arg_type="bool", required=False),
         location=dict(
             arg_type="str", default="DATA_SET", choices=["DATA_SET", "USS", "LOCAL"],
@@ -723,6 +1707,23 @@ def run_module():
         wait_time_s=dict(arg_type="int", required=False, default=60),
         max_rc=dict(arg_type="int", required=False),
         temp_file=dict(arg_type="path", required=False),
+        batch=dict(
+            arg_type="list",
+            elements="dict",
+            required=False,
+            options=dict(
+                src=dict(arg_type=data_set_or_path_type, required=True),
+                location=dict(
+                    arg_type="str", default="DATA_SET", choices=["DATA_SET", "USS"],
+                ),
+                volume=dict(arg_type="volume", required=False),
+                max_rc=dict(arg_type="int", required=False),
+                name=dict(arg_type="str", required=False),
+                dependencies=dict(
+                    arg_type="list", elements="str", required=False
+                ),
+            ),
+        ),
     )
 
     parser = BetterArgParser(arg_defs)
@@ -737,10 +1738,24 @@ def run_module():
     return_output = parsed_args.get("return_output")
     wait_time_s = parsed_args.get("wait_time_s")
     max_rc = parsed_args.get("max_rc")
+    step_summary = module.params.get("step_summary")
+    list_jobs = Jobs.list
+    if module.params.get("status_cache"):
+        try:
+            list_jobs = JobStatusCache().recorder(Jobs.list)
+        except Exception as e:
+            module.fail_json(msg=repr(e), **result)
+    retry = list_retry_policy()
+    waiter = JobWaiter(
+        list_jobs,
+        interval=module.params.get("poll_interval_s"),
+        max_interval=module.params.get("max_poll_interval_s"),
+        backoff=module.params.get("poll_backoff"),
+        jitter=POLL_JITTER,
+        retry=retry,
+    )
     # get temporary file names for copied files
     temp_file = parsed_args.get("temp_file")
-    if temp_file:
-        temp_file_2 = NamedTemporaryFile(delete=True)
 
     if wait_time_s <= 0:
         module.fail_json(
@@ -748,10 +1763,32 @@ def run_module():
             **result
         )
 
-    DSN_REGEX = r"^(([A-Z]{1}[A-Z0-9]{0,7})([.]{1})){1,21}[A-Z]{1}[A-Z0-9]{0,7}([(]([A-Z]{1}[A-Z0-9]{0,7})[)]){0,1}?$"
+    if parsed_args.get("batch"):
+        try:
+            result = submit_batch(
+                module,
+                parsed_args.get("batch"),
+                wait is True,
+                wait_time_s,
+                return_output,
+                step_summary,
+                waiter,
+                timing,
+            )
+        except Exception as e:
+            module.fail_json(msg=repr(e), **result)
+        set_timing(result, timing, waiter)
+        result["retry"] = retry.metrics()
+        if module.params.get("compress") and result.get("jobs") is not None:
+            result = compress_jobs(result, module.params.get("compress"))
+        if any(item.get("failed") for item in result.get("batch")):
+            module.fail_json(msg="One or more jobs of the batch failed.", **result)
+        module.exit_json(**result)
 
     # calculate the job elapse time
     duration = 0
+    timed_out = False
+    submitted_at = monotonic()
     try:
         if location == "DATA_SET":
             data_set_name_pattern = re.compile(DSN_REGEX, re.IGNORECASE)
@@ -769,40 +1806,39 @@ def run_module():
         elif location == "USS":
             jobId = submit_uss_jcl(src, module)
         else:
-            # For local file, it has been copied to the temp directory in action plugin.
-            encoding = parsed_args.get("encoding")
-            if encoding == "EBCDIC" or encoding == "IBM-037" or encoding == "IBM-1047":
-                jobId = submit_uss_jcl(temp_file, module)
-            # 'UTF-8' 'ASCII' encoding will be converted.
-            elif (
-                encoding == "UTF-8"
-                or encoding == "ISO-8859-1"
-                or encoding == "ASCII"
-                or encoding is None
-            ):
-                (conv_rc, stdout, stderr) = module.run_command(
-                    "iconv -f ISO8859-1 -t IBM-1047 %s > %s"
-                    % (quote(temp_file), quote(temp_file_2.name)),
-                    use_unsafe_shell=True,
-                )
-                if conv_rc == 0:
-                    jobId = submit_uss_jcl(temp_file_2.name, module)
-                else:
-                    module.fail_json(
-                        msg="The Local file encoding conversion failed. Please check the source file."
-                        + stderr,
-                        **result
+            # For local file, the action plugin passes the converted JCL in
+            # local_content, or copies large files to the temp directory.
+            local_content = module.params.get("local_content")
+            digest = module.params.get("jcl_digest")
+            if local_content is not None:
+                with timing.phase("staging"):
+                    content = base64.b64decode(local_content)
+                jobId = submit_local_jcl([content])
+            elif digest:
+                with timing.phase("staging"):
+                    jcl_path = get_cached_jcl(
+                        digest, temp_file, module.params.get("jcl_cache_max_size")
                     )
+                if jcl_path is None:
+                    # The action plugin uploads the JCL and runs the module again
+                    module.exit_json(changed=False, jcl_cache_miss=True)
+                jobId = submit_local_jcl(iter_file(jcl_path))
             else:
-                module.fail_json(
-                    msg=(
-                        "The Local file encoding format is not supported."
-                        "The supported encoding is UTF-8, ASCII, ISO-8859-1, EBCDIC, IBM-037, IBM-1047. Default is UTF-8."
-                    ),
-                    **result
+                jobId = submit_local_jcl(
+                    transcode(
+                        iter_file(temp_file),
+                        parsed_args.get("encoding"),
+                        module.params.get("target_encoding"),
+                    )
                 )
     except SubmitJCLError as e:
         module.fail_json(msg=repr(e), **result)
+    submit_ended = monotonic()
+    timing.event("submit_start", submitted_at)
+    timing.event("submit_end", submit_ended, job_id=jobId)
+    # staging on the managed node is reported on its own
+    staging = timing.phases.get("staging", 0.0)
+    timing.add("submit", submit_ended - submitted_at - staging)
     if jobId is None or jobId == "":
         result["job_id"] = jobId
         module.fail_json(
@@ -811,23 +1847,27 @@ def run_module():
         )
 
     result["job_id"] = jobId
+    waited = {}
     if wait is True:
         try:
-            waitJob = query_jobs_status(jobId)
-        except SubmitJCLError as e:
+            with timing.phase("wait"):
+                waited = waiter.wait(jobId, wait_time_s, start=submitted_at)
+        except Exception as e:
+            result["retry"] = retry.metrics()
             module.fail_json(msg=repr(e), **result)
-        while waitJob[0].get("status") == "AC":  # AC means in progress
-            sleep(1)
-            duration = duration + 1
-            waitJob = Jobs.list(job_id=jobId)
-            if waitJob[0].get("status") == "CC":  # CC means completed
-                break
-            if duration == wait_time_s:  # Long running task. timeout return
-                break
+        duration = waited.get("duration")
+        timed_out = waited.get("timed_out")
 
     try:
-        result = get_job_info(module, jobId, return_output)
-        if wait is True and return_output is True and max_rc is not None:
+        with timing.phase("output_retrieval"):
+            result = get_job_info(
+                module,
+                jobId,
+                return_output,
+                step_summary=wait is True and step_summary,
+                waiter=waiter,
+            )
+        if wait is True and max_rc is not None:
             assert_valid_return_code(
                 max_rc, result.get("jobs")[0].get("ret_code").get("code")
             )
@@ -836,10 +1876,13 @@ def run_module():
     except Exception as e:
         module.fail_json(msg=repr(e), **result)
     finally:
-        if temp_file:
+        if temp_file and path.exists(temp_file):
             remove(temp_file)
     result["duration"] = duration
-    if duration == wait_time_s:
+    if wait is True:
+        result["queue_time"] = waited.get("queue_time")
+        result["execution_time"] = waited.get("execution_time")
+    if timed_out:
         result["message"] = {
             "stdout": "Submit JCL operation succeeded but it is a long running job. Timeout is "
             + str(wait_time_s)
@@ -848,6 +1891,11 @@ def run_module():
     else:
         result["message"] = {"stdout": "Submit JCL operation succeeded."}
     result["changed"] = True
+    add_job_events(timing, waiter, jobId)
+    set_timing(result, timing, waiter, jobId, submitted_at)
+    result["retry"] = retry.metrics()
+    if module.params.get("compress") and result.get("jobs") is not None:
+        result = compress_jobs(result, module.params.get("compress"))
     module.exit_json(**result)
 
 
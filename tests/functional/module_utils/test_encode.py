@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ibm_zos_core.plugins.module_utils.encode import (
+    check_encoding,
+    iter_file,
+    transcode,
+)
+import pytest
+
+JCL = u"//HELLO    JOB (T043JM),'CAFÉ [1]',CLASS=R\n//* ¬^ ¨Ý\n"
+
+
+def encode(chunks, from_encoding, to_encoding="IBM-1047"):
+    return b"".join(transcode(chunks, from_encoding, to_encoding))
+
+
+def test_cp1047_special_characters():
+    expected = b"\xad\xbd\x5f\xb0\xba\xbb\x15"
+    assert encode([u"[]^¬Ý¨\n".encode("utf-8")], "UTF-8") == expected
+
+
+def test_cp037_matches_python_codec_but_new_line():
+    expected = JCL.encode("cp037").replace(b"\x25", b"\x15")
+    assert encode([JCL.encode("latin-1")], "ISO-8859-1", "IBM-037") == expected
+
+
+def test_multibyte_character_split_across_chunks():
+    data = JCL.encode("utf-8")
+    chunks = [data[i:i + 1] for i in range(len(data))]
+    assert encode(chunks, "UTF-8") == encode([data], "UTF-8")
+
+
+def test_ebcdic_to_ebcdic_round_trip():
+    cp1047 = encode([JCL.encode("utf-8")], "UTF-8")
+    cp037 = encode([cp1047], "IBM-1047", "IBM-037")
+    assert cp037 == encode([JCL.encode("utf-8")], "UTF-8", "IBM-037")
+    assert encode([cp037], "IBM-037", "IBM-1047") == cp1047
+
+
+def test_ebcdic_passthrough():
+    assert encode([b"\xc1", b"\xad"], "EBCDIC") == b"\xc1\xad"
+
+
+def test_unencodable_character():
+    with pytest.raises(UnicodeError):
+        encode([u"€".encode("utf-8")], "UTF-8")
+
+
+def test_check_encoding():
+    check_encoding("CP1252")
+    check_encoding("IBM-1140")
+    with pytest.raises(LookupError):
+        check_encoding("IBM-9999")
+
+
+def test_iter_file(tmpdir):
+    jcl = tmpdir.join("sample.jcl")
+    jcl.write_binary(b"0123456789")
+    assert list(iter_file(str(jcl), 4)) == [b"0123", b"4567", b"89"]
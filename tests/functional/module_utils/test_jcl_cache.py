@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ibm_zos_core.plugins.module_utils.jcl_cache import (
+    cached_jcl,
+    jcl_digest,
+    store_jcl,
+)
+import os
+import pytest
+
+JCL = b"\x61\x61\xc8\xc5\xd3\xd3\xd6\x40\xd1\xd6\xc2\x15"
+
+
+def upload(tmpdir, content, name="upload"):
+    uploaded = tmpdir.join(name)
+    uploaded.write_binary(content)
+    return str(uploaded)
+
+
+@pytest.fixture
+def cache_dir(tmpdir, monkeypatch):
+    cache = tmpdir.mkdir("cache")
+    monkeypatch.setenv("ANSIBLE_ZOS_REXX_CACHE", str(cache))
+    return cache
+
+
+def test_miss_then_hit(tmpdir, cache_dir):
+    digest = jcl_digest([JCL])
+    assert cached_jcl(digest) is None
+    jcl_path = store_jcl(digest, upload(tmpdir, JCL))
+    assert not os.path.exists(str(tmpdir.join("upload")))
+    assert cached_jcl(digest) == jcl_path
+    with open(jcl_path, "rb") as f:
+        assert f.read() == JCL
+
+
+def test_store_rejects_mismatch(tmpdir, cache_dir):
+    with pytest.raises(ValueError):
+        store_jcl(jcl_digest([JCL]), upload(tmpdir, JCL + b"\x15"))
+    assert cached_jcl(jcl_digest([JCL])) is None
+
+
+def test_modified_copy_is_a_miss(tmpdir, cache_dir):
+    digest = jcl_digest([JCL])
+    jcl_path = store_jcl(digest, upload(tmpdir, JCL))
+    os.chmod(jcl_path, 0o600)
+    with open(jcl_path, "ab") as f:
+        f.write(b"\x15")
+    assert cached_jcl(digest) is None
+
+
+def test_invalid_digest(cache_dir):
+    with pytest.raises(ValueError):
+        cached_jcl("../../etc/passwd")
+
+
+def test_evicts_least_recently_used(tmpdir, cache_dir):
+    big = JCL * 50000
+    first = store_jcl(jcl_digest([big]), upload(tmpdir, big), max_size=1)
+    os.utime(first, (1, 1))
+    other = big + b"\x15"
+    second = store_jcl(jcl_digest([other]), upload(tmpdir, other), max_size=1)
+    assert not os.path.exists(first)
+    assert os.path.exists(second)
@@ -0,0 +1,588 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ibm_zos_core.plugins.module_utils import job as job_utils
+from ibm_zos_core.plugins.module_utils.job import (
+    JOB_FILTER_LIMIT,
+    JOB_JSON_REXX,
+    compress_jobs,
+    expand_jobs,
+    get_step_summary,
+    job_output,
+    _get_job_json_cmd,
+    _iter_job_framed_lines,
+    _iter_job_json_lines,
+    _iter_lines,
+    _set_line_cursors,
+    _SpoolWriter,
+    _stream_job_output,
+)
+import io
+import json
+import pytest
+
+
+@pytest.fixture
+def rexx_cache(tmpdir, monkeypatch):
+    monkeypatch.setenv("ANSIBLE_ZOS_REXX_CACHE", str(tmpdir))
+    return tmpdir
+
+
+REXX_JSON_OUTPUT = """{"jobs":[
+{
+"job_id":"JOB00134",
+"job_name":"HELLO",
+"subsystem":"STL1",
+"owner":"OMVSADM",
+"ret_code":{"msg":"CC 0000"},
+"class":"R",
+"content_type":"JOB",
+"ddnames":[
+{
+"ddname":"JESMSGLG",
+"record_count":"2",
+"id":"2",
+"stepname":"JES2",
+"procstep":"",
+"byte_count":"60",
+"content":[
+" 10.25.48 JOB00134 ---- TUESDAY,   18 FEB 2020 ----"
+,
+" 10.25.48 JOB00134  $HASP395 HELLO    ENDED - RC=0000"
+]
+}
+,
+{
+"ddname":"SYSUT2",
+"record_count":"3",
+"id":"103",
+"stepname":"STEP0001",
+"procstep":"",
+"byte_count":"49",
+"content":[
+" HELLO, \\"WORLD\\""
+,
+","
+,
+"]"
+]
+}
+]
+}
+]}
+"""
+
+REXX_FRAMED_OUTPUT = """F 1
+J
+A job_id JOB00134
+A job_name HELLO
+A subsystem STL1
+A owner OMVSADM
+A ret_code CC 0000
+A class R
+A content_type JOB
+D
+A ddname JESMSGLG
+A record_count 2
+A id 2
+A stepname JES2
+A procstep
+A byte_count 60
+C 2
+ 10.25.48 JOB00134 ---- TUESDAY,   18 FEB 2020 ----
+ 10.25.48 JOB00134  $HASP395 HELLO    ENDED - RC=0000
+D
+A ddname SYSUT2
+A record_count 3
+A id 103
+A stepname STEP0001
+A procstep
+A byte_count 49
+C 3
+ HELLO, "WORLD"
+,
+]
+"""
+
+
+def test_stream_parse_matches_json_loads():
+    expected = json.loads(REXX_JSON_OUTPUT, strict=False)
+    jobs = list(
+        _iter_job_json_lines(iter(REXX_JSON_OUTPUT.splitlines(True)), _SpoolWriter())
+    )
+    assert jobs == expected.get("jobs")
+
+
+def test_stream_parse_no_jobs():
+    jobs = list(_iter_job_json_lines(iter(['{"jobs":[]}\n']), _SpoolWriter()))
+    assert jobs == []
+
+
+def test_stream_parse_no_output():
+    with pytest.raises(RuntimeError):
+        list(_iter_job_json_lines(iter([]), _SpoolWriter()))
+
+
+def test_stream_parse_spills_large_ddnames(tmpdir):
+    jobs = list(
+        _iter_job_json_lines(
+            iter(REXX_JSON_OUTPUT.splitlines(True)), _SpoolWriter(2, str(tmpdir))
+        )
+    )
+    small, large = jobs[0].get("ddnames")
+    assert len(small.get("content")) == 2
+    assert small.get("content_path") is None
+    assert large.get("content") == []
+    with open(large.get("content_path"), "r") as f:
+        assert f.read().splitlines() == [' HELLO, "WORLD"', ",", "]"]
+
+
+def test_job_json_cmd_ddname_list(rexx_cache):
+    cmd = _get_job_json_cmd(job_id="JOB00134", dd_name=["JESMSGLG", "JESYSMSG"])
+    assert "ddname=JESMSGLG,JESYSMSG" in cmd[1].split(" ")
+
+
+def test_job_json_cmd_ddname_all(rexx_cache):
+    cmd = _get_job_json_cmd(job_id="JOB00134", dd_name=["?"])
+    assert "ddname=" in cmd[1].split(" ")
+
+
+def test_line_cursors_more_lines():
+    job = {
+        "ddnames": [
+            {"id": "2", "record_count": "10", "first_line": "3", "content": ["a", "b"]}
+        ]
+    }
+    _set_line_cursors(job)
+    assert job.get("ddnames")[0].get("first_line") == 3
+    assert job.get("ddnames")[0].get("next_line") == 5
+    assert job.get("cursor") == {"2": 4}
+
+
+def test_line_cursors_end_of_ddname():
+    job = {"ddnames": [{"record_count": "4", "first_line": "3", "content": ["a", "b"]}]}
+    _set_line_cursors(job)
+    assert job.get("ddnames")[0].get("next_line") is None
+
+
+def test_line_cursors_metadata_only():
+    job = {"ddnames": [{"id": "2", "record_count": "4", "content": []}]}
+    _set_line_cursors(job)
+    assert job.get("ddnames")[0].get("next_line") is None
+    assert job.get("cursor") == {"2": 4}
+
+
+def test_line_cursors_spilled():
+    job = {
+        "ddnames": [
+            {
+                "id": "102",
+                "record_count": "9",
+                "first_line": "5",
+                "content": [],
+                "content_lines": 5,
+                "content_path": "/tmp/JOB00134.102.SYSPRINT",
+            }
+        ]
+    }
+    _set_line_cursors(job)
+    assert job.get("ddnames")[0].get("next_line") is None
+    assert job.get("cursor") == {"102": 9}
+
+
+def test_job_json_cmd_follow(rexx_cache):
+    cmd = _get_job_json_cmd(
+        job_id="JOB00134", lines={"follow": {"2": 17, "102": 4}}
+    )
+    assert "since=2:17,102:4" in cmd[1].split(" ")
+
+
+def test_framed_parse_matches_json():
+    expected = json.loads(REXX_JSON_OUTPUT, strict=False)
+    jobs = list(
+        _iter_job_framed_lines(iter(REXX_FRAMED_OUTPUT.split("\n")), _SpoolWriter())
+    )
+    assert jobs == expected.get("jobs")
+
+
+def test_framed_parse_streamed_in_small_blocks():
+    expected = json.loads(REXX_JSON_OUTPUT, strict=False)
+    lines = _iter_lines(io.StringIO(REXX_FRAMED_OUTPUT), size=7)
+    jobs = list(_iter_job_framed_lines(lines, _SpoolWriter()))
+    assert jobs == expected.get("jobs")
+
+
+def test_framed_parse_windows():
+    expected = json.loads(REXX_JSON_OUTPUT, strict=False)
+    windowed = REXX_FRAMED_OUTPUT.replace("C 3\n HELLO", "C 1\n HELLO").replace(
+        ",\n]", "C 2\n,\n]\nC 0"
+    )
+    jobs = list(_iter_job_framed_lines(iter(windowed.split("\n")), _SpoolWriter()))
+    assert jobs == expected.get("jobs")
+
+
+def test_framed_parse_spills_large_ddnames(tmpdir):
+    jobs = list(
+        _iter_job_framed_lines(
+            iter(REXX_FRAMED_OUTPUT.split("\n")), _SpoolWriter(2, str(tmpdir))
+        )
+    )
+    large = jobs[0].get("ddnames")[1]
+    assert large.get("content") == []
+    assert large.get("content_lines") == 3
+    with open(large.get("content_path"), "r") as f:
+        assert f.read().splitlines() == [' HELLO, "WORLD"', ",", "]"]
+
+
+def test_framed_parse_no_jobs():
+    jobs = list(_iter_job_framed_lines(iter(["F 1", ""]), _SpoolWriter()))
+    assert jobs == []
+
+
+def test_framed_parse_no_output():
+    with pytest.raises(RuntimeError):
+        list(_iter_job_framed_lines(iter([""]), _SpoolWriter()))
+
+
+def test_job_json_cmd_job_id_list(rexx_cache):
+    cmd = _get_job_json_cmd(job_id=["JOB00134", "JOB00135"], job_name=["HELLO"])
+    args = cmd[1].split(" ")
+    assert "jobid=JOB00134,JOB00135" in args
+    assert "jobname=HELLO" in args
+
+
+class FakeModule(object):
+    """Record the REXX arguments of each run, answering with one job per
+    job name, named after the run."""
+
+    def __init__(self):
+        self.args = []
+
+    def run_command(self, args):
+        params = dict(arg.split("=", 1) for arg in args[1].split(" "))
+        self.args.append(params)
+        names = params.get("jobname").split(",")
+        jobs = [
+            {"job_id": "JOB{0:05d}".format(len(self.args)), "job_name": name}
+            for name in names[:1]
+        ]
+        jobs.append({"job_id": "JOB99999", "job_name": "SHARED"})
+        return 0, json.dumps({"jobs": jobs}), ""
+
+
+def test_job_json_rexx_job_id_keeps_name_list():
+    assert "(words(jobname) > 1) & (words(jobid) >= 1)" in JOB_JSON_REXX
+
+
+def test_job_output_one_job_id_name_list(rexx_cache):
+    module = FakeModule()
+    job_output(module, job_id="JOB00134", job_name=["HELLO", "PAY*"])
+    assert len(module.args) == 1
+    assert module.args[0].get("jobid") == "JOB00134"
+    assert module.args[0].get("jobname") == "HELLO,PAY*"
+
+
+def test_job_output_chunks_job_names(rexx_cache):
+    module = FakeModule()
+    names = ["JOB{0}".format(index) for index in range(JOB_FILTER_LIMIT + 2)]
+    jobs = job_output(module, job_name=names).get("jobs")
+    assert [params.get("jobname") for params in module.args] == [
+        ",".join(names[:JOB_FILTER_LIMIT]),
+        ",".join(names[JOB_FILTER_LIMIT:]),
+    ]
+    assert [job.get("job_id") for job in jobs] == ["JOB00001", "JOB99999", "JOB00002"]
+
+
+def test_job_output_names_not_chunked_with_job_id(rexx_cache):
+    module = FakeModule()
+    names = ["JOB{0}".format(index) for index in range(JOB_FILTER_LIMIT + 2)]
+    job_output(module, job_id=["JOB00134"], job_name=names)
+    assert len(module.args) == 1
+    assert module.args[0].get("jobname") == ",".join(names)
+
+
+def test_job_json_cmd_job_id_str(rexx_cache):
+    cmd = _get_job_json_cmd(job_id="JOB00134")
+    assert "jobid=JOB00134" in cmd[1].split(" ")
+
+
+@pytest.mark.parametrize("compression", ["zlib", "gzip"])
+def test_compress_jobs_round_trip(compression):
+    jobs = json.loads(REXX_JSON_OUTPUT, strict=False).get("jobs")
+    results = compress_jobs({"jobs": jobs, "changed": False}, compression)
+    assert "jobs" not in results
+    assert results.get("jobs_compressed").get("compression") == compression
+    assert expand_jobs(results) == {"jobs": jobs, "changed": False}
+
+
+def test_expand_jobs_uncompressed():
+    assert expand_jobs({"jobs": [], "changed": False}) == {"jobs": [], "changed": False}
+
+
+def test_spool_writer_threshold_zero_writes_empty_ddnames(tmpdir):
+    spool = _SpoolWriter(0, str(tmpdir))
+    dd = {"id": "2", "ddname": "JESMSGLG"}
+    spool.open({"job_id": "JOB00134"}, dd)
+    spool.close(dd)
+    assert dd.get("content") == []
+    assert dd.get("content_lines") == 0
+    with open(dd.get("content_path"), "r") as f:
+        assert f.read() == ""
+
+
+STEP_JOB = {
+    "job_id": "JOB00135",
+    "ddnames": [
+        {
+            "ddname": "JESMSGLG",
+            "content": [
+                " 10.25.48 JOB00135  SMF000I  BUILD     COMPILE     COBOL       IGYCRCTL    0004",
+                " 10.25.49 JOB00135  SMF000I  BUILD     LINK        IEWL        0000",
+                " 10.25.49 JOB00135  SMF000I  BUILD     RUN         BUILDPGM    S0C4",
+            ],
+        },
+        {
+            "ddname": "JESYSMSG",
+            "content": [
+                "IEF236I ALLOC. FOR BUILD COBOL COMPILE",
+                "IEF142I BUILD COBOL COMPILE - STEP WAS EXECUTED - COND CODE 0004",
+                "IEF142I BUILD LINK - STEP WAS EXECUTED - COND CODE 0000",
+                "IEF472I BUILD RUN - COMPLETION CODE - SYSTEM=0C4 USER=0000 REASON=00000004",
+                "IEF272I BUILD CLEANUP - STEP WAS NOT EXECUTED.",
+            ],
+        },
+    ],
+}
+
+
+def test_step_summary():
+    steps = get_step_summary(STEP_JOB)
+    assert steps == [
+        {
+            "stepname": "COMPILE",
+            "procstep": "COBOL",
+            "program": "IGYCRCTL",
+            "executed": True,
+            "rc": 4,
+            "abend": None,
+        },
+        {
+            "stepname": "LINK",
+            "procstep": "",
+            "program": "IEWL",
+            "executed": True,
+            "rc": 0,
+            "abend": None,
+        },
+        {
+            "stepname": "RUN",
+            "procstep": "",
+            "program": "BUILDPGM",
+            "executed": True,
+            "rc": None,
+            "abend": "S0C4",
+        },
+        {
+            "stepname": "CLEANUP",
+            "procstep": "",
+            "program": None,
+            "executed": False,
+            "rc": None,
+            "abend": None,
+        },
+    ]
+
+
+def test_step_summary_user_abend():
+    job = {
+        "ddnames": [
+            {
+                "ddname": "JESYSMSG",
+                "content": ["IEF472I BUILD RUN - COMPLETION CODE - SYSTEM=000 USER=0100"],
+            }
+        ]
+    }
+    assert get_step_summary(job)[0].get("abend") == "U0100"
+
+
+def test_job_output_chunks_job_ids(rexx_cache):
+    module = FakeModule()
+    job_ids = ["JOB{0:05d}".format(index) for index in range(JOB_FILTER_LIMIT + 1)]
+    job_output(module, job_id=job_ids, job_name=["HELLO"])
+    assert [params.get("jobid") for params in module.args] == [
+        ",".join(job_ids[:JOB_FILTER_LIMIT]),
+        job_ids[JOB_FILTER_LIMIT],
+    ]
+
+
+class FakeProcess(object):
+    output = b""
+    error = b""
+    rc = 0
+
+    def __init__(self, cmd, stdout, stderr, env):
+        self.env = env
+        self.stdout = io.BytesIO(self.output)
+        stderr.write(self.error)
+        self.killed = False
+        self.waited = False
+        FakeProcess.last = self
+
+    def kill(self):
+        self.killed = True
+
+    def wait(self):
+        self.waited = True
+        return -9 if self.killed else self.rc
+
+
+def test_stream_job_output_waits_on_parse_error(rexx_cache, monkeypatch):
+    monkeypatch.setattr(job_utils, "Popen", FakeProcess)
+    module = FakeModule()
+    module.run_command_environ_update = {"LANG": "C"}
+    with pytest.raises(RuntimeError, match="No job output found"):
+        _stream_job_output(module, job_id=["JOB00134"])
+    assert FakeProcess.last.waited and not FakeProcess.last.killed
+    assert FakeProcess.last.env.get("LANG") == "C"
+
+
+def test_stream_job_output_reports_script_error(rexx_cache, monkeypatch):
+    monkeypatch.setattr(job_utils, "Popen", FakeProcess)
+    monkeypatch.setattr(FakeProcess, "rc", 20)
+    monkeypatch.setattr(FakeProcess, "error", b"IRX0043I Routine not found")
+    with pytest.raises(RuntimeError, match="RC: 20 Error: IRX0043I"):
+        _stream_job_output(FakeModule(), job_id=["JOB00134"])
+    assert FakeProcess.last.waited and not FakeProcess.last.killed
+
+
+def test_stream_job_output_kills_on_parse_error(rexx_cache, monkeypatch):
+    monkeypatch.setattr(job_utils, "Popen", FakeProcess)
+    # the script is still writing past the first block read
+    output = b'{"jobs":[\n{\nnot json\n' + b"\n" * 70000 + b"}\n]}\n"
+    monkeypatch.setattr(FakeProcess, "output", output)
+    with pytest.raises(ValueError):
+        _stream_job_output(FakeModule(), job_id=["JOB00134"])
+    assert FakeProcess.last.killed and FakeProcess.last.waited
+
+
+CR_JSON_OUTPUT = """{"jobs":[
+{
+"job_id":"JOB00134",
+"ret_code":{"msg":"CC 0000"},
+"ddnames":[
+{
+"ddname":"SYSUT2",
+"record_count":"3",
+"id":"103",
+"content":[
+"abc\rdef"
+,
+"ghi"
+,
+"jkl"
+]
+}
+]
+}
+]}
+"""
+
+CR_FRAMED_OUTPUT = """F 1
+J
+A job_id JOB00134
+A ret_code CC 0000
+D
+A ddname SYSUT2
+A record_count 3
+A id 103
+C 3
+abc\rdef
+ghi
+jkl
+"""
+
+
+class OutputModule(object):
+    def __init__(self, output):
+        self.output = output
+        self.args = []
+
+    def run_command(self, args):
+        self.args.append(dict(arg.split("=", 1) for arg in args[1].split(" ")))
+        return 0, self.output, ""
+
+
+@pytest.mark.parametrize(
+    "wire_format,output",
+    [("json", CR_JSON_OUTPUT), ("framed", CR_FRAMED_OUTPUT)],
+    ids=["json", "framed"],
+)
+def test_stream_keeps_carriage_returns(rexx_cache, monkeypatch, wire_format, output):
+    monkeypatch.setattr(job_utils, "Popen", FakeProcess)
+    monkeypatch.setattr(FakeProcess, "output", output.encode("utf-8"))
+    module = OutputModule(output)
+    streamed = _stream_job_output(module, job_id=["JOB00134"], wire_format=wire_format)
+    buffered = job_output(module, job_id="JOB00134", wire_format=wire_format)
+    assert streamed == buffered
+    content = streamed.get("jobs")[0].get("ddnames")[0].get("content")
+    assert content == ["abc\rdef", "ghi", "jkl"]
+
+
+def test_job_output_follow_single_job_id(rexx_cache):
+    module = FakeModule()
+    with pytest.raises(ValueError):
+        job_output(module, job_id=["JOB00134", "JOB00135"], follow={"2": 17})
+    assert module.args == []
+
+
+def test_job_output_follow_single_job(rexx_cache):
+    module = FakeModule()
+    with pytest.raises(ValueError, match="2 jobs matched"):
+        job_output(module, job_id="JOB*", job_name="HELLO", follow={"2": 17})
+    assert module.args[0].get("since") == "2:17"
+
+
+@pytest.mark.parametrize(
+    "lines",
+    [
+        dict(start_line=0),
+        dict(start_line=-5),
+        dict(max_lines=0),
+        dict(max_lines=-1),
+        dict(tail=0),
+        dict(tail=-1),
+    ],
+)
+def test_job_output_line_options_range(rexx_cache, lines):
+    module = FakeModule()
+    with pytest.raises(ValueError, match="must be at least 1"):
+        job_output(module, job_id="JOB00134", **lines)
+    assert module.args == []
+
+
+def test_job_output_name_wildcards_with_job_id(rexx_cache):
+    names = ["JOBXNAME", "AXYB", "JOBNAME", "AB1", "AB"]
+    jobs = [
+        {"job_id": "JOB0000{0}".format(index), "job_name": name}
+        for index, name in enumerate(names)
+    ]
+    module = OutputModule(json.dumps({"jobs": jobs}))
+    found = job_output(module, job_id="JOB*", job_name=["JOB%NAME", "A*B"])
+    assert [job.get("job_name") for job in found.get("jobs")] == [
+        "JOBXNAME",
+        "AXYB",
+        "AB",
+    ]
+    assert module.args[0].get("jobname") == ""
+
+
+def test_job_output_trailing_wildcard_filtered_in_rexx(rexx_cache):
+    module = OutputModule(json.dumps({"jobs": []}))
+    job_output(module, job_id="JOB*", job_name=["HELLO", "PAY*"])
+    assert module.args[0].get("jobname") == "HELLO,PAY*"
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ibm_zos_core.plugins.module_utils.job_cache import JobOutputCache, is_final
+import copy
+import os
+
+
+def make_job(job_id="JOB00134", msg="CC 0000"):
+    ddnames = [
+        {"ddname": "JESMSGLG", "id": "2", "record_count": "2", "content": ["a", "b"]},
+        {"ddname": "SYSPRINT", "id": "102", "record_count": "1", "content": ["c"]},
+        {"ddname": "SYSPRINT", "id": "104", "record_count": "1", "content": ["d"]},
+    ]
+    return {
+        "job_id": job_id,
+        "job_name": "HELLO",
+        "ret_code": {"msg": msg, "code": 0},
+        "ddnames": ddnames,
+        "cursor": {"2": 2, "102": 1, "104": 1},
+    }
+
+
+def test_is_final():
+    assert is_final(make_job(msg="CC 0004"))
+    assert is_final(make_job(msg="ABEND S0C4"))
+    assert is_final(make_job(msg="JCL ERROR"))
+    assert not is_final(make_job(msg=None))
+    assert not is_final(make_job(msg="AC"))
+
+
+def test_cache_round_trip(tmpdir):
+    cache = JobOutputCache(str(tmpdir))
+    job = make_job()
+    cache.put("zos1", [copy.deepcopy(job)])
+    assert cache.get("zos1", ["JOB00134"]) == [job]
+    assert cache.get("zos2", ["JOB00134"]) is None
+
+
+def test_cache_ddname_subset(tmpdir):
+    cache = JobOutputCache(str(tmpdir))
+    cache.put("zos1", [make_job()])
+    jobs = cache.get("zos1", ["JOB00134"], ["SYSPRINT"])
+    assert [dd.get("id") for dd in jobs[0].get("ddnames")] == ["102", "104"]
+    assert jobs[0].get("cursor") == {"102": 1, "104": 1}
+    jobs = cache.get("zos1", ["JOB00134"], ["SYSUT2"])
+    assert jobs[0].get("ddnames") == []
+
+
+def test_cache_partial_job(tmpdir):
+    cache = JobOutputCache(str(tmpdir))
+    job = make_job()
+    job["ddnames"] = job.get("ddnames")[:1]
+    cache.put("zos1", [job], ["JESMSGLG"])
+    assert len(cache.get("zos1", ["JOB00134"], ["JESMSGLG"])[0].get("ddnames")) == 1
+    assert cache.get("zos1", ["JOB00134"], ["SYSPRINT"]) is None
+    assert cache.get("zos1", ["JOB00134"]) is None
+
+
+def test_cache_skips_active_jobs(tmpdir):
+    cache = JobOutputCache(str(tmpdir))
+    cache.put("zos1", [make_job(msg=None)])
+    assert cache.get("zos1", ["JOB00134"]) is None
+
+
+def test_cache_miss_when_any_job_missing(tmpdir):
+    cache = JobOutputCache(str(tmpdir))
+    cache.put("zos1", [make_job()])
+    assert cache.get("zos1", ["JOB00134", "JOB00135"]) is None
+
+
+def test_cache_evicts_least_recently_used(tmpdir):
+    cache = JobOutputCache(str(tmpdir))
+    cache.put("zos1", [make_job("JOB00001")])
+    for name in os.listdir(str(tmpdir)):
+        os.utime(os.path.join(str(tmpdir), name), (1, 1))
+    size = sum(
+        os.path.getsize(os.path.join(str(tmpdir), name))
+        for name in os.listdir(str(tmpdir))
+    )
+    cache.max_size = size + size // 2
+    cache.put("zos1", [make_job("JOB00002")])
+    assert cache.get("zos1", ["JOB00001"]) is None
+    assert cache.get("zos1", ["JOB00002"]) is not None
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ibm_zos_core.plugins.module_utils.job_graph import JobGraph
+import pytest
+
+BATCH = [
+    {"name": "EXTRACT1"},
+    {"name": "EXTRACT2"},
+    {"name": "LOAD", "dependencies": ["EXTRACT1", "EXTRACT2"]},
+    {"dependencies": ["LOAD"]},
+    {"name": "OTHER"},
+]
+
+
+def test_ready_roots():
+    assert JobGraph(BATCH).ready() == [0, 1, 4]
+
+
+def test_ready_after_dependencies_succeed():
+    graph = JobGraph(BATCH)
+    for index in graph.ready():
+        graph.submit(index)
+    assert graph.finish(0, True) == []
+    assert graph.ready() == []
+    graph.finish(1, True)
+    assert graph.ready() == [2]
+
+
+def test_failure_skips_dependents():
+    graph = JobGraph(BATCH)
+    for index in graph.ready():
+        graph.submit(index)
+    assert graph.finish(1, False) == [2, 3]
+    assert graph.reasons[3] == 2
+    assert graph.name(graph.reasons[2]) == "EXTRACT2"
+    graph.finish(0, True)
+    graph.finish(4, True)
+    assert graph.ready() == []
+    assert graph.waiting() == []
+
+
+@pytest.mark.parametrize(
+    "batch",
+    [
+        [{"name": "A"}, {"name": "A"}],
+        [{"name": "A", "dependencies": ["B"]}],
+        [{"name": "A", "dependencies": ["B"]}, {"name": "B", "dependencies": ["A"]}],
+        [{"name": "A", "dependencies": ["A"]}],
+    ],
+)
+def test_invalid_graph(batch):
+    with pytest.raises(ValueError):
+        JobGraph(batch)
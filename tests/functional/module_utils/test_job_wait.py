@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ibm_zos_core.plugins.module_utils import job_wait
+from ibm_zos_core.plugins.module_utils.job_wait import JobWaiter
+from ibm_zos_core.plugins.module_utils.retry import RetryPolicy
+import pytest
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(job_wait, "monotonic", fake.monotonic)
+    monkeypatch.setattr(job_wait, "sleep", fake.sleep)
+    return fake
+
+
+def lister(statuses):
+    statuses = list(statuses)
+
+    def list_jobs(job_id):
+        status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+        if status is None:
+            raise IndexError()
+        return [{"id": job_id, "status": status}]
+
+    return list_jobs
+
+
+def test_wait_backs_off(clock):
+    waiter = JobWaiter(
+        lister(["AC"] * 6 + ["CC"]), interval=0.1, max_interval=0.3, backoff=2
+    )
+    result = waiter.wait("JOB00134", 60)
+    assert clock.sleeps == pytest.approx([0.1, 0.2, 0.3, 0.3, 0.3, 0.3])
+    assert result.get("timed_out") is False
+    assert result.get("job").get("status") == "CC"
+    assert result.get("polls") == 7
+
+
+def test_wait_measures_queue_and_execution(clock):
+    waiter = JobWaiter(
+        lister([None, "INPUT", "AC", "AC", "CC"]), interval=1, backoff=1
+    )
+    result = waiter.wait("JOB00134", 60, start=clock.now - 0.5)
+    assert result.get("visible_time") == pytest.approx(1.5)
+    assert result.get("queue_time") == pytest.approx(2.5)
+    assert result.get("execution_time") == pytest.approx(2)
+    assert result.get("duration") == pytest.approx(4)
+
+
+def test_wait_timeout(clock):
+    waiter = JobWaiter(lister(["AC"]), interval=1, backoff=1)
+    result = waiter.wait("JOB00134", 3)
+    assert result.get("timed_out") is True
+    assert result.get("duration") == pytest.approx(3)
+    assert result.get("execution_time") is None
+
+
+def test_wait_ended_before_first_query(clock):
+    result = JobWaiter(lister(["CC"])).wait("JOB00134", 60)
+    assert result.get("timed_out") is False
+    assert clock.sleeps == []
+    assert result.get("queue_time") is None
+
+
+def test_find(clock):
+    waiter = JobWaiter(lister([None, None, "AC"]), interval=0.1, backoff=1)
+    assert waiter.find("JOB00134")[0].get("status") == "AC"
+    assert len(clock.sleeps) == 2
+
+
+def test_find_not_listed(clock):
+    assert JobWaiter(lister([None]), interval=1, backoff=1).find("JOB00134", 2) is None
+
+
+def test_find_retries_through_policy(clock):
+    retry = RetryPolicy(
+        attempts=2, interval=0.05, retry_on=(IndexError,), sleep=clock.sleep
+    )
+    waiter = JobWaiter(lister([None, None, None, "AC"]), interval=1, retry=retry)
+    assert waiter.find("JOB00134", 10)[0].get("status") == "AC"
+    assert clock.sleeps == pytest.approx([0.05, 1, 0.05])
+    assert waiter.polls == 2
+    assert retry.metrics() == dict(
+        calls=4, retries=2, waited=pytest.approx(0.1), errors={"IndexError": 3}
+    )
+
+
+def test_wait_all_sweeps(clock):
+    ticks = {"JOB00001": ["AC", "CC"], "JOB00002": ["AC", "AC", "ABEND"]}
+    calls = []
+
+    def list_jobs(job_id=None):
+        calls.append(job_id)
+        listed = []
+        for listed_id, statuses in ticks.items():
+            if job_id in (None, listed_id) and statuses:
+                listed.append({"id": listed_id, "status": statuses[0]})
+        if job_id is None:
+            for statuses in ticks.values():
+                if len(statuses) > 1:
+                    statuses.pop(0)
+        return listed
+
+    waiter = JobWaiter(list_jobs, interval=1, backoff=1)
+    results = waiter.wait_all(["JOB00001", "JOB00002", "JOB00003"], 10)
+    assert results.get("JOB00001").get("job").get("status") == "CC"
+    assert results.get("JOB00002").get("job").get("status") == "ABEND"
+    assert results.get("JOB00003").get("timed_out") is True
+    assert results.get("JOB00003").get("job") is None
+    # one sweep per tick, plus a query by ID for the job never listed,
+    # until a single job is left, which is only queried by ID
+    assert calls[:2] == [None, "JOB00003"]
+    assert calls.count(None) == 3
+    assert set(calls[6:]) == set(["JOB00003"])
+
+
+def test_wait_all_any_keeps_timing(clock):
+    ticks = {"JOB00001": ["AC", "CC"], "JOB00002": ["INPUT", "AC", "AC", "CC"]}
+
+    def list_jobs(job_id=None):
+        listed = []
+        for listed_id, statuses in ticks.items():
+            if job_id in (None, listed_id):
+                status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+                listed.append({"id": listed_id, "status": status})
+        return listed
+
+    waiter = JobWaiter(list_jobs, interval=1, backoff=1)
+    start = clock.now
+    results = waiter.wait_all(["JOB00001", "JOB00002"], 10, return_when="any")
+    assert results.get("JOB00001").get("timed_out") is False
+    assert results.get("JOB00002").get("timed_out") is True
+    result = waiter.wait("JOB00002", 10, start=start)
+    assert result.get("timed_out") is False
+    assert result.get("queue_time") == pytest.approx(1)
+    assert result.get("execution_time") == pytest.approx(1)
+    # measured from the first call that waited for the job
+    assert result.get("duration") == pytest.approx(2)
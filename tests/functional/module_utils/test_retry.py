@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ibm_zos_core.plugins.module_utils import retry
+from ibm_zos_core.plugins.module_utils.retry import RetryPolicy
+import pytest
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(retry, "monotonic", fake.monotonic)
+    monkeypatch.setattr(retry, "_sleep", fake.sleep)
+    return fake
+
+
+def failing(errors, value="done"):
+    errors = list(errors)
+
+    def func(*args, **kwargs):
+        if errors:
+            raise errors.pop(0)
+        return value
+
+    return func
+
+
+def test_call_backs_off(clock):
+    policy = RetryPolicy(interval=0.1, max_interval=0.3, backoff=2)
+    assert policy.call(failing([IndexError()] * 4)) == "done"
+    assert clock.sleeps == pytest.approx([0.1, 0.2, 0.3, 0.3])
+    assert policy.metrics() == dict(
+        calls=5, retries=4, waited=pytest.approx(0.9), errors={"IndexError": 4}
+    )
+
+
+def test_call_passes_arguments(clock):
+    policy = RetryPolicy()
+    assert policy.call(lambda a, b=None: (a, b), 1, b=2) == (1, 2)
+    assert policy.metrics().get("retries") == 0
+
+
+def test_attempts_exhausted(clock):
+    policy = RetryPolicy(attempts=3, retry_on=(IndexError,))
+    with pytest.raises(IndexError):
+        policy.call(failing([IndexError()] * 5))
+    assert policy.calls == 3
+    assert len(clock.sleeps) == 2
+
+
+def test_deadline_bounds_wait(clock):
+    policy = RetryPolicy(interval=1, backoff=2, deadline=2.5)
+    with pytest.raises(IndexError):
+        policy.call(failing([IndexError()] * 10))
+    assert clock.sleeps == pytest.approx([1, 1.5])
+    assert policy.waited == pytest.approx(2.5)
+
+
+def test_other_errors_raised_at_once(clock):
+    policy = RetryPolicy(retry_on=(IndexError,))
+    with pytest.raises(ValueError):
+        policy.call(failing([ValueError()]))
+    assert clock.sleeps == []
+    assert policy.metrics().get("errors") == {}
+
+
+def test_classify(clock):
+    policy = RetryPolicy(classify=lambda e: "busy" in str(e))
+    assert policy.call(failing([RuntimeError("busy")])) == "done"
+    with pytest.raises(RuntimeError):
+        policy.call(failing([RuntimeError("not authorized")]))
+    assert policy.metrics().get("errors") == {"RuntimeError": 2}
+    assert policy.retries == 1
+
+
+def test_jitter_stays_in_range():
+    policy = RetryPolicy(interval=1, max_interval=8, backoff=2, jitter=0.25)
+    delays = policy.delays()
+    for interval in [1, 2, 4, 8, 8]:
+        delay = next(delays)
+        assert 0.75 * interval <= delay <= 1.25 * interval
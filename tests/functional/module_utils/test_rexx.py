@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ibm_zos_core.plugins.module_utils.rexx import install_rexx
+import os
+import pytest
+
+SCRIPT = """/* REXX */
+say 'HELLO'
+"""
+
+
+def test_install_rexx(tmpdir):
+    script_path = install_rexx("hello.rexx", SCRIPT, str(tmpdir))
+    assert os.path.basename(script_path) == "hello.rexx"
+    assert os.access(script_path, os.X_OK)
+    with open(script_path, "r") as f:
+        assert f.read() == SCRIPT
+
+
+def test_install_rexx_reuses_installed_script(tmpdir):
+    script_path = install_rexx("hello.rexx", SCRIPT, str(tmpdir))
+    mtime = os.stat(script_path).st_mtime_ns
+    assert install_rexx("hello.rexx", SCRIPT, str(tmpdir)) == script_path
+    assert os.stat(script_path).st_mtime_ns == mtime
+
+
+def test_install_rexx_new_content_new_directory(tmpdir):
+    first = install_rexx("hello.rexx", SCRIPT, str(tmpdir))
+    second = install_rexx("hello.rexx", SCRIPT + "exit 0\n", str(tmpdir))
+    assert os.path.dirname(first) != os.path.dirname(second)
+
+
+def test_install_rexx_replaces_modified_script(tmpdir):
+    script_path = install_rexx("hello.rexx", SCRIPT, str(tmpdir))
+    with open(script_path, "w") as f:
+        f.write("/* REXX */\nsay 'TAMPERED'\n")
+    assert install_rexx("hello.rexx", SCRIPT, str(tmpdir)) == script_path
+    with open(script_path, "r") as f:
+        assert f.read() == SCRIPT
+
+
+def test_install_rexx_environment(tmpdir, monkeypatch):
+    monkeypatch.setenv("ANSIBLE_ZOS_REXX_CACHE", str(tmpdir))
+    script_path = install_rexx("hello.rexx", SCRIPT)
+    assert script_path.startswith(str(tmpdir))
+
+
+def test_install_rexx_rejects_shared_directory(tmpdir):
+    os.chmod(str(tmpdir), 0o777)
+    with pytest.raises(RuntimeError):
+        install_rexx("hello.rexx", SCRIPT, str(tmpdir))
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ibm_zos_core.plugins.module_utils import status_cache
+from ibm_zos_core.plugins.module_utils.status_cache import (
+    JobStatusCache,
+    is_final_status,
+    output_listing,
+)
+import pytest
+
+ACTIVE = {"id": "JOB00001", "name": "RUNNING", "status": "AC", "return": "?"}
+ENDED = {"id": "JOB00002", "name": "ENDED", "status": "CC", "return": "0004"}
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(tmpdir, monkeypatch):
+    monkeypatch.setenv("ANSIBLE_ZOS_REXX_CACHE", str(tmpdir.mkdir("cache")))
+    fake = FakeClock()
+    monkeypatch.setattr(status_cache, "time", fake.time)
+    return fake
+
+
+def test_final_status():
+    assert is_final_status("CC")
+    assert is_final_status("ABENDU0100")
+    assert is_final_status("JCLERR")
+    assert is_final_status("CANCELED")
+    assert not is_final_status("AC")
+    assert not is_final_status("INPUT")
+    assert not is_final_status("HELD")
+    assert not is_final_status("?")
+    assert not is_final_status(None)
+
+
+def test_ttl_applies_to_active_jobs(clock):
+    JobStatusCache(ttl=5).put([ACTIVE, ENDED])
+    cache = JobStatusCache(ttl=5)
+    clock.now += 5
+    assert cache.get("JOB00001") == ACTIVE
+    clock.now += 1
+    assert cache.get("JOB00001") is None
+    clock.now += 3600
+    assert cache.get("JOB00002") == ENDED
+    assert cache.get("JOB00003") is None
+    assert cache.metrics() == dict(hits=2, misses=2)
+
+
+def test_ttl_applies_to_unknown_statuses(clock):
+    cache = JobStatusCache(ttl=5)
+    cache.put([dict(ENDED, status="?"), dict(ACTIVE, status="HELD")])
+    clock.now += 6
+    assert cache.get("JOB00001") is None
+    assert cache.get("JOB00002") is None
+
+
+def test_get_all(clock):
+    cache = JobStatusCache()
+    cache.put([ENDED])
+    assert cache.get_all(["JOB00002"]) == [ENDED]
+    assert cache.get_all(["JOB00002", "JOB00001"]) is None
+
+
+def test_lister_serves_cached_ids(clock):
+    calls = []
+
+    def list_jobs(**kwargs):
+        calls.append(kwargs)
+        return [ENDED, ACTIVE]
+
+    cached_list_jobs = JobStatusCache().lister(list_jobs)
+    assert cached_list_jobs() == [ENDED, ACTIVE]
+    assert cached_list_jobs(job_id="JOB00002") == [ENDED]
+    assert cached_list_jobs(job_id="JOB00001") == [ACTIVE]
+    clock.now += 60
+    cached_list_jobs(job_id="JOB00001")
+    assert calls == [{}, {"job_id": "JOB00001"}]
+
+
+def test_recorder_stores_ended_jobs_only(clock):
+    calls = []
+
+    def list_jobs(**kwargs):
+        calls.append(kwargs)
+        return [ENDED, ACTIVE]
+
+    cache = JobStatusCache()
+    cache.put([ACTIVE])
+    recorded_list_jobs = cache.recorder(list_jobs)
+    assert recorded_list_jobs(job_id="JOB00001") == [ENDED, ACTIVE]
+    assert recorded_list_jobs(job_id="JOB00001") == [ENDED, ACTIVE]
+    assert len(calls) == 2
+    clock.now += 60
+    assert cache.get("JOB00002") == ENDED
+    assert cache.get("JOB00001") is None
+
+
+def test_max_entries_keeps_latest(clock):
+    cache = JobStatusCache(max_entries=2)
+    for number in range(3):
+        clock.now += 1
+        cache.put([dict(ENDED, id="JOB0000{0}".format(number))])
+    assert cache.get("JOB00000") is None
+    assert cache.get("JOB00002") is not None
+
+
+def test_output_listing():
+    def job(msg):
+        return dict(job_id="JOB00001", job_name="J", owner="O", ret_code=dict(msg=msg))
+
+    assert output_listing(job("CC 0008")).get("return") == "0008"
+    assert output_listing(job("CC")).get("return") == "?"
+    assert output_listing(job("ABEND S0C4")).get("status") == "ABEND"
+    assert output_listing(job("ABEND U0100")).get("status") == "ABENDU0100"
+    assert output_listing(job("JCL ERROR")).get("status") == "JCLERR"
+    assert output_listing(job("")) is None
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ibm_zos_core.plugins.module_utils import timing as timing_module
+from ibm_zos_core.plugins.module_utils.timing import Timing
+import pytest
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return 1600000000.0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(timing_module, "monotonic", fake.monotonic)
+    monkeypatch.setattr(timing_module, "time", fake.time)
+    return fake
+
+
+def test_phases(clock):
+    timing = Timing()
+    clock.now += 1
+    with timing.phase("submit"):
+        clock.now += 0.25
+    with timing.phase("submit"):
+        clock.now += 0.5
+    timing.add("wait", 2)
+    result = timing.result()
+    assert result.get("module_start") == 1600000000.0
+    assert result.get("submit") == pytest.approx(0.75)
+    assert result.get("wait") == 2
+    assert result.get("total") == pytest.approx(1.75)
+    assert timing.result_events() is None
+
+
+def test_phase_measured_on_error(clock):
+    timing = Timing()
+    with pytest.raises(RuntimeError):
+        with timing.phase("output_retrieval"):
+            clock.now += 3
+            raise RuntimeError()
+    assert timing.result().get("output_retrieval") == pytest.approx(3)
+
+
+def test_events_ordered(clock):
+    timing = Timing(events=True)
+    clock.now += 2
+    with timing.phase("wait"):
+        clock.now += 1
+    timing.event("running", 101.0, job_id="JOB00134")
+    events = timing.result_events()
+    assert [event.get("event") for event in events] == [
+        "module_start",
+        "running",
+        "wait_start",
+        "wait_end",
+    ]
+    assert events[1] == {
+        "event": "running",
+        "time": 1600000001.0,
+        "elapsed": 1.0,
+        "job_id": "JOB00134",
+    }
@@ -8,6 +8,7 @@ from __future__ import absolute_import, division, print_function
 __metaclass__ = type
 
 from shellescape import quote
+import os
 import tempfile
 
 
@@ -76,3 +77,250 @@ def test_zos_job_output_job_exists(ansible_zos_module):
     for result in results.contacted.values():
         assert result.get("changed") is False
         assert result.get("jobs") is not None
+
+
+def test_zos_job_output_spill_to_file(ansible_zos_module):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(
+        cmd="echo {0} > {1}/SAMPLE".format(quote(JCL_FILE_CONTENTS), TEMP_PATH)
+    )
+    hosts.all.zos_job_submit(
+        src="{0}/SAMPLE".format(TEMP_PATH), location="USS", wait=True, volume=None
+    )
+    results = hosts.all.zos_job_output(
+        job_name="SAMPLE", spill_threshold=0, spill_dir=TEMP_PATH
+    )
+    for result in results.contacted.values():
+        assert result.get("changed") is False
+        for job in result.get("jobs"):
+            for dd in job.get("ddnames"):
+                assert dd.get("content") == []
+                assert dd.get("content_path").startswith(TEMP_PATH)
+    hosts.all.file(path=TEMP_PATH, state="absent")
+
+
+def test_zos_job_output_ddname_list(ansible_zos_module):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(
+        cmd="echo {0} > {1}/SAMPLE".format(quote(JCL_FILE_CONTENTS), TEMP_PATH)
+    )
+    hosts.all.zos_job_submit(
+        src="{0}/SAMPLE".format(TEMP_PATH), location="USS", wait=True, volume=None
+    )
+    hosts.all.file(path=TEMP_PATH, state="absent")
+    results = hosts.all.zos_job_output(
+        job_name="SAMPLE", ddname=["JESMSGLG", "SYSUT2"]
+    )
+    for result in results.contacted.values():
+        assert result.get("changed") is False
+        for job in result.get("jobs"):
+            ddnames = [dd.get("ddname") for dd in job.get("ddnames")]
+            assert set(ddnames) == set(["JESMSGLG", "SYSUT2"])
+
+
+def test_zos_job_output_tail(ansible_zos_module):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(
+        cmd="echo {0} > {1}/SAMPLE".format(quote(JCL_FILE_CONTENTS), TEMP_PATH)
+    )
+    hosts.all.zos_job_submit(
+        src="{0}/SAMPLE".format(TEMP_PATH), location="USS", wait=True, volume=None
+    )
+    hosts.all.file(path=TEMP_PATH, state="absent")
+    results = hosts.all.zos_job_output(job_name="SAMPLE", ddname="JESMSGLG", tail=2)
+    for result in results.contacted.values():
+        for job in result.get("jobs"):
+            dd = job.get("ddnames")[0]
+            assert len(dd.get("content")) == 2
+            assert dd.get("first_line") == int(dd.get("record_count")) - 1
+            assert dd.get("next_line") is None
+
+
+def test_zos_job_output_paging(ansible_zos_module):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(
+        cmd="echo {0} > {1}/SAMPLE".format(quote(JCL_FILE_CONTENTS), TEMP_PATH)
+    )
+    hosts.all.zos_job_submit(
+        src="{0}/SAMPLE".format(TEMP_PATH), location="USS", wait=True, volume=None
+    )
+    hosts.all.file(path=TEMP_PATH, state="absent")
+    results = hosts.all.zos_job_output(
+        job_name="SAMPLE", ddname="JESMSGLG", start_line=2, max_lines=3
+    )
+    for result in results.contacted.values():
+        for job in result.get("jobs"):
+            dd = job.get("ddnames")[0]
+            assert len(dd.get("content")) == 3
+            assert dd.get("first_line") == 2
+            assert dd.get("next_line") == 5
+
+
+def test_zos_job_output_follow(ansible_zos_module):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(
+        cmd="echo {0} > {1}/SAMPLE".format(quote(JCL_FILE_CONTENTS), TEMP_PATH)
+    )
+    submitted = hosts.all.zos_job_submit(
+        src="{0}/SAMPLE".format(TEMP_PATH), location="USS", wait=True, volume=None
+    )
+    hosts.all.file(path=TEMP_PATH, state="absent")
+    for result in submitted.contacted.values():
+        job_id = result.get("jobs")[0].get("job_id")
+    first = hosts.all.zos_job_output(job_id=job_id)
+    for result in first.contacted.values():
+        cursor = result.get("jobs")[0].get("cursor")
+    results = hosts.all.zos_job_output(job_id=job_id, follow=cursor)
+    for result in results.contacted.values():
+        job = result.get("jobs")[0]
+        assert job.get("cursor") == cursor
+        for dd in job.get("ddnames"):
+            assert dd.get("content") == []
+
+
+def test_zos_job_output_job_id_list(ansible_zos_module):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(
+        cmd="echo {0} > {1}/SAMPLE".format(quote(JCL_FILE_CONTENTS), TEMP_PATH)
+    )
+    job_ids = []
+    for i in range(2):
+        results = hosts.all.zos_job_submit(
+            src="{0}/SAMPLE".format(TEMP_PATH), location="USS", wait=True, volume=None
+        )
+        for result in results.contacted.values():
+            job_ids.append(result.get("jobs")[0].get("job_id"))
+    hosts.all.file(path=TEMP_PATH, state="absent")
+    results = hosts.all.zos_job_output(job_id=job_ids, ddname="SYSUT2")
+    for result in results.contacted.values():
+        assert result.get("changed") is False
+        assert len(result.get("jobs")) == 2
+        for job_id in job_ids:
+            job = result.get("jobs")[result.get("job_index").get(job_id)]
+            assert job.get("job_id") == job_id
+
+
+def test_zos_job_output_cache(ansible_zos_module, tmpdir):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(
+        cmd="echo {0} > {1}/SAMPLE".format(quote(JCL_FILE_CONTENTS), TEMP_PATH)
+    )
+    results = hosts.all.zos_job_submit(
+        src="{0}/SAMPLE".format(TEMP_PATH), location="USS", wait=True, volume=None
+    )
+    hosts.all.file(path=TEMP_PATH, state="absent")
+    for result in results.contacted.values():
+        job_id = result.get("jobs")[0].get("job_id")
+    cached = []
+    for i in range(2):
+        results = hosts.all.zos_job_output(
+            job_id=job_id, cache=True, cache_dir=str(tmpdir)
+        )
+        for result in results.contacted.values():
+            assert result.get("jobs")[0].get("job_id") == job_id
+            cached.append(result.get("cached"))
+    assert cached == [False, True]
+
+
+def test_zos_job_output_wire_format(ansible_zos_module):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(
+        cmd="echo {0} > {1}/SAMPLE".format(quote(JCL_FILE_CONTENTS), TEMP_PATH)
+    )
+    results = hosts.all.zos_job_submit(
+        src="{0}/SAMPLE".format(TEMP_PATH),
+        location="USS",
+        wait=True,
+        wire_format="framed",
+    )
+    hosts.all.file(path=TEMP_PATH, state="absent")
+    for result in results.contacted.values():
+        job_id = result.get("jobs")[0].get("job_id")
+        assert result.get("jobs")[0].get("ret_code").get("code") == 0
+    outputs = []
+    for wire_format in ["json", "framed"]:
+        results = hosts.all.zos_job_output(job_id=job_id, wire_format=wire_format)
+        outputs.extend(result.get("jobs") for result in results.contacted.values())
+    assert outputs[0] == outputs[1]
+
+
+def test_zos_job_output_compress(ansible_zos_module):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(
+        cmd="echo {0} > {1}/SAMPLE".format(quote(JCL_FILE_CONTENTS), TEMP_PATH)
+    )
+    results = hosts.all.zos_job_submit(
+        src="{0}/SAMPLE".format(TEMP_PATH), location="USS", wait=True, volume=None
+    )
+    hosts.all.file(path=TEMP_PATH, state="absent")
+    for result in results.contacted.values():
+        job_id = result.get("jobs")[0].get("job_id")
+    results = hosts.all.zos_job_output(job_id=job_id)
+    expected = [result.get("jobs") for result in results.contacted.values()]
+    results = hosts.all.zos_job_output(job_id=job_id, compress="gzip")
+    for result in results.contacted.values():
+        assert result.get("jobs_compressed") is None
+        assert result.get("jobs") == expected[0]
+
+
+def test_zos_job_output_dest_uss(ansible_zos_module):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(
+        cmd="echo {0} > {1}/SAMPLE".format(quote(JCL_FILE_CONTENTS), TEMP_PATH)
+    )
+    hosts.all.zos_job_submit(
+        src="{0}/SAMPLE".format(TEMP_PATH), location="USS", wait=True, volume=None
+    )
+    results = hosts.all.zos_job_output(
+        job_name="SAMPLE", dest="{0}/logs".format(TEMP_PATH)
+    )
+    for result in results.contacted.values():
+        assert result.get("changed") is False
+        for job in result.get("jobs"):
+            for dd in job.get("ddnames"):
+                assert dd.get("content") == []
+                assert dd.get("content_path").startswith(TEMP_PATH + "/logs/")
+    hosts.all.file(path=TEMP_PATH, state="absent")
+
+
+def test_zos_job_output_dest_not_created(ansible_zos_module):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(cmd="touch {0}/SAMPLE".format(TEMP_PATH))
+    results = hosts.all.zos_job_output(
+        job_name="SAMPLE", dest="{0}/SAMPLE/logs".format(TEMP_PATH)
+    )
+    for result in results.contacted.values():
+        assert result.get("failed") is True
+        assert result.get("msg") is not None
+        assert result.get("module_stderr") is None
+    hosts.all.file(path=TEMP_PATH, state="absent")
+
+
+def test_zos_job_output_local_dest(ansible_zos_module, tmpdir):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(
+        cmd="echo {0} > {1}/SAMPLE".format(quote(JCL_FILE_CONTENTS), TEMP_PATH)
+    )
+    results = hosts.all.zos_job_submit(
+        src="{0}/SAMPLE".format(TEMP_PATH), location="USS", wait=True, volume=None
+    )
+    hosts.all.file(path=TEMP_PATH, state="absent")
+    for result in results.contacted.values():
+        job_id = result.get("jobs")[0].get("job_id")
+    results = hosts.all.zos_job_output(job_id=job_id, local_dest=str(tmpdir))
+    for result in results.contacted.values():
+        for dd in result.get("jobs")[0].get("ddnames"):
+            assert dd.get("content") == []
+            assert tmpdir.join(os.path.basename(dd.get("content_path"))).check()
@@ -25,3 +25,50 @@ def test_zos_job_query_func(ansible_zos_module):
     for result in results.contacted.values():
         assert result.get("changed") is False
         assert result.get("jobs") is not None
+
+
+def test_zos_job_query_patterns(ansible_zos_module):
+    hosts = ansible_zos_module
+    results = hosts.all.zos_job_query(job_name=["*", "NOSUCH*"], owner="*")
+    for result in results.contacted.values():
+        assert result.get("changed") is False
+        jobs_by_pattern = result.get("jobs_by_pattern")
+        assert jobs_by_pattern.get("NOSUCH*") == []
+        assert len(jobs_by_pattern.get("*")) == len(result.get("jobs"))
+
+
+def test_zos_job_query_limit_fields(ansible_zos_module):
+    hosts = ansible_zos_module
+    results = hosts.all.zos_job_query(
+        job_name="*", owner="*", limit=2, fields=["job_id", "ret_code"]
+    )
+    for result in results.contacted.values():
+        assert len(result.get("jobs")) <= 2
+        assert result.get("total") >= len(result.get("jobs"))
+        for job in result.get("jobs"):
+            assert sorted(job.keys()) == ["job_id", "ret_code"]
+
+
+def test_zos_job_query_wait_for_all(ansible_zos_module):
+    hosts = ansible_zos_module
+    hosts.all.file(path="/tmp/ansible/jcl", state="directory")
+    hosts.all.shell(
+        cmd="printf '%s\\n' '//HELLO    JOB (T043JM,JM00,1,0,0,0),CLASS=R' "
+        "'//STEP0001 EXEC PGM=IEFBR14' > /tmp/ansible/jcl/SAMPLE"
+    )
+    job_ids = []
+    for _ in range(2):
+        submitted = hosts.all.zos_job_submit(
+            src="/tmp/ansible/jcl/SAMPLE", location="USS", wait=False
+        )
+        for result in submitted.contacted.values():
+            job_ids.append(result.get("jobs")[0].get("job_id"))
+    results = hosts.all.zos_job_query(job_id=job_ids, wait_for="all")
+    hosts.all.file(path="/tmp/ansible/jcl", state="absent")
+    for result in results.contacted.values():
+        assert result.get("timed_out") is False
+        assert sorted(job.get("job_id") for job in result.get("jobs")) == sorted(
+            job_ids
+        )
+        for job in result.get("jobs"):
+            assert job.get("ret_code").get("msg") != "null"
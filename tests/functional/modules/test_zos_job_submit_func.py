@@ -90,6 +90,176 @@ def test_job_submit_LOCAL(ansible_zos_module):
         assert result.get("changed") is True
 
 
+def test_job_submit_LOCAL_large(ansible_zos_module):
+    # larger than the JCL passed in the module arguments, so it is copied
+    comments = "//* {0}\n".format("*" * 66) * 16000
+    tmp_file = tempfile.NamedTemporaryFile(delete=False)
+    with open(tmp_file.name, "w") as f:
+        f.write(JCL_FILE_CONTENTS.replace("//STEP0001", comments + "//STEP0001"))
+    hosts = ansible_zos_module
+    results = hosts.all.zos_job_submit(
+        src=tmp_file.name, location="LOCAL", wait=True, target_encoding="IBM-037"
+    )
+    os.remove(tmp_file.name)
+    for result in results.contacted.values():
+        assert result.get("jobs")[0].get("ret_code").get("code") == 0
+        assert result.get("changed") is True
+
+
+def test_job_submit_LOCAL_jcl_cache(ansible_zos_module):
+    comments = "//* {0}\n".format("*" * 66) * 16000
+    tmp_file = tempfile.NamedTemporaryFile(delete=False)
+    with open(tmp_file.name, "w") as f:
+        f.write(JCL_FILE_CONTENTS.replace("//STEP0001", comments + "//STEP0001"))
+    hosts = ansible_zos_module
+    # the first run uploads the JCL, the second submits the cached copy
+    for attempt in range(2):
+        results = hosts.all.zos_job_submit(
+            src=tmp_file.name, location="LOCAL", wait=True, jcl_cache=True
+        )
+        for result in results.contacted.values():
+            assert result.get("jobs")[0].get("ret_code").get("code") == 0
+            assert result.get("changed") is True
+    os.remove(tmp_file.name)
+
+
+def test_job_submit_LOCAL_encoding_error(ansible_zos_module):
+    tmp_file = tempfile.NamedTemporaryFile(delete=False)
+    with open(tmp_file.name, "wb") as f:
+        jcl = JCL_FILE_CONTENTS.replace("HELLO, WORLD", "HELLO, \u20ac")
+        f.write(jcl.encode("utf-8"))
+    hosts = ansible_zos_module
+    results = hosts.all.zos_job_submit(src=tmp_file.name, location="LOCAL")
+    os.remove(tmp_file.name)
+    for result in results.contacted.values():
+        assert result.get("failed") is True
+        assert result.get("jobs") is None
+
+
+def test_job_submit_USS_metadata_only(ansible_zos_module):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(
+        cmd="echo {0} > {1}/SAMPLE".format(quote(JCL_FILE_CONTENTS), TEMP_PATH)
+    )
+    results = hosts.all.zos_job_submit(
+        src="{0}/SAMPLE".format(TEMP_PATH),
+        location="USS",
+        wait=True,
+        return_output=False,
+    )
+    hosts.all.file(path=TEMP_PATH, state="absent")
+    for result in results.contacted.values():
+        assert result.get("jobs")[0].get("ret_code").get("code") == 0
+        ddnames = result.get("jobs")[0].get("ddnames")
+        assert len(ddnames) > 0
+        for dd in ddnames:
+            assert dd.get("record_count") is not None
+            assert dd.get("content") == []
+
+
+def test_job_submit_USS_step_summary(ansible_zos_module):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(
+        cmd="echo {0} > {1}/SAMPLE".format(quote(JCL_FILE_CONTENTS), TEMP_PATH)
+    )
+    results = hosts.all.zos_job_submit(
+        src="{0}/SAMPLE".format(TEMP_PATH),
+        location="USS",
+        wait=True,
+        return_output=False,
+        step_summary=True,
+        max_rc=0,
+    )
+    hosts.all.file(path=TEMP_PATH, state="absent")
+    for result in results.contacted.values():
+        assert result.get("failed") is not True
+        steps = result.get("jobs")[0].get("steps")
+        assert steps[0].get("stepname") == "STEP0001"
+        assert steps[0].get("rc") == 0
+
+
+def test_job_submit_USS_timing(ansible_zos_module):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(
+        cmd="echo {0} > {1}/SAMPLE".format(quote(JCL_FILE_CONTENTS), TEMP_PATH)
+    )
+    results = hosts.all.zos_job_submit(
+        src="{0}/SAMPLE".format(TEMP_PATH),
+        location="USS",
+        wait=True,
+        timing_events=True,
+    )
+    hosts.all.file(path=TEMP_PATH, state="absent")
+    for result in results.contacted.values():
+        timing = result.get("timing")
+        for key in ["submit", "visible_time", "wait", "output_retrieval", "total"]:
+            assert timing.get(key) >= 0
+        assert timing.get("remote_executions") == 1
+        assert timing.get("action_total") >= timing.get("total")
+        events = [event.get("event") for event in result.get("timing_events")]
+        assert events[0] == "action_start"
+        assert events[-1] == "action_end"
+        assert events.index("submit_end") < events.index("ended")
+
+
+def test_job_submit_USS_batch(ansible_zos_module):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(
+        cmd="echo {0} > {1}/SAMPLE".format(quote(JCL_FILE_CONTENTS), TEMP_PATH)
+    )
+    results = hosts.all.zos_job_submit(
+        batch=[
+            dict(src="{0}/SAMPLE".format(TEMP_PATH), location="USS", max_rc=0),
+            dict(src="{0}/SAMPLE".format(TEMP_PATH), location="USS"),
+            dict(src="{0}/MISSING".format(TEMP_PATH), location="USS"),
+        ],
+        wait=True,
+    )
+    hosts.all.file(path=TEMP_PATH, state="absent")
+    for result in results.contacted.values():
+        assert result.get("failed") is True
+        batch = result.get("batch")
+        assert [item.get("failed") for item in batch] == [False, False, True]
+        assert len(result.get("jobs")) == 2
+        for item, job in zip(batch, result.get("jobs")):
+            assert item.get("job_id") == job.get("job_id")
+            assert item.get("timed_out") is False
+            assert job.get("ret_code").get("code") == 0
+
+
+def test_job_submit_USS_batch_dependencies(ansible_zos_module):
+    hosts = ansible_zos_module
+    hosts.all.file(path=TEMP_PATH, state="directory")
+    hosts.all.shell(
+        cmd="echo {0} > {1}/SAMPLE".format(quote(JCL_FILE_CONTENTS), TEMP_PATH)
+    )
+    sample = "{0}/SAMPLE".format(TEMP_PATH)
+    results = hosts.all.zos_job_submit(
+        batch=[
+            dict(name="FIRST", src=sample, location="USS", max_rc=0),
+            dict(name="MISSING", src=TEMP_PATH + "/MISSING", location="USS"),
+            dict(src=sample, location="USS", dependencies=["FIRST"]),
+            dict(src=sample, location="USS", dependencies=["FIRST", "MISSING"]),
+        ],
+        wait=True,
+    )
+    hosts.all.file(path=TEMP_PATH, state="absent")
+    for result in results.contacted.values():
+        assert result.get("failed") is True
+        first, missing, second, skipped = result.get("batch")
+        assert first.get("rc") == 0
+        assert missing.get("failed") is True
+        assert second.get("failed") is False
+        assert second.get("rc") == 0
+        assert skipped.get("skipped") is True
+        assert skipped.get("job_id") is None
+        assert len(result.get("jobs")) == 2
+
+
 # * currently don't have volume support from ZOAU python API, so this will not be reproduceable
 # * in CI/CD testing environment (for now)
 # def test_job_submit_PDS_volume(ansible_zos_module):
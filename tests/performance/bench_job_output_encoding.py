@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+"""Compare the JSON and framed job output encodings on synthetic spool files.
+
+The REXX script cannot run off z/OS, so both encodings are produced by
+Python code writing exactly what the REXX script writes for each of them.
+Encoding times therefore only show the relative amount of work per line,
+decoding times are those of the code used by job_output.
+
+Run from the directory containing ibm_zos_core:
+    python -m ibm_zos_core.tests.performance.bench_job_output_encoding --lines 1000000
+"""
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import argparse
+import io
+import json
+import random
+import time
+
+from ibm_zos_core.plugins.module_utils.job import (
+    _iter_job_framed_lines,
+    _iter_job_json_lines,
+    _iter_lines,
+    _SpoolWriter,
+)
+
+DDNAMES = ["JESMSGLG", "JESJCL", "JESYSMSG", "SYSPRINT", "SYSOUT"]
+
+
+def synthetic_spool(lines, quote_ratio, seed=0):
+    """Build a job whose ddnames hold fixed-width print lines, some with quotes."""
+    rng = random.Random(seed)
+    ddnames = []
+    per_dd = lines // len(DDNAMES)
+    for index, ddname in enumerate(DDNAMES):
+        content = []
+        for number in range(per_dd):
+            line = " {0:>9} {1} STEP{2:04d} RECORD {3:>8}".format(
+                number, ddname, index, rng.randint(0, 99999999)
+            )
+            if rng.random() < quote_ratio:
+                line += ' PARM="A","B" VALUE="{0}"'.format(rng.randint(0, 999))
+            content.append(line.ljust(132))
+        ddnames.append(
+            dict(
+                ddname=ddname,
+                record_count=str(per_dd),
+                id=str(index + 2),
+                stepname="STEP{0:04d}".format(index),
+                procstep="",
+                byte_count=str(sum(len(line) for line in content)),
+                first_line="1",
+                content=content,
+            )
+        )
+    return dict(
+        job_id="JOB00134",
+        job_name="HELLO",
+        subsystem="STL1",
+        owner="OMVSADM",
+        ret_code=dict(msg="CC 0000"),
+        ddnames=ddnames,
+        **{"class": "R", "content_type": "JOB"}
+    )
+
+
+def escape_double_quote(string):
+    """The escapeDoubleQuote REXX routine."""
+    out = ""
+    while '"' in string:
+        prefix, string = string.split('"', 1)
+        out = out + prefix + '\\"'
+    return out + string
+
+
+def encode_json(job):
+    """Write a job the way the JSON branch of the REXX script does."""
+    says = ['{"jobs":[', "{"]
+    for key in ("job_id", "job_name", "subsystem", "owner"):
+        says.append('"{0}":"{1}",'.format(key, job[key]))
+    says.append('"ret_code":{{"msg":"{0}"}},'.format(job["ret_code"]["msg"]))
+    for key in ("class", "content_type"):
+        says.append('"{0}":"{1}",'.format(key, job[key]))
+    says.append('"ddnames":[')
+    for index, dd in enumerate(job["ddnames"]):
+        if index:
+            says.append(",")
+        says.append("{")
+        for key in ("ddname", "record_count", "id", "stepname", "procstep"):
+            says.append('"{0}":"{1}",'.format(key, dd[key]))
+        says.append('"byte_count":"{0}",'.format(dd["byte_count"]))
+        says.append('"first_line":"{0}",'.format(dd["first_line"]))
+        says.append('"content":[')
+        for number, line in enumerate(dd["content"]):
+            if number:
+                says.append(",")
+            says.append('"' + escape_double_quote(line) + '"')
+        says.append("]")
+        says.append("}")
+    says.extend(["]", "}", "]}"])
+    return "\n".join(says) + "\n"
+
+
+def encode_framed(job):
+    """Write a job the way the framed branch of the REXX script does."""
+    says = ["F 1", "J"]
+    for key in ("job_id", "job_name", "subsystem", "owner"):
+        says.append("A {0} {1}".format(key, job[key]))
+    says.append("A ret_code {0}".format(job["ret_code"]["msg"]))
+    for key in ("class", "content_type"):
+        says.append("A {0} {1}".format(key, job[key]))
+    for dd in job["ddnames"]:
+        says.append("D")
+        for key in (
+            "ddname",
+            "record_count",
+            "id",
+            "stepname",
+            "procstep",
+            "byte_count",
+            "first_line",
+        ):
+            says.append("A {0} {1}".format(key, dd[key]))
+        says.append("C {0}".format(len(dd["content"])))
+        says.extend(dd["content"])
+    return "\n".join(says) + "\n"
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def decode_json_buffered(out):
+    return json.loads(out, strict=False).get("jobs")
+
+
+def decode_json_streamed(out):
+    return list(_iter_job_json_lines(_iter_lines(io.StringIO(out)), _SpoolWriter()))
+
+
+def decode_framed_buffered(out):
+    return list(_iter_job_framed_lines(iter(out.split("\n")), _SpoolWriter()))
+
+
+def decode_framed_streamed(out):
+    return list(_iter_job_framed_lines(_iter_lines(io.StringIO(out)), _SpoolWriter()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=500000)
+    parser.add_argument("--quote-ratio", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    job = synthetic_spool(args.lines, args.quote_ratio)
+    expected = [job]
+    rows = []
+    for name, encode, decoders in (
+        ("json", encode_json, (decode_json_buffered, decode_json_streamed)),
+        ("framed", encode_framed, (decode_framed_buffered, decode_framed_streamed)),
+    ):
+        encoded, encode_time = timed(encode, job)
+        for decode in decoders:
+            best = None
+            for dummy in range(args.repeat):
+                jobs, decode_time = timed(decode, encoded)
+                best = decode_time if best is None else min(best, decode_time)
+            if jobs != expected:
+                raise AssertionError("{0} did not decode to the job".format(decode))
+            rows.append((name, decode.__name__, len(encoded), encode_time, best))
+
+    print(
+        "{0} lines, {1:.0%} with quotes".format(
+            args.lines - args.lines % len(DDNAMES), args.quote_ratio
+        )
+    )
+    print(
+        "{0:<8} {1:<24} {2:>12} {3:>12} {4:>12}".format(
+            "format", "decoder", "bytes", "encode s", "decode s"
+        )
+    )
+    for row in rows:
+        print("{0:<8} {1:<24} {2:>12} {3:>12.3f} {4:>12.3f}".format(*row))
+
+
+if __name__ == "__main__":
+    main()
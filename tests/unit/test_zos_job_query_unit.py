@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+IMPORT_NAME = "ibm_zos_core.plugins.modules.zos_job_query"
+
+JOBS = [
+    {"id": "JOB00001", "name": "PAYROLL1", "owner": "BATCHID", "status": "CC"},
+    {"id": "JOB00002", "name": "PAYDAY", "owner": "BROWNAD", "status": "AC"},
+    {"id": "JOB00003", "name": "NIGHTLY", "owner": "BATCHID", "status": "CC"},
+    {"id": "STC00004", "name": "PAYROLL2", "owner": "STCUSER", "status": "AC"},
+]
+
+
+@pytest.fixture
+def query(zos_import_mocker):
+    mocker, importer = zos_import_mocker
+    return importer(IMPORT_NAME)
+
+
+def test_match_jobs_groups_by_pattern(query):
+    jobs, by_pattern = query.match_jobs(
+        JOBS, job_names=["PAY*", "payroll*", "MISSING"], owners=["BATCH*", "BROWNAD"]
+    )
+    assert [job.get("id") for job in jobs] == ["JOB00001", "JOB00002"]
+    assert by_pattern == {
+        "PAY*": ["JOB00001", "JOB00002"],
+        "payroll*": ["JOB00001"],
+        "MISSING": [],
+    }
+
+
+def test_match_jobs_by_id(query):
+    jobs, by_pattern = query.match_jobs(JOBS, job_ids=["JOB00003", "STC00004"])
+    assert [job.get("id") for job in jobs] == ["JOB00003", "STC00004"]
+    assert by_pattern == {"JOB00003": ["JOB00003"], "STC00004": ["STC00004"]}
+
+
+def test_query_jobs_single_scan(query):
+    query.Jobs.list.return_value = JOBS
+    params = dict(job_name=["PAY*", "NIGHTLY"], owner=["BATCHID"], job_id=None)
+    assert query.query_jobs(params) == JOBS
+    query.Jobs.list.assert_called_once_with(owner="BATCHID", job_name="*")
+
+
+def test_query_jobs_single_id(query):
+    query.Jobs.list.return_value = JOBS[:1]
+    query.query_jobs(dict(job_name=["*"], owner=None, job_id=["JOB00001"]))
+    query.Jobs.list.assert_called_once_with(job_id="JOB00001")
+
+
+def test_validate_each_job_name(query):
+    with pytest.raises(RuntimeError):
+        query.validate_arguments(
+            dict(job_name=["PAY*", "1BAD"], owner=None, job_id=None)
+        )
+
+
+def filters(**params):
+    for name in [
+        "status",
+        "min_rc",
+        "max_rc",
+    ]:
+        params.setdefault(name, None)
+    return params
+
+
+def test_filter_status_and_rc(query):
+    jobs_raw = [
+        {"id": "JOB00001", "status": "CC", "return": "0000"},
+        {"id": "JOB00002", "status": "CC", "return": "0008"},
+        {"id": "JOB00003", "status": "ABENDU0100", "return": "?"},
+        {"id": "JOB00004", "status": "AC", "return": "?"},
+    ]
+
+    def ids(**params):
+        return [job.get("id") for job in query.filter_jobs(jobs_raw, filters(**params))]
+
+    assert ids(status=["ABEND", "ACTIVE"]) == ["JOB00003", "JOB00004"]
+    assert ids(min_rc=4) == ["JOB00002"]
+    assert ids(max_rc=4) == ["JOB00001"]
+
+
+def test_page_and_project(query):
+    jobs = [{"job_id": job.get("id"), "owner": job.get("owner")} for job in JOBS]
+    page = query.project_jobs(query.page_jobs(jobs, 1, 2), ["job_id"])
+    assert page == [{"job_id": "JOB00002"}, {"job_id": "JOB00003"}]
+    assert query.page_jobs(jobs, 3) == jobs[3:]
+
+
+def test_query_jobs_retries_index_error(query):
+    query.Jobs.list.side_effect = [IndexError(), IndexError(), JOBS[:1]]
+    retry = query.RetryPolicy(retry_on=(IndexError,), sleep=lambda seconds: None)
+    assert query.query_jobs(dict(job_id=["JOB00001"]), retry) == JOBS[:1]
+    assert retry.metrics().get("calls") == 3
+    assert retry.metrics().get("errors") == {"IndexError": 2}
+
+
+class FakeStatusCache(object):
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.put_jobs = []
+
+    def get_all(self, job_ids):
+        return self.jobs
+
+    def put(self, jobs):
+        self.put_jobs.append(jobs)
+
+
+def test_query_jobs_status_cache(query):
+    params = dict(job_id=["JOB00001", "JOB00002"])
+    cache = FakeStatusCache(JOBS[:2])
+    assert query.query_jobs(params, cache=cache) == JOBS[:2]
+    query.Jobs.list.assert_not_called()
+    cache = FakeStatusCache(None)
+    query.Jobs.list.return_value = JOBS
+    assert query.query_jobs(params, cache=cache) == JOBS
+    assert cache.put_jobs == [JOBS]
+
+
+def wait_params(**params):
+    params = filters(job_name=["PAY*"], owner=None, job_id=None, **params)
+    params.setdefault("wait_time_s", 60)
+    params.setdefault("max_poll_interval_s", 5)
+    return params
+
+
+def test_wait_jobs_any(query):
+    running = [dict(JOBS[0], status="AC"), dict(JOBS[1], status="AC")]
+    ended = [dict(JOBS[0], status="CC", **{"return": "0000"}), running[1]]
+    query.Jobs.list.side_effect = [running, ended]
+    jobs, waited = query.wait_jobs(running, wait_params(wait_for="any"))
+    assert [job.get("status") for job in jobs] == ["CC", "AC"]
+    assert waited.get("timed_out") is False
+    assert waited.get("polls") == 2
+    for call in query.Jobs.list.call_args_list:
+        assert call[1] == dict(owner="*", job_name="PAY*")
+
+
+def test_wait_jobs_all_times_out(query):
+    running = [dict(JOBS[0], status="AC"), dict(JOBS[1], status="CC")]
+    query.Jobs.list.return_value = running
+    jobs, waited = query.wait_jobs(
+        running, wait_params(wait_for="all", wait_time_s=0)
+    )
+    assert waited.get("timed_out") is True
+    assert waited.get("polls") == 1
+
+
+def test_wait_jobs_bypasses_status_cache(query, tmpdir, monkeypatch):
+    monkeypatch.setenv("ANSIBLE_ZOS_REXX_CACHE", str(tmpdir))
+    running = [dict(JOBS[0], status="AC")]
+    ended = [dict(JOBS[0], status="CC", **{"return": "0000"})]
+    cache = query.JobStatusCache(ttl=3600)
+    cache.put(running)
+    query.Jobs.list.side_effect = [running, ended]
+    jobs, waited = query.wait_jobs(running, wait_params(wait_for="all"), cache)
+    assert jobs == ended
+    assert waited.get("polls") == 2
+    assert query.JobStatusCache(ttl=0).get("JOB00001") == ended[0]
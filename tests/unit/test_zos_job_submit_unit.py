@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+# Copyright (c) IBM Corporation 2020
+# Apache License, Version 2.0 (see https://opensource.org/licenses/Apache-2.0)
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from mock import MagicMock
+import pytest
+
+IMPORT_NAME = "ibm_zos_core.plugins.modules.zos_job_submit"
+
+
+@pytest.fixture
+def submit(zos_import_mocker, tmpdir, monkeypatch):
+    mocker, importer = zos_import_mocker
+    monkeypatch.setenv("ANSIBLE_ZOS_REXX_CACHE", str(tmpdir))
+    return importer(IMPORT_NAME)
+
+
+def test_volume_helper_reports_each_member(submit):
+    module = MagicMock()
+    module.run_command.return_value = (
+        0,
+        "0 JOB00134\n2 ERROR ALLOCATION OF TEST.JCL(B) ON VOL002 FAILED\n",
+        "",
+    )
+    members = [
+        ("TEST.JCL(A)", "VOL001"),
+        ("not/a/data/set", "VOL001"),
+        ("TEST.JCL(B)", "VOL002"),
+        ("TEST.JCL(C)", "VOL002"),
+    ]
+    outcomes = submit.submit_jcl_in_volumes(members, module)
+    cmd = module.run_command.call_args[0][0]
+    # the invalid name is not passed to the helper
+    assert cmd[1:4] == ["0", "TEST.JCL(A)", "VOL001"]
+    assert cmd[4:7] == ["2", "TEST.JCL(B)", "VOL002"]
+    assert cmd[7:] == ["3", "TEST.JCL(C)", "VOL002"]
+    assert module.run_command.call_count == 1
+    assert outcomes[0] == "JOB00134"
+    assert isinstance(outcomes[1], submit.SubmitJCLError)
+    assert "ALLOCATION" in outcomes[2].msg
+    # no line was said for the last member
+    assert isinstance(outcomes[3], submit.SubmitJCLError)
+
+
+def test_volume_helper_single_member(submit):
+    module = MagicMock()
+    module.run_command.return_value = (0, "0 JOB00135\n", "")
+    assert submit.submit_jcl_in_volume("TEST.JCL(A)", "VOL001", module) == "JOB00135"